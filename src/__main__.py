@@ -1,21 +1,41 @@
 import logging
+import signal
+from tempfile import TemporaryDirectory
 
 from pandas import DataFrame
-from torch.nn import MSELoss
-from torch.optim import Adam
 from talib._ta_lib import MA_Type
 
 from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.adapters.repositories.indicator_cache import IndicatorCacheRepository
 from src.services.common.ohlc_base import OHLCPandasService
-from src.services.rsi import RSIPandasService
 from src.services.bb import BBANDSPandasService
 from src.services.ema import EMAPandasService
+from src.services.pipeline import FeaturePipelineService
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_type import IndicatorType
 from src.services.log import LogPandasService
 from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
 from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.clients.manager import TrainingManager
+from src.adapters.repositories.indexed_replay import IndexedReplayMemoryRepository
+from src.adapters.repositories.mapped_replay import MemoryMappedReplayMemoryRepository
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
 from src.models.qnn import QNN
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+from src.services.profiler import ProfilerService
 
 INFINITY = iter(int, 1)
+ACTORS: int = 0  # actor processes of asynchronous training, the single-process loop without them
+PROFILE: bool = False  # per-episode timings of the single-process loop
+PROMETHEUS_PORT: int = 0  # serves the timings for scraping if set
+TRACE_STEPS: int = 1_000  # steps profiled after `kill -USR1 <pid>`
+EPISODE_STEPS: int | None = None  # episodes of this length from random bars, whole passes over the data without it
+WINDOW: int = 1  # bars per observation, the replay memory keeps their rows instead unless it is in REPLAY_PATH files
+REPLAY_PATH: str | None = None  # directory of replay files that outlive the run, the memory is in RAM without it
+OHLC_PATH: str = "/home/spuchin/GitHub/baccalaureate-diploma/src/SBER4H.csv"
 BASE_COLUMNS: list[str] = [
     "date", "year", "month", "week", "day",
     "o", "h", "l", "c", "v",
@@ -31,15 +51,28 @@ def _get_feature_columns(ohlc: DataFrame) -> list:
 if __name__ == "__main__":
     # repositories
     ohlc_repository: OHLCPandasRepository = OHLCPandasRepository(
-        path="/home/spuchin/GitHub/baccalaureate-diploma/src/SBER4H.csv"
+        path=OHLC_PATH
     )
+    indicator_cache: IndicatorCacheRepository = IndicatorCacheRepository(path=f"{OHLC_PATH}.indicators")
 
     # services
     ohlc_service: OHLCPandasService = OHLCPandasService(ohlc_repository=ohlc_repository)
     bbands_service: BBANDSPandasService = BBANDSPandasService()
-    rsi_service: RSIPandasService = RSIPandasService()
     log_service: LogPandasService = LogPandasService()
     ema_service: EMAPandasService = EMAPandasService()
+    feature_pipeline: FeaturePipelineService = FeaturePipelineService(
+        cache=indicator_cache,
+        specs=[
+            IndicatorSpec(kind=IndicatorType.ema, column="o", window=7),
+            IndicatorSpec(kind=IndicatorType.ema, column="o", window=14),
+            IndicatorSpec(kind=IndicatorType.rsi, column="o", window=7),
+            IndicatorSpec(kind=IndicatorType.rsi, column="o", window=14),
+            IndicatorSpec(kind=IndicatorType.ema, column="RSI_7_o", window=7),
+            IndicatorSpec(kind=IndicatorType.ema, column="RSI_14_o", window=14),
+            IndicatorSpec(kind=IndicatorType.rsi, column="EMA_7_o", window=7),
+            IndicatorSpec(kind=IndicatorType.rsi, column="EMA_14_o", window=14),
+        ]
+    )
 
     # ohlcv
     ohlc: DataFrame = ohlc_service.get_ohlc()
@@ -47,73 +80,126 @@ if __name__ == "__main__":
     ohlc_weekly: DataFrame = OHLCPandasService.resample(ohlc=ohlc, timeframe="1W")
 
     # 4H
-    ohlc = ema_service.get_ema(ohlc=ohlc, column="o", window=7, shift=0)
-    ohlc = ema_service.get_ema(ohlc=ohlc, column="o", window=14, shift=0)
-    ohlc = rsi_service.get_rsi(ohlc=ohlc, column="o", window=7, shift=0)
-    ohlc = rsi_service.get_rsi(ohlc=ohlc, column="o", window=14, shift=0)
-
-    ohlc = ema_service.get_ema(ohlc=ohlc, column="RSI_7_o", window=7, shift=0)
-    ohlc = ema_service.get_ema(ohlc=ohlc, column="RSI_14_o", window=14, shift=0)
-    ohlc = rsi_service.get_rsi(ohlc=ohlc, column="EMA_7_o", window=7, shift=0)
-    ohlc = rsi_service.get_rsi(ohlc=ohlc, column="EMA_14_o", window=14, shift=0)
+    ohlc = feature_pipeline.get_features(ohlc=ohlc)
+    for report in feature_pipeline.reports:
+        logging.info(
+            f"Indicators: {report.columns}, {report.seconds * 1e3:.2f} ms, {report.peak_memory / 2 ** 20:.2f} MiB."
+        )
+    logging.info(f"Indicator cache: {indicator_cache.statistics}.")
 
     # 1D
     ohlc_daily = ...  # TODO bbands on L if bullish trend else H 1D 7EMA 4STD
 
     # 1W
-    ohlc_weekly = ema_service.get_ema(ohlc=ohlc_weekly, column="c", window=210, shift=1)
-
-    # merge
-    ohlc = ohlc_service.merge(
-        left=ohlc,
-        right=ohlc_weekly,
-        on=["year", "month", "week"],
-        drop_right=["o", "h", "l", "c", "v", "date", "day"]
-    )
+    ohlc_weekly = ema_service.get_ema(ohlc=ohlc_weekly, column="c", window=210, shift=0)
+
+    # align on the latest closed higher timeframe bar, so the weekly EMA needs no extra shift
+    ohlc = OHLCPandasService.align(base=ohlc, higher=ohlc_weekly, columns=["EMA_210_c"])
 
     ohlc = log_service.get_log(ohlc=ohlc, numerator="EMA_210_c", denominator="o", shift=0)
     ohlc = ohlc.dropna(subset=_get_feature_columns(ohlc=ohlc))
 
     # machine learning
-    environment: TradingEnvironment = TradingEnvironment(
+    market: MarketData = MarketData.from_frame(
         ohlc=ohlc,
         feature_columns=_get_feature_columns(ohlc=ohlc),
+        columns=OHLC.COLUMNS + Indicators.get_columns(columns=ohlc.columns.to_list())
+    )
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=market,
+        feature_columns=_get_feature_columns(ohlc=ohlc),
         commission=.0001980,
-        funding=.000114155
+        funding=.000114155,
+        episode_steps=EPISODE_STEPS,
+        is_random_start=EPISODE_STEPS is not None,
+        window=WINDOW
     )
     qnn: QNN = QNN(
         observation_space_dimension=environment.observation_space_dimension,
-        action_space_dimension=environment.action_space_dimension
+        action_space_dimension=environment.action_space_dimension,
+        observation_space_shape=environment.observation_space.shape
     )
-    agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
-        alpha=.001,
-        gamma=.99,
-        epsilon=.99,
-        qnn=qnn
-    )
-    optimization_algorithm: Adam = Adam(params=qnn.parameters(), lr=agent.learning_rate)
-    loss_function: MSELoss = MSELoss()
-
-    episodes: int = 16
-    batch_size: int = 2
-
-    for episode in range(episodes):
-        state, reward, done, _, _ = environment.reset().as_observation()
-        for _ in INFINITY:
-            if done: break
-            action = agent.act(observation=state)
-            next_state, reward, done, _, _ = environment.step(action).as_observation()
-
-            agent.memory.append((state, action, reward, next_state, done))
-            if agent.memory_length >= batch_size:
-                q, q_target = agent.learn(batch_size=batch_size)
-
-                loss = loss_function(q, q_target)
-
-                optimization_algorithm.zero_grad()
-                loss.backward()
-                optimization_algorithm.step()
-
-            state = next_state
-
-        logging.info(f"Episode: {episode + 1}, Total Reward: {environment.rewards:.2f}.")
+    if ACTORS:
+        with TemporaryDirectory(prefix="market-data-") as directory:  # features are computed once for all actors
+            MarketDataNumpyRepository(path=directory).write(market_data=market)
+            training_manager: TrainingManager = TrainingManager(
+                market_data_path=directory,
+                feature_columns=_get_feature_columns(ohlc=ohlc),
+                commission=.0001980,
+                funding=.000114155,
+                qnn=qnn,
+                alpha=.001,
+                gamma=.99,
+                epsilon=.4,
+                n_steps=3,
+                actors=ACTORS,
+                episode_steps=EPISODE_STEPS,
+                window=WINDOW
+            )
+            logging.info(f"Asynchronous training: {training_manager.run()}.")
+    else:
+        profiler: ProfilerService = ProfilerService(is_enabled=PROFILE, path=f"{OHLC_PATH}.profile.jsonl")
+        if PROMETHEUS_PORT:
+            profiler.serve(port=PROMETHEUS_PORT)
+        signal.signal(signal.SIGUSR1, lambda *_: profiler.request_trace(steps=TRACE_STEPS, path=f"{OHLC_PATH}.prof"))
+
+        is_indexed: bool = WINDOW > 1 and not REPLAY_PATH
+        if WINDOW > 1 and REPLAY_PATH:
+            logging.warning(f"Replay files store whole observations, {WINDOW} times the size of single bars.")
+        memory: ReplayMemoryRepository | None = None
+        if REPLAY_PATH:
+            memory = MemoryMappedReplayMemoryRepository(
+                path=REPLAY_PATH,
+                capacity=2 ** 24,
+                observation_space_dimension=environment.observation_space_dimension,
+                observation_space_shape=environment.observation_space.shape,
+                n_steps=3,
+                gamma=.99
+            )
+        elif is_indexed:
+            memory = IndexedReplayMemoryRepository(
+                observations=environment.observations,
+                capacity=2 ** 24,
+                observation_space_dimension=environment.observation_space_dimension,
+                observation_space_shape=environment.observation_space.shape,
+                n_steps=3,
+                gamma=.99
+            )
+        agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+            alpha=.001,
+            gamma=.99,
+            epsilon=.99,
+            qnn=qnn,
+            n_steps=3,
+            memory=memory,
+            profiler=profiler
+        )
+        logging.info(f"Replay memory: {agent.memory.capacity} transitions, {agent.memory.nbytes / 2 ** 20:.2f} MiB.")
+
+        episodes: int = 16
+        batch_size: int = 2
+
+        for episode in range(episodes):
+            state, reward, done, truncated, _ = environment.reset().as_observation()
+            for _ in INFINITY:
+                if done or truncated: break
+                with profiler.timer("act"):
+                    action = agent.act(observation=state)
+                index: int = environment.observation_index
+                with profiler.timer("environment.step"):
+                    next_state, reward, done, truncated, _ = environment.step(action).as_observation()
+
+                with profiler.timer("memory.append"):
+                    if is_indexed:
+                        agent.memory.append((index, action, reward, environment.observation_index, done, truncated))
+                    else:
+                        agent.memory.append((state, action, reward, next_state, done, truncated))
+                if agent.memory_length >= batch_size:
+                    agent.learn(batch_size=batch_size)
+
+                state = next_state
+                profiler.tick()
+
+            logging.info(f"Episode: {episode + 1}, Total Reward: {environment.rewards:.2f}.")
+            if profiler.is_enabled:
+                logging.info(f"Profile: {profiler.flush(episode=episode + 1)}.")
@@ -1,10 +1,18 @@
-from collections import deque
-from random import uniform, choice, sample
+from copy import deepcopy
+from random import uniform, choice
 
 from attr import attrs, ib
-from torch import FloatTensor, LongTensor, argmax, Tensor
-
+from numpy import ndarray, asarray, float32
+from torch import cat, no_grad, Tensor
+from torch.nn import MSELoss
+from torch.optim import Adam, Optimizer
+
+from src.adapters.repositories.prioritized_replay import PrioritizedReplayMemoryRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.adapters.repositories.sharded_replay import ShardedReplayMemoryRepository
 from src.models.qnn import QNN
+from src.services.inference import QNNInferenceService
+from src.services.profiler import ProfilerService
 from src.schemas.step_observation import StepObservation
 
 
@@ -17,50 +25,96 @@ class QOogwayTheGrandmasterAgent:
 
     _qnn: QNN
 
-    _memory: deque = ib(init=False, default=deque(maxlen=10_000))
+    _memory_capacity: int = 10_000
+    _n_steps: int = 1  # steps of the discounted returns the targets bootstrap after
+    _is_prioritized: bool = False  # sample transitions by their last TD error
+    _tau: float | None = None  # Polyak rate of target updates after every step, hard syncs without it
+    _target_sync_frequency: int = 1_000  # steps between hard syncs of the target network
+
+    _memory: ReplayMemoryRepository | ShardedReplayMemoryRepository | None = None  # built from the above without it
+    _profiler: ProfilerService = ib(factory=ProfilerService)  # times the phases of `learn`, disabled by default
+    _target_qnn: QNN = ib(init=False)
+    _policy: QNNInferenceService = ib(init=False)
+    _optimizer: Optimizer = ib(init=False)
+    _loss_function: MSELoss = ib(init=False, factory=lambda: MSELoss(reduction="none"))  # weighted by IS weights
+    _updates: int = ib(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        if self._memory is None:
+            memory_class: type = PrioritizedReplayMemoryRepository if self._is_prioritized else ReplayMemoryRepository
+            self._memory = memory_class(
+                capacity=self._memory_capacity,
+                observation_space_dimension=self._qnn.observation_space_dimension,
+                observation_space_shape=self._qnn.observation_space_shape,
+                n_steps=self._n_steps,
+                gamma=self._gamma
+            )
+        self._target_qnn = deepcopy(self._qnn).requires_grad_(False)
+        self._policy = QNNInferenceService(qnn=self._qnn)
+        self._optimizer = Adam(params=self._qnn.parameters(), lr=self._alpha)
 
     @property
     def learning_rate(self) -> float:
         return self._alpha
 
     @property
-    def memory(self) -> deque:
+    def updates(self) -> int:
+        return self._updates
+
+    @property
+    def memory(self) -> ReplayMemoryRepository | ShardedReplayMemoryRepository:
         return self._memory
 
     @property
     def memory_length(self) -> int:
         return len(self._memory)
 
-    @staticmethod
-    def _get_observations(batch: list) -> tuple:
-        states, actions, rewards, states_lead, dones = zip(*batch)
-        return (
-            FloatTensor(states),
-            LongTensor(actions),
-            FloatTensor(rewards),
-            FloatTensor(states_lead),
-            FloatTensor(dones)
-        )
-
     def act(self, observation: StepObservation | tuple) -> int:
         if uniform(0, 1) < self._epsilon:
             return choice(range(self._qnn.action_space_dimension))  # exploration phase
-        state: Tensor = FloatTensor(observation).unsqueeze(0)
-        return argmax(self._qnn(state)).item()  # exploitation phase
-
-    def learn(self, batch_size: int) -> tuple[float, float]:
-        batch: list = sample(self._memory, batch_size)
-        states, actions, rewards, states_lead, dones = QOogwayTheGrandmasterAgent._get_observations(batch=batch)
-
-        q_lead = self._qnn(x=states_lead).max(1)[0]
-        q_target = rewards + (self._gamma * q_lead * (1 - dones))
-
-        q = self._qnn(x=states).gather(1, actions.unsqueeze(1)).squeeze(1)
-
+        state: ndarray = asarray(observation, dtype=float32)[None]  # copied by the policy if read-only
+        return self._policy.get_greedy_actions(observations=state).item()  # exploitation phase
+
+    def act_batch(self, observations: ndarray | Tensor) -> Tensor:
+        return self._policy.act(observations=observations, epsilon=self._epsilon)
+
+    def sync_target(self, tau: float = 1.) -> None:
+        with no_grad():
+            for target, parameter in zip(self._target_qnn.parameters(), self._qnn.parameters()):
+                target.lerp_(parameter, tau)
+
+    def learn(self, batch_size: int) -> float:
+        """
+            One optimizer step of double Q-learning: the online network picks the next actions in the same forward
+            as the current Q-values, and the target network values them without tracking gradients.
+        """
+        with self._profiler.timer("learn.sample"):
+            indices, weights = self._memory.sample_indices(batch_size=batch_size)
+            states, actions, returns, states_lead, dones, discounts = self._memory.get_batch(indices=indices)
+
+        with self._profiler.timer("learn.forward"):
+            q_all: Tensor = self._qnn(x=cat((states, states_lead)))
+            q = q_all[:batch_size].gather(1, actions.unsqueeze(1)).squeeze(1)
+            with no_grad():
+                actions_lead: Tensor = q_all[batch_size:].argmax(1, keepdim=True)
+                q_lead = self._target_qnn(x=states_lead).gather(1, actions_lead).squeeze(1)
+                q_target = returns + (discounts * q_lead * (1 - dones))
+            loss: Tensor = (self._loss_function(q, q_target) * weights).mean()
+
+        with self._profiler.timer("learn.backward"):
+            self._optimizer.zero_grad()
+            loss.backward()
+        with self._profiler.timer("learn.optimizer"):
+            self._optimizer.step()
+        self._updates += 1
+        self._profiler.count("updates")
+
+        if self._tau is not None:
+            self.sync_target(tau=self._tau)
+        elif self._updates % self._target_sync_frequency == 0:
+            self.sync_target()
+
+        self._memory.update_priorities(indices=indices, errors=q_target - q.detach())
         self._epsilon *= self._gamma
 
-        return q, q_target
-
-
-
-
+        return loss.item()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from attr import attrs
+
+from src.schemas.ohlc import OHLC
+
+
+def _get_bar(values: dict) -> dict:
+    bar: dict = {column: float(values[column]) for column in OHLC.COLUMNS}
+    bar["date"] = values.get("date")
+    return bar
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class BarSourceBase(ABC):
+    """
+        Asynchronous stream of closed bars as `{"date", "o", "h", "l", "c"}` dicts, in order.
+    """
+
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[dict]:
+        ...
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class FileTailBarSource(BarSourceBase):
+    """
+        Rows appended to a CSV file with a header, e.g. by a downloader, polled every `poll_interval` seconds.
+        A line counts once its newline is written.
+    """
+
+    _path: str
+    _poll_interval: float = 1.
+    _is_from_start: bool = False  # replays the rows already written before following
+    _is_following: bool = True  # stops at the end of the file without it
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        with open(self._path) as file:
+            columns: list[str] = file.readline().strip().split(",")
+            if not self._is_from_start:
+                file.seek(0, os.SEEK_END)
+            line: str = ""
+            while True:
+                line += file.readline()
+                if not line.endswith("\n"):
+                    if not self._is_following:
+                        return
+                    await asyncio.sleep(self._poll_interval)
+                    continue
+                if line.strip():
+                    yield _get_bar(values=dict(zip(columns, line.strip().split(","))))
+                line = ""
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class SocketBarSource(BarSourceBase):
+    """
+        Newline-delimited JSON bars from a TCP connection, until the peer closes it.
+    """
+
+    _host: str = "127.0.0.1"
+    _port: int = 8766
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    yield _get_bar(values=json.loads(line))
+        finally:
+            writer.close()
+            await writer.wait_closed()
@@ -1,44 +1,82 @@
-from typing import Any, Callable
+from typing import Any
 
 from gymnasium import Env
 from gymnasium.core import ActType
 from gymnasium.spaces import Box, Discrete
 from pandas import DataFrame
-from numpy import inf, float32, array, zeros, log, log2
+from numpy import inf, float32, ndarray, zeros, nan
 
-from src.schemas.position_type import PositionType
 from src.schemas.action_space import LimitOrderActionSpace
 from src.schemas.step_observation import StepObservation
-from src.schemas.trade import Trade
+from src.schemas.trade_ledger import TradeLedger
+from src.schemas.market_data import MarketData
 from src.schemas.ohlc import OHLC
 from src.schemas.indicators import Indicators
+from src.services.episode import EpisodeService
+from src.services.lane import TradingLaneService
+from src.services.transition import NEUTRAL
+from src.services.observation import ObservationWindowService
 
 
 class TradingEnvironment(Env):
 
+    _BBANDS_STDDEV: int = 1
+
     def __init__(
         self,
-        ohlc: DataFrame,
+        ohlc: DataFrame | MarketData,  # prepared market data is used as is, e.g. memory-mapped
         feature_columns: list,
         commission: float,
-        funding: float
+        funding: float,
+        episode_steps: int | None = None,  # steps per episode, up to the end of the data without it
+        is_random_start: bool = False,  # episodes start at random rows instead of the first complete one
+        window: int = 1,  # bars of features per observation, the latest last
+        is_flattened: bool = True  # `window * features` observations instead of `(window, features)`
     ) -> None:
         super(TradingEnvironment, self).__init__()
 
-        self._ohlc: DataFrame = ohlc
         self._feature_columns: list = feature_columns
-        self._commission: float = commission
-        self._funding: float = funding
+        self._ohlc: MarketData = ohlc if isinstance(ohlc, MarketData) else MarketData.from_frame(
+            ohlc=ohlc,
+            feature_columns=feature_columns,
+            columns=OHLC.COLUMNS + Indicators.get_columns(columns=ohlc.columns.to_list())
+        )
+        self._lane: TradingLaneService = TradingLaneService(commission=commission, funding=funding)
+        self._ema: ndarray = self._ohlc.get_column(Indicators.EMA_COLUMN)
+        self._lower: ndarray = self._ohlc.get_column(Indicators.get_lower_bbands_column(stddev=self._BBANDS_STDDEV))
+        self._upper: ndarray = self._ohlc.get_column(Indicators.get_upper_bbands_column(stddev=self._BBANDS_STDDEV))
+        self._windows: ObservationWindowService = ObservationWindowService(window=window, is_flattened=is_flattened)
+        self._observations: ndarray = self._windows.get_observations(features=self._ohlc.features)
+        self._episodes: EpisodeService = EpisodeService(
+            first_step=self._ohlc.get_first_complete_row() + window - 1,  # warm-up rows are never observed
+            last_step=self._dataset_length,
+            episode_steps=episode_steps,
+            is_random_start=is_random_start
+        )
         self.reset()
 
-        self._shape: int = len(self._feature_columns) + self._dynamic_features
+        self._shape: tuple[int, ...] = self._observations.shape[1:]  # TODO + self._dynamic_features
+        self._terminal_observation: ndarray = zeros(self._shape, dtype=float32)
+        self._terminal_observation.flags.writeable = False
 
-        self.observation_space: Box = Box(low=-inf, high=inf, shape=(self._shape,), dtype=float32)
+        self.observation_space: Box = Box(low=-inf, high=inf, shape=self._shape, dtype=float32)
         self.action_space: Discrete = Discrete(n=LimitOrderActionSpace.n)
 
     @property
     def observation_space_dimension(self) -> int:
-        return self.observation_space.shape[0]
+        return int(self._terminal_observation.size)
+
+    @property
+    def observations(self) -> ndarray:
+        """
+            Every observation of the data as a read-only view of the features, row `observation_index` is
+            the current one.
+        """
+        return self._observations
+
+    @property
+    def observation_index(self) -> int:
+        return self._windows.get_index(step=self._current_step)
 
     @property
     def action_space_dimension(self) -> int:
@@ -48,135 +86,49 @@ class TradingEnvironment(Env):
     def rewards(self) -> float:
         return self._total_rewards
 
+    @property
+    def trades(self) -> TradeLedger:
+        """
+            Trades of the episode, the position still open when it ends included with an exit step of -1.
+        """
+        return self._trades
+
     @property
     def _dataset_length(self) -> int:
-        return len(self._ohlc) - 1
+        return self._ohlc.length - 1
 
     @property
     def _dynamic_features(self) -> int:
-        return len([self._cumulative_reward, self._position,])  # TODO self._time_in_trade
+        return len([self._lane.cumulative_reward, self._lane.position,])  # TODO self._time_in_trade
 
     @property
-    def _environment_state(self) -> tuple:
-        environment_state: array = tuple(self._ohlc[self._feature_columns].iloc[self._current_step].values)  # TODO add self._dynamic_features
+    def _environment_state(self) -> ndarray:
+        environment_state: ndarray = self._observations[self.observation_index]  # TODO add self._dynamic_features
         return environment_state
 
-    @property
-    def _true_price(self) -> float:
-        weighted_price: float = .0
-        weight: float = .0
-        for price, size in self._dca:
-            value: float = price * size
-
-            weighted_price += price * value
-            weight += value
-        return weighted_price / weight
-
-    def _on_long_reward(self, true_price: float, result_price: float) -> float:
-        ratio: float = result_price / true_price
-        reward: float = log(ratio) if ratio > 1 else log2(ratio)
-        return reward - self._funding
-
-    def _on_short_reward(self, true_price: float, result_price: float) -> float:
-        ratio: float = 2 - (result_price / true_price)
-        reward: float = log(ratio) if ratio > 1 else log2(ratio)
-        return reward - self._funding
-
-    def _adjust_reward_on_entry(
-        self,
-        ohlc: OHLC,
-        ema: float,
-        limit: float,
-        size: int = 1,
-        is_long: bool = True
-    ) -> float:
-        reward: float = .0
-        on_reward_method: Callable = self._on_long_reward if is_long else self._on_short_reward
-
-        position_type: str = PositionType.long_position if is_long else PositionType.short_position
-        is_correct_limit: bool = limit > ema if is_long else limit < ema
-        if ohlc.l <= limit <= ohlc.h and is_correct_limit:  # limit order
-            self._position = position_type
-            self._dca.append((limit, size))
-            reward = on_reward_method(true_price=self._true_price, result_price=ohlc.c) - self._commission
-
-        is_entry_success: bool = self._position == position_type
-        is_stop_loss_after_entry: bool = ema >= ohlc.l if is_long else ema <= ohlc.h
-        if is_entry_success and is_stop_loss_after_entry:  # stop-loss
-            reward = on_reward_method(true_price=self._true_price, result_price=ema) - self._commission - self._commission
-            self._position = PositionType.neutral_position
-            self._dca = list()
-        return reward
-
-    def _adjust_reward_on_dca(
-        self,
-        ohlc: OHLC,
-        ema: float,
-        limit: float,
-        size: int = 1,
-        is_long: bool = True
-    ) -> float:
-        reward: float = .0
-        on_reward_method: Callable = self._on_long_reward if is_long else self._on_short_reward
-
-        is_correct_limit: bool = limit > ema if is_long else limit < ema
-        if ohlc.l <= limit <= ohlc.h and is_correct_limit:  # limit order
-            self._dca.append((limit, size))
-            reward = on_reward_method(true_price=self._true_price, result_price=ohlc.c) - self._commission
-
-        is_stop_loss: bool = ema >= ohlc.l if is_long else ema <= ohlc.h
-        if is_stop_loss:  # stop-loss
-            reward = on_reward_method(
-                true_price=self._true_price,
-                result_price=ema
-            ) - self._commission - self._commission if reward else on_reward_method(
-                true_price=self._true_price,
-                result_price=ema
-            ) - self._commission
-            self._position = PositionType.neutral_position
-            self._dca = list()
-        return reward
-
-    def _adjust_reward_on_exit(
-        self,
-        ohlc: OHLC,
-        ema: float,
-        limit: float,
-        is_long: bool = True
-    ) -> float:
-        reward: float = .0
-        on_reward_method: Callable = self._on_long_reward if is_long else self._on_short_reward
-
-        is_stop_loss: bool = ema >= ohlc.l if is_long else ema <= ohlc.h
-        is_correct_limit: bool = limit > ema if is_long else limit < ema
-        if is_stop_loss:  # stop-loss
-            reward = on_reward_method(true_price=self._true_price, result_price=ema) - self._commission
-            self._position = PositionType.neutral_position
-
-        elif ohlc.l <= limit <= ohlc.h and is_correct_limit:  # limit order
-            reward = on_reward_method(true_price=self._true_price, result_price=limit) - self._commission
-            self._position = PositionType.neutral_position
-        return reward
-
     def reset(
         self,
         *,
         seed: int | None = None,
         options: dict[str, Any] | None = None,
     ) -> StepObservation:
+        """
+            Options of `EpisodeService.get_steps`. Episodes that run out of steps end truncated on their last step,
+            at the end of the data they terminate.
+        """
         super().reset(seed=seed, options=options)
-        self._position: str = PositionType.neutral_position
-        self._dca: list = list()
-        self._trades: list[Trade] = list()  # TODO
+        self._lane.reset()
+        self._entry_step: int = 0
+        self._trades: TradeLedger = TradeLedger()
 
-        self._current_step: int = 0
+        self._current_step, self._end_step = self._episodes.get_steps(options=options or dict(), random=self.np_random)
+        self._is_truncating: bool = self._episodes.is_truncated(end_step=self._end_step)
         self._highest_in_the_room: float = ...  # TODO penalize if the price goes downward from the highest price
         self._time_in_trade: float = ...  # TODO divide reward on `time_in_trade` to penalize long trades
-        self._cumulative_reward: float = .0
         self._total_rewards: float = .0
 
         return StepObservation(
-            array(self._environment_state, dtype=float32),
+            self._environment_state,
             self._total_rewards,
             False,
             False,
@@ -185,89 +137,54 @@ class TradingEnvironment(Env):
 
     def step(self, action: ActType) -> StepObservation:
         reward: float = .0
-        if self._current_step >= self._dataset_length:
+        if self._current_step >= self._end_step:
             return StepObservation(
-                zeros(self._shape, dtype=float32),
+                self._environment_state if self._is_truncating else self._terminal_observation,
                 reward,
-                True,
-                False,
+                not self._is_truncating,
+                self._is_truncating,
                 dict()
             )
 
-        ohlc: OHLC = OHLC(self._current_step, self._ohlc)
-        indicators: Indicators = Indicators(self._current_step, self._ohlc)
-
-        if action == LimitOrderActionSpace.buy_limit:
-            limit: float = indicators.get_lower_bbands(stddev=1)
-            if self._position == PositionType.neutral_position:
-                reward += self._adjust_reward_on_entry(ohlc=ohlc, ema=indicators.ema, limit=limit)
-                self._cumulative_reward += reward if self._position == PositionType.long_position else .0
-            elif self._position == PositionType.long_position:
-                reward += self._adjust_reward_on_dca(ohlc=ohlc, ema=indicators.ema, limit=limit)
-                self._cumulative_reward += reward if self._position == PositionType.long_position else .0
-                if self._position == PositionType.neutral_position:
-                    reward = abs(self._cumulative_reward) * -1
-            elif self._position == PositionType.short_position:
-                reward += self._adjust_reward_on_exit(ohlc=ohlc, ema=indicators.ema, limit=limit)
-                if reward < 0:
-                    reward = abs(self._cumulative_reward) * -1
-                self._dca = list() if reward else self._dca
-
-        if action == LimitOrderActionSpace.sell_limit:
-            limit: float = indicators.get_upper_bbands(stddev=1)
-            if self._position == PositionType.neutral_position:
-                reward += self._adjust_reward_on_entry(ohlc=ohlc, ema=indicators.ema, limit=limit, is_long=False)
-                self._cumulative_reward += reward if self._position == PositionType.short_position else .0
-            elif self._position == PositionType.short_position:
-                reward += self._adjust_reward_on_dca(ohlc=ohlc, ema=indicators.ema, limit=limit, is_long=False)
-                self._cumulative_reward += reward if self._position == PositionType.short_position else .0
-                if self._position == PositionType.neutral_position:
-                    reward = abs(self._cumulative_reward) * -1
-            elif self._position == PositionType.long_position:
-                reward += self._adjust_reward_on_exit(ohlc=ohlc, ema=indicators.ema, limit=limit, is_long=False)
-                if reward < 0:
-                    reward = abs(self._cumulative_reward) * -1
-                self._dca = list() if reward else self._dca
-
-        if action == LimitOrderActionSpace.hold:
-            if self._position == PositionType.neutral_position:
-                ...
-            elif self._position == PositionType.long_position:
-                is_stop_loss: bool = indicators.ema >= ohlc.l
-                reward += self._on_long_reward(
-                    true_price=self._true_price,
-                    result_price=indicators.ema
-                ) - self._commission if is_stop_loss else self._on_long_reward(
-                    true_price=self._true_price,
-                    result_price=ohlc.c
-                )
-                if is_stop_loss:
-                    reward = abs(self._cumulative_reward) * -1
-                    self._position = PositionType.neutral_position
-                    self._dca = list()
-                self._cumulative_reward += reward if self._position == PositionType.long_position else .0
-            elif self._position == PositionType.short_position:
-                is_stop_loss: bool = indicators.ema <= ohlc.h
-                reward += self._on_short_reward(
-                    true_price=self._true_price,
-                    result_price=indicators.ema
-                ) - self._commission if is_stop_loss else self._on_short_reward(
-                    true_price=self._true_price,
-                    result_price=ohlc.c
-                )
-                if is_stop_loss:
-                    reward = abs(self._cumulative_reward) * -1
-                    self._position = PositionType.neutral_position
-                    self._dca = list()
-                self._cumulative_reward += reward if self._position == PositionType.short_position else .0
+        step: int = self._current_step
+        reward = self._lane.step(
+            int(action),
+            self._ohlc.l[step],
+            self._ohlc.h[step],
+            self._ohlc.c[step],
+            self._ema[step],
+            self._lower[step],
+            self._upper[step]
+        )
+        if self._lane.is_opened:
+            self._entry_step = self._current_step
+        if self._lane.is_closed:
+            self._trades.append(
+                entry_step=self._entry_step,
+                exit_step=self._current_step,
+                side=self._lane.side,
+                entry_price=self._lane.entry_price,
+                exit_price=self._lane.exit_price,
+                timestamp=self._ohlc.get_date(self._entry_step)
+            )
 
         self._current_step += 1
         self._total_rewards += reward
+        if self._current_step >= self._end_step and self._lane.position != NEUTRAL:  # still open at the end
+            self._trades.append(
+                entry_step=self._entry_step,
+                exit_step=-1,
+                side=self._lane.side,
+                entry_price=self._lane.true_price,
+                exit_price=nan,
+                timestamp=self._ohlc.get_date(self._entry_step),
+                ticks_in_trade=self._current_step - 1 - self._entry_step
+            )
 
         return StepObservation(
-            array(self._environment_state, dtype=float32),
+            self._environment_state,
             reward,
             False,
-            False,
+            self._is_truncating and self._current_step >= self._end_step,
             dict()
         )
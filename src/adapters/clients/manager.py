@@ -0,0 +1,238 @@
+import os
+from copy import deepcopy
+from random import Random
+from time import perf_counter, sleep
+from typing import Any
+
+from attr import attrs, ib
+from numpy import ndarray, empty, float32, int64 as numpy_int64
+from torch import Tensor, tensor, inference_mode, set_num_threads, zeros, int64
+from torch.multiprocessing import get_context
+
+from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.adapters.repositories.sharded_replay import ShardedReplayMemoryRepository
+from src.models.qnn import QNN
+
+
+def _run_actor(
+    worker: int,
+    market_data_path: str,
+    feature_columns: list,
+    commission: float,
+    funding: float,
+    qnn: QNN,
+    version: Any,
+    lock: Any,
+    memory: ReplayMemoryRepository,
+    epsilon: float,
+    chunk_size: int,
+    steps: Tensor,
+    stop: Any,
+    episode_steps: int | None = None,
+    window: int = 1,
+    is_flattened: bool = True
+) -> None:
+    """
+        Steps an own environment with an epsilon-greedy copy of the shared weights and writes chunks of
+        consecutive transitions to an own replay memory shard, refreshing the weights between chunks.
+    """
+    set_num_threads(1)
+    random: Random = Random(worker)
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=MarketDataNumpyRepository(path=market_data_path).read(),  # memory-mapped, shared with the other actors
+        feature_columns=feature_columns,
+        commission=commission,
+        funding=funding,
+        episode_steps=episode_steps,
+        is_random_start=episode_steps is not None,  # short episodes from everywhere in the history
+        window=window,
+        is_flattened=is_flattened
+    )
+    actor_qnn: QNN = deepcopy(qnn)
+    actor_version: int = -1
+
+    shape: tuple[int, ...] = environment.observation_space.shape
+    states: ndarray = empty((chunk_size, *shape), dtype=float32)
+    actions: ndarray = empty(chunk_size, dtype=numpy_int64)
+    rewards: ndarray = empty(chunk_size, dtype=float32)
+    states_lead: ndarray = empty((chunk_size, *shape), dtype=float32)
+    dones: ndarray = empty(chunk_size, dtype=float32)
+    truncations: ndarray = empty(chunk_size, dtype=float32)
+    size: int = 0
+
+    state, _, done, _, _ = environment.reset(seed=worker).as_observation()
+    while not stop.is_set():
+        if size == 0 and version.value != actor_version:
+            with lock:
+                actor_qnn.load_state_dict(qnn.state_dict())
+                actor_version = version.value
+
+        if random.random() < epsilon:
+            action: int = random.randrange(environment.action_space_dimension)
+        else:
+            with inference_mode():
+                action = int(actor_qnn(tensor(state)).argmax())
+        next_state, reward, done, truncated, _ = environment.step(action).as_observation()
+
+        states[size], actions[size], rewards[size], states_lead[size], dones[size], truncations[size] = (
+            state, action, reward, next_state, done, truncated
+        )
+        size += 1
+        if size == chunk_size or done or truncated:
+            memory.extend(
+                states=states[:size],
+                actions=actions[:size],
+                rewards=rewards[:size],
+                states_lead=states_lead[:size],
+                dones=dones[:size],
+                truncations=truncations[:size]
+            )
+            steps[worker] += size
+            size = 0
+        state = environment.reset().as_observation()[0] if done or truncated else next_state
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class TrainingManager:
+    """
+        Asynchronous actor-learner training on one machine: `actors` processes step their own environments and
+        write into shared-memory replay shards, while this process learns from all of them at large batches and
+        publishes its weights every `publish_interval` updates.
+    """
+
+    _market_data_path: str  # `MarketDataNumpyRepository` files every actor maps instead of a copy of the data
+    _feature_columns: list
+    _commission: float
+    _funding: float
+
+    _qnn: QNN
+    _alpha: float
+    _gamma: float
+    _epsilon: float  # of the most exploring actor, the others explore less as in Ape-X
+    _n_steps: int = 1
+    _tau: float | None = None
+
+    _actors: int = 2
+    _memory_capacity: int = 2 ** 20  # transitions over all shards
+    _batch_size: int = 256
+    _learning_starts: int = 10_000  # transitions before the first update
+    _updates: int = 10_000
+    _publish_interval: int = 100
+    _chunk_size: int = 256  # transitions actors write at once
+    _episode_steps: int | None = None  # actors run episodes of this length from random bars, whole ones without it
+    _window: int = 1  # bars per observation of the actors
+    _is_flattened: bool = True  # `window * features` observations instead of `(window, features)`
+
+    _steps: Tensor = ib(init=False)
+
+    def _get_epsilon(self, worker: int) -> float:
+        return self._epsilon ** (1 + 7 * worker / max(self._actors - 1, 1))
+
+    @staticmethod
+    def _check(processes: list) -> None:
+        for process in processes:
+            if process.exitcode is not None:
+                raise RuntimeError(f"Actor process {process.name} exited with code {process.exitcode}.")
+
+    def run(self) -> dict:
+        features: int = len(self._feature_columns)
+        shape: tuple[int, ...] = (self._window * features,) if self._is_flattened else (self._window, features)
+        if self._qnn.observation_space_shape != shape:
+            raise ValueError(f"QNN takes observations of {self._qnn.observation_space_shape}, actors observe {shape}.")
+        context: Any = get_context("spawn")
+        set_num_threads(max((os.cpu_count() or 1) - self._actors, 1))
+
+        shards: list[ReplayMemoryRepository] = [
+            ReplayMemoryRepository(
+                capacity=self._memory_capacity // self._actors,
+                observation_space_dimension=self._qnn.observation_space_dimension,
+                observation_space_shape=shape,
+                n_steps=self._n_steps,
+                gamma=self._gamma
+            ).share_memory()
+            for _ in range(self._actors)
+        ]
+        agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+            alpha=self._alpha,
+            gamma=self._gamma,
+            epsilon=.0,
+            qnn=self._qnn,
+            n_steps=self._n_steps,
+            tau=self._tau,
+            memory=ShardedReplayMemoryRepository(shards=shards)
+        )
+        shared_qnn: QNN = deepcopy(self._qnn).share_memory()
+        version: Any = context.Value("q", 0)
+        lock: Any = context.Lock()
+        stop: Any = context.Event()
+        self._steps = zeros(self._actors, dtype=int64).share_memory_()
+
+        processes: list = [
+            context.Process(
+                target=_run_actor,
+                name=f"actor-{worker}",
+                daemon=True,
+                kwargs={
+                    "worker": worker,
+                    "market_data_path": self._market_data_path,
+                    "feature_columns": self._feature_columns,
+                    "commission": self._commission,
+                    "funding": self._funding,
+                    "qnn": shared_qnn,
+                    "version": version,
+                    "lock": lock,
+                    "memory": shards[worker],
+                    "epsilon": self._get_epsilon(worker=worker),
+                    "chunk_size": self._chunk_size,
+                    "steps": self._steps,
+                    "stop": stop,
+                    "episode_steps": self._episode_steps,
+                    "window": self._window,
+                    "is_flattened": self._is_flattened
+                }
+            )
+            for worker in range(self._actors)
+        ]
+        started: float = perf_counter()
+        for process in processes:
+            process.start()
+        try:
+            while len(agent.memory) < max(self._learning_starts, self._batch_size):
+                self._check(processes=processes)
+                sleep(.01)
+            learning_started: float = perf_counter()
+            for update in range(1, self._updates + 1):
+                agent.learn(batch_size=self._batch_size)
+                if update % self._publish_interval == 0:
+                    self._check(processes=processes)
+                    with lock:
+                        shared_qnn.load_state_dict(self._qnn.state_dict())
+                        version.value += 1
+            finished: float = perf_counter()
+        finally:
+            stop.set()
+            for process in processes:
+                process.join(timeout=10.)
+                if process.is_alive():
+                    process.terminate()
+
+        return {
+            "seconds": finished - started,
+            "actors": [
+                {
+                    "worker": worker,
+                    "epsilon": self._get_epsilon(worker=worker),
+                    "env_steps": int(steps),
+                    "env_steps_per_second": int(steps) / (finished - started)
+                }
+                for worker, steps in enumerate(self._steps)
+            ],
+            "learner": {
+                "updates": self._updates,
+                "batch_size": self._batch_size,
+                "updates_per_second": self._updates / (finished - learning_started)
+            }
+        }
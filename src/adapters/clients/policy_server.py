@@ -0,0 +1,205 @@
+import asyncio
+import json
+from collections import Counter, deque
+from itertools import count
+from time import perf_counter
+from typing import Any, Sequence
+
+from attr import attrs, ib
+from numpy import ndarray, asarray, stack, percentile, float32
+
+from src.services.inference import QNNInferenceService
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class PolicyServer:
+    """
+        Greedy actions for many concurrent callers: pending observations are coalesced into one forward of
+        at most `max_batch_size`, waiting at most `max_wait` seconds for a batch to fill once a request arrives.
+        Callers await `act` in-process or send newline-delimited JSON to `serve`.
+    """
+
+    _policy: QNNInferenceService
+    _max_batch_size: int = 64
+    _max_wait: float = .002  # seconds
+    _latency_window: int = 10_000  # latest requests the percentiles cover
+
+    _queue: asyncio.Queue | None = ib(init=False, default=None)
+    _worker: asyncio.Task | None = ib(init=False, default=None)
+    _batch_sizes: Counter = ib(init=False, factory=Counter)
+    _latencies: deque = ib(init=False)
+    _requests: int = ib(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        self._latencies = deque(maxlen=self._latency_window)
+
+    async def __aenter__(self) -> "PolicyServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.stop()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def statistics(self) -> dict:
+        latencies: ndarray = asarray(self._latencies) * 1e3
+        batches: int = sum(self._batch_sizes.values())
+        return {
+            "requests": self._requests,
+            "batches": batches,
+            "queue_depth": self.queue_depth,
+            "mean_batch_size": self._requests / batches if batches else .0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "p50_latency_ms": float(percentile(latencies, 50)) if len(latencies) else .0,
+            "p99_latency_ms": float(percentile(latencies, 99)) if len(latencies) else .0,
+            "max_latency_ms": float(latencies.max()) if len(latencies) else .0
+        }
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            ...
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+
+    def _get_observation(self, observation: Sequence[float] | ndarray) -> ndarray:
+        """
+            Checked before queueing, so a malformed request fails alone instead of its whole batch.
+        """
+        shape: tuple[int, ...] = self._policy.observation_space_shape
+        try:
+            observation = asarray(observation, dtype=float32)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Observation must be of shape {shape}: {error}") from error
+        if observation.shape != shape:
+            raise ValueError(f"Observation must be of shape {shape}, got {observation.shape}.")
+        return observation
+
+    async def act(self, observation: Sequence[float] | ndarray) -> int:
+        observation = self._get_observation(observation=observation)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((observation, future, perf_counter()))
+        return await future
+
+    async def _get_batch(self) -> list[tuple]:
+        batch: list[tuple] = [await self._queue.get()]
+        deadline: float = asyncio.get_running_loop().time() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout: float = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch: list[tuple] = await self._get_batch()
+            try:  # the forward runs off the event loop, so requests keep queueing meanwhile
+                observations: ndarray = stack([observation for observation, _, _ in batch])
+                actions: list[int] = (
+                    await asyncio.to_thread(self._policy.get_greedy_actions, observations=observations)
+                ).tolist()
+            except Exception as error:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            finished: float = perf_counter()
+            for (_, future, submitted), action in zip(batch, actions):
+                if not future.done():
+                    future.set_result(action)
+                self._latencies.append(finished - submitted)
+            self._batch_sizes[len(batch)] += 1
+            self._requests += len(batch)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def _respond(line: bytes) -> None:
+            request_id: Any = None
+            try:
+                request: dict = json.loads(line)
+                request_id = request.get("id")
+                response: dict = {"id": request_id, "action": await self.act(request["observation"])}
+            except Exception as error:
+                response = {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+            writer.write((json.dumps(response) + "\n").encode())
+
+        tasks: set[asyncio.Task] = set()
+        try:
+            while line := await reader.readline():  # requests are answered as they complete, matched by id
+                task: asyncio.Task = asyncio.create_task(_respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """
+            Listens for `{"id": ..., "observation": [...]}` lines and answers `{"id": ..., "action": ...}` lines.
+        """
+        return await asyncio.start_server(self._handle, host=host, port=port)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class PolicyClient:
+    """
+        Socket client of `PolicyServer`, many requests in flight over one connection.
+    """
+
+    _host: str = "127.0.0.1"
+    _port: int
+
+    _reader: asyncio.StreamReader | None = ib(init=False, default=None)
+    _writer: asyncio.StreamWriter | None = ib(init=False, default=None)
+    _listener: asyncio.Task | None = ib(init=False, default=None)
+    _pending: dict[int, asyncio.Future] = ib(init=False, factory=dict)
+    _ids: count = ib(init=False, factory=count)
+
+    async def __aenter__(self) -> "PolicyClient":
+        self._reader, self._writer = await asyncio.open_connection(host=self._host, port=self._port)
+        self._listener = asyncio.create_task(self._listen())
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+
+    async def _listen(self) -> None:
+        while line := await self._reader.readline():
+            response: dict = json.loads(line)
+            future: asyncio.Future | None = self._pending.pop(response["id"], None)
+            if future is None:  # an answer to a request the server couldn't read
+                continue
+            if "error" in response:
+                future.set_exception(RuntimeError(response["error"]))
+            else:
+                future.set_result(response["action"])
+
+    async def act(self, observation: Sequence[float] | ndarray) -> int:
+        request_id: int = next(self._ids)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        request: dict = {"id": request_id, "observation": asarray(observation, dtype=float).tolist()}
+        self._writer.write((json.dumps(request) + "\n").encode())
+        await self._writer.drain()
+        return await future
@@ -0,0 +1,128 @@
+from typing import Any
+
+from gymnasium.spaces import Box, Discrete
+from gymnasium.vector import VectorEnv, AutoresetMode
+from gymnasium.vector.utils import batch_space
+from pandas import DataFrame
+from numpy import inf, float32, ndarray, zeros, ones, asarray, broadcast_to, minimum, int64
+
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+from src.schemas.trading_state import TradingState
+from src.services.transition import TradingTransitionService
+
+
+class VectorTradingEnvironment(VectorEnv):
+    """
+        `num_envs` independent `TradingEnvironment` episodes over one shared frame, stepped in lockstep.
+        Lanes that terminate are reset by the following `step` call, whose action for them is ignored.
+        They start at the first complete row, as the environment's, unless `reset` gets other `starts`.
+    """
+
+    metadata: dict[str, Any] = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    _BBANDS_STDDEV: int = 1
+
+    def __init__(
+        self,
+        ohlc: DataFrame,
+        feature_columns: list,
+        commission: float,
+        funding: float,
+        num_envs: int
+    ) -> None:
+        super(VectorTradingEnvironment, self).__init__()
+
+        self._feature_columns: list = feature_columns
+        self._ohlc: MarketData = MarketData.from_frame(
+            ohlc=ohlc,
+            feature_columns=feature_columns,
+            columns=OHLC.COLUMNS + Indicators.get_columns(columns=ohlc.columns.to_list())
+        )
+        self._transition: TradingTransitionService = TradingTransitionService(commission=commission, funding=funding)
+
+        self.num_envs: int = num_envs
+        self.single_observation_space: Box = Box(low=-inf, high=inf, shape=(len(feature_columns),), dtype=float32)
+        self.single_action_space: Discrete = Discrete(n=LimitOrderActionSpace.n)
+        self.observation_space: Box = batch_space(self.single_observation_space, n=num_envs)
+        self.action_space = batch_space(self.single_action_space, n=num_envs)
+
+        self._state: TradingState = TradingState(n=num_envs)
+        self._first_step: int = self._ohlc.get_first_complete_row()  # warm-up rows of the indicators are skipped
+        self._starts: ndarray = zeros(num_envs, dtype=int64)
+        self._is_autoreset: ndarray = zeros(num_envs, dtype=bool)
+
+    @property
+    def observation_space_dimension(self) -> int:
+        return self.single_observation_space.shape[0]
+
+    @property
+    def action_space_dimension(self) -> int:
+        return self.single_action_space.n
+
+    @property
+    def rewards(self) -> ndarray:
+        return self._state.total_rewards
+
+    @property
+    def positions(self) -> ndarray:
+        return self._state.position
+
+    @property
+    def _dataset_length(self) -> int:
+        return self._ohlc.length - 1
+
+    def _get_observations(self, is_terminated: ndarray) -> ndarray:
+        observations: ndarray = self._ohlc.features[minimum(self._state.current_step, self._dataset_length)]
+        observations[is_terminated] = .0
+        return observations
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[ndarray, dict[str, Any]]:
+        super().reset(seed=seed, options=options)
+        starts: Any = (options or dict()).get("starts", self._first_step)
+        self._starts = broadcast_to(asarray(starts, dtype=int64), (self.num_envs,)).copy()
+        if (self._starts < 0).any() or (self._starts > self._dataset_length).any():
+            raise ValueError(f"Start offsets must be within [0, {self._dataset_length}].")
+
+        self._state.reset(mask=ones(self.num_envs, dtype=bool), starts=self._starts)
+        self._is_autoreset[:] = False
+        return self._get_observations(is_terminated=self._is_autoreset), dict()
+
+    def step(self, actions: ndarray) -> tuple[ndarray, ndarray, ndarray, ndarray, dict[str, Any]]:
+        actions = asarray(actions)
+        is_reset: ndarray = self._is_autoreset.copy()
+        if is_reset.any():
+            self._state.reset(mask=is_reset, starts=self._starts)
+
+        steps: ndarray = minimum(self._state.current_step, self._dataset_length)
+        is_active: ndarray = ~is_reset & (self._state.current_step < self._dataset_length)
+        is_terminated: ndarray = ~is_reset & ~is_active
+
+        rewards: ndarray = self._transition.step(
+            state=self._state,
+            actions=actions,
+            is_active=is_active,
+            l=self._ohlc.l[steps],
+            h=self._ohlc.h[steps],
+            c=self._ohlc.c[steps],
+            ema=self._ohlc.get_column(Indicators.EMA_COLUMN)[steps],
+            lower=self._ohlc.get_column(Indicators.get_lower_bbands_column(stddev=self._BBANDS_STDDEV))[steps],
+            upper=self._ohlc.get_column(Indicators.get_upper_bbands_column(stddev=self._BBANDS_STDDEV))[steps]
+        )
+        self._state.current_step[is_active] += 1
+        self._is_autoreset = is_terminated
+
+        return (
+            self._get_observations(is_terminated=is_terminated),
+            rewards,
+            is_terminated,
+            zeros(self.num_envs, dtype=bool),
+            dict()
+        )
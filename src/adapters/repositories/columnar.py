@@ -0,0 +1,93 @@
+import json
+import os
+from typing import ClassVar
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from attr import attrs
+from numpy import load, save, ascontiguousarray, ndarray
+from pandas import DataFrame, DatetimeIndex, Series
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ColumnarNumpyRepository:
+    """
+        Directory of `.npy` column files plus a `meta.json` fingerprint, loaded back as copies or read-only
+        memory-mapped arrays. Only numeric and datetime columns can be stored. A rewrite moves the old directory
+        aside before the new one takes its place, so a single writer at a time is assumed.
+    """
+
+    _path: str
+
+    _META_FILE: ClassVar[str] = "meta.json"
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self._path, self._META_FILE)
+
+    def _read_meta(self) -> dict | None:
+        try:
+            with open(self._meta_path) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, fingerprint: dict) -> bool:
+        meta: dict | None = self._read_meta()
+        return meta is not None and meta.get("fingerprint") == fingerprint
+
+    def read(self, is_memory_mapped: bool = False) -> DataFrame:
+        meta: dict = self._read_meta()
+        columns: dict = dict()
+        for column in meta["columns"]:
+            values: ndarray = load(
+                os.path.join(self._path, f"{column['file']}.npy"),
+                mmap_mode="r" if is_memory_mapped else None
+            )
+            if not column["is_datetime"]:
+                columns[column["name"]] = values
+                continue
+
+            dates: DatetimeIndex = DatetimeIndex(values.view("datetime64[ns]"), copy=False)
+            if column["tz"] is not None:  # tz-aware datetimes are stored as UTC nanoseconds
+                dates = dates.tz_localize("UTC").tz_convert(column["tz"])
+            columns[column["name"]] = Series(dates, copy=False)
+        return DataFrame(columns, copy=False)
+
+    def write(self, frame: DataFrame, fingerprint: dict) -> None:
+        parent: str = os.path.dirname(os.path.abspath(self._path))
+        staging: str = mkdtemp(dir=parent, prefix=".staging-")
+        try:
+            self._write_columns(frame=frame, fingerprint=fingerprint, path=staging)
+        except BaseException:
+            rmtree(staging, ignore_errors=True)
+            raise
+
+        if not os.path.exists(self._path):
+            os.replace(staging, self._path)
+            return
+
+        stale: str = mkdtemp(dir=parent, prefix=".stale-")
+        os.replace(self._path, os.path.join(stale, "cache"))
+        os.replace(staging, self._path)
+        rmtree(stale, ignore_errors=True)
+
+    def _write_columns(self, frame: DataFrame, fingerprint: dict, path: str) -> None:
+        columns: list[dict] = list()
+        for position, (name, series) in enumerate(frame.items()):
+            is_datetime: bool = is_datetime64_any_dtype(series.dtype)
+            if not is_datetime and not is_numeric_dtype(series.dtype):
+                raise ValueError(f"Only numeric and datetime columns can be cached: {name} is {series.dtype}")
+
+            tz: str | None = str(series.dt.tz) if is_datetime and series.dt.tz is not None else None
+            if is_datetime:
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None) if tz else series
+                values: ndarray = series.to_numpy(dtype="datetime64[ns]").view("int64")
+            else:
+                values = series.to_numpy()
+            save(os.path.join(path, f"{position}.npy"), ascontiguousarray(values), allow_pickle=False)
+            columns.append({"name": name, "file": position, "is_datetime": is_datetime, "tz": tz})
+
+        with open(os.path.join(path, self._META_FILE), "w") as meta_file:
+            json.dump({"fingerprint": fingerprint, "columns": columns}, meta_file)
@@ -0,0 +1,35 @@
+from typing import Sequence
+
+from attr import attrs, ib
+from numpy import ndarray, float32 as numpy_float32
+from torch import Tensor, dtype, as_tensor, empty, from_numpy, int64
+
+from src.adapters.repositories.replay import ReplayMemoryRepository
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class IndexedReplayMemoryRepository(ReplayMemoryRepository):
+    """
+        Replay memory of rows of `observations` instead of the observations themselves, e.g. the look-back
+        windows of `TradingEnvironment.observations`, so stacking more bars doesn't grow the memory. Batches
+        gather their rows, the only copies made.
+    """
+
+    _observations: ndarray = ib(repr=False)  # any shape per row
+
+    def _allocate(self, name: str, shape: tuple[int, ...], dtype: dtype) -> Tensor:
+        if name in ("states", "states_lead"):
+            return empty(shape[0], dtype=int64)
+        return super(IndexedReplayMemoryRepository, self)._allocate(name=name, shape=shape, dtype=dtype)
+
+    def _get_states(self, states: Sequence) -> Tensor:
+        return as_tensor(states, dtype=int64)
+
+    def _get_observations(self, rows: Tensor) -> Tensor:
+        return from_numpy(self._observations[rows.numpy()].astype(numpy_float32, copy=False))
+
+    def get_batch(self, indices: Tensor) -> tuple[Tensor, Tensor, Tensor, Tensor, Tensor, Tensor]:
+        rows, actions, returns, rows_lead, dones, discounts = super(IndexedReplayMemoryRepository, self).get_batch(
+            indices=indices
+        )
+        return self._get_observations(rows), actions, returns, self._get_observations(rows_lead), dones, discounts
@@ -0,0 +1,148 @@
+import os
+from collections import OrderedDict
+from hashlib import blake2b
+from time import perf_counter
+from typing import Callable
+
+from attr import attrs, ib
+from numpy import ndarray, ascontiguousarray, asarray, load, savez, stack
+
+from src.schemas.indicator_spec import IndicatorSpec
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class IndicatorCacheRepository:
+    """
+        Two-tier cache of indicator outputs keyed by the hash of the input columns and the indicator parameters.
+    """
+
+    _path: str | None = None  # on-disk tier is disabled without a directory
+    _memory_capacity: int = 256  # entries
+    _disk_capacity: int = 2 ** 30  # bytes
+
+    _memory: OrderedDict = ib(init=False, factory=OrderedDict)
+
+    _memory_hits: int = ib(init=False, default=0)
+    _disk_hits: int = ib(init=False, default=0)
+    _misses: int = ib(init=False, default=0)
+    _memory_evictions: int = ib(init=False, default=0)
+    _disk_evictions: int = ib(init=False, default=0)
+    _saved_seconds: float = ib(init=False, default=.0)
+
+    @property
+    def hits(self) -> int:
+        return self._memory_hits + self._disk_hits
+
+    @property
+    def memory_hits(self) -> int:
+        return self._memory_hits
+
+    @property
+    def disk_hits(self) -> int:
+        return self._disk_hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._memory_evictions + self._disk_evictions
+
+    @property
+    def saved_seconds(self) -> float:
+        return self._saved_seconds
+
+    @property
+    def statistics(self) -> dict:
+        return {
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "memory_evictions": self._memory_evictions,
+            "disk_evictions": self._disk_evictions,
+            "saved_seconds": self._saved_seconds
+        }
+
+    @staticmethod
+    def get_key(inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> str:
+        digest = blake2b(digest_size=20)
+        digest.update(repr((spec.kind, spec.window, spec.stddev, spec.matype, spec.shift)).encode())
+        for values in inputs:
+            values = ascontiguousarray(values)
+            digest.update(f"{values.dtype.str}{values.shape}".encode())
+            digest.update(memoryview(values).cast("B"))
+        return digest.hexdigest()
+
+    def _get_file(self, key: str) -> str:
+        return os.path.join(self._path, f"{key}.npz")
+
+    def _remember(self, key: str, outputs: tuple[ndarray, ...], seconds: float) -> None:
+        for values in outputs:
+            values.flags.writeable = False
+        self._memory[key] = (outputs, seconds)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_capacity:
+            self._memory.popitem(last=False)
+            self._memory_evictions += 1
+
+    def _read(self, key: str) -> tuple[tuple[ndarray, ...], float] | None:
+        if self._path is None or not os.path.exists(self._get_file(key)):
+            return None
+        with load(self._get_file(key), allow_pickle=False) as stored:
+            outputs: tuple[ndarray, ...] = tuple(stored["outputs"])
+            seconds: float = float(stored["seconds"])
+        os.utime(self._get_file(key))  # the modification time doubles as the LRU clock of the disk tier
+        return outputs, seconds
+
+    def _write(self, key: str, outputs: tuple[ndarray, ...], seconds: float) -> None:
+        if self._path is None:
+            return
+        os.makedirs(self._path, exist_ok=True)
+        staging: str = os.path.join(self._path, f".{key}.tmp")
+        with open(staging, "wb") as staging_file:
+            savez(staging_file, outputs=stack(outputs), seconds=asarray(seconds))
+        os.replace(staging, self._get_file(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries: list[os.DirEntry] = [entry for entry in os.scandir(self._path) if entry.name.endswith(".npz")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        size: int = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self._disk_capacity:
+                break
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+            self._disk_evictions += 1
+
+    def get_or_calculate(
+        self,
+        inputs: tuple[ndarray, ...],
+        spec: IndicatorSpec,
+        calculate: Callable[[], tuple[ndarray, ...]]
+    ) -> tuple[ndarray, ...]:
+        key: str = self.get_key(inputs=inputs, spec=spec)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            outputs, seconds = self._memory[key]
+            self._memory_hits += 1
+            self._saved_seconds += seconds
+            return outputs
+
+        stored: tuple[tuple[ndarray, ...], float] | None = self._read(key=key)
+        if stored is not None:
+            outputs, seconds = stored
+            self._disk_hits += 1
+            self._saved_seconds += seconds
+            self._remember(key=key, outputs=outputs, seconds=seconds)
+            return outputs
+
+        started: float = perf_counter()
+        outputs = calculate()
+        seconds = perf_counter() - started
+        self._misses += 1
+
+        self._remember(key=key, outputs=outputs, seconds=seconds)
+        self._write(key=key, outputs=outputs, seconds=seconds)
+        return outputs
@@ -0,0 +1,100 @@
+import os
+from typing import ClassVar
+
+import numpy
+from attr import attrs, ib
+from numpy import memmap, ndarray
+from torch import Tensor, dtype, from_numpy, float32, int64
+
+from src.adapters.repositories.replay import ReplayMemoryRepository
+
+
+def _reopen(parameters: dict) -> "MemoryMappedReplayMemoryRepository":
+    return MemoryMappedReplayMemoryRepository(**parameters)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class MemoryMappedReplayMemoryRepository(ReplayMemoryRepository):
+    """
+        Replay memory whose columns are fixed-width files in `path`, mapped into memory and wrapped as tensors,
+        so the capacity is bounded by the disk rather than RAM and sampling indexes the mapping directly.
+
+        A header file holds the cursor, length and the settings the returns were computed with. Opening a path
+        that has one resumes with every transition written before, without reading them; different settings
+        raise instead.
+    """
+
+    _path: str
+
+    _HEADER_FILE: ClassVar[str] = "header.bin"
+    _HEADER_DTYPE: ClassVar[numpy.dtype] = numpy.dtype([
+        ("cursor", numpy.int64),
+        ("length", numpy.int64),
+        ("capacity", numpy.int64),
+        ("observation_space_dimension", numpy.int64),
+        ("n_steps", numpy.int64),
+        ("gamma", numpy.float64)
+    ])
+    _DTYPES: ClassVar[dict] = {float32: numpy.float32, int64: numpy.int64}
+
+    _header: memmap = ib(init=False)
+    _is_resumed: bool = ib(init=False, default=False)
+    _maps: list[memmap] = ib(init=False, factory=list)
+
+    def __attrs_post_init__(self) -> None:
+        os.makedirs(self._path, exist_ok=True)
+        header_path: str = os.path.join(self._path, self._HEADER_FILE)
+        self._is_resumed = os.path.exists(header_path)
+        self._header = memmap(header_path, dtype=self._HEADER_DTYPE, mode="r+" if self._is_resumed else "w+", shape=1)
+        settings: tuple = (self._capacity, self._observation_space_dimension, self._n_steps, self._gamma)
+        if not self._is_resumed:
+            self._header[0] = (0, 0, *settings)
+        elif tuple(self._header[0])[2:] != settings:
+            raise ValueError(f"Replay memory at {self._path} was created with other settings: {self._header[0]}.")
+        super(MemoryMappedReplayMemoryRepository, self).__attrs_post_init__()
+
+    def __reduce__(self) -> tuple:
+        return _reopen, ({
+            "path": self._path,
+            "capacity": self._capacity,
+            "observation_space_dimension": self._observation_space_dimension,
+            "observation_space_shape": self._observation_space_shape,
+            "n_steps": self._n_steps,
+            "gamma": self._gamma
+        },)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def is_resumed(self) -> bool:
+        return self._is_resumed
+
+    def _allocate(self, name: str, shape: tuple[int, ...], dtype: dtype) -> Tensor:
+        values: memmap = memmap(
+            os.path.join(self._path, f"{name}.bin"),
+            dtype=self._DTYPES[dtype],
+            mode="r+" if self._is_resumed else "w+",
+            shape=shape
+        )
+        self._maps.append(values)
+        return from_numpy(values)
+
+    def _allocate_counters(self) -> Tensor:
+        counters: ndarray = self._header.view(numpy.int64)[:2]  # the cursor and the length
+        return from_numpy(counters)
+
+    def share_memory(self) -> "MemoryMappedReplayMemoryRepository":
+        """
+            Mapped files are shared already, processes it's passed to reopen them.
+        """
+        return self
+
+    def flush(self) -> None:
+        """
+            Writes the mapped pages back, the header last, so the files are consistent even if the host goes down.
+        """
+        for values in self._maps:
+            values.flush()
+        self._header.flush()
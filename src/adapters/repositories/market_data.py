@@ -0,0 +1,49 @@
+import json
+import os
+from typing import ClassVar
+
+from attr import attrs
+from numpy import ndarray, load, save
+
+from src.schemas.market_data import MarketData
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class MarketDataNumpyRepository:
+    """
+        `MarketData` as `.npy` files loaded back memory-mapped and read-only, so every process that reads them
+        shares the same page cache instead of holding its own copy.
+    """
+
+    _path: str
+
+    _META_FILE: ClassVar[str] = "meta.json"
+    _FEATURES_FILE: ClassVar[str] = "features.npy"
+    _DATES_FILE: ClassVar[str] = "dates.npy"
+
+    def _get_file(self, name: str) -> str:
+        return os.path.join(self._path, name)
+
+    def write(self, market_data: MarketData) -> None:
+        os.makedirs(self._path, exist_ok=True)
+        save(self._get_file(self._FEATURES_FILE), market_data.features, allow_pickle=False)
+        columns: list[str] = list(market_data.columns)
+        for position, column in enumerate(columns):
+            save(self._get_file(f"{position}.npy"), market_data.get_column(column), allow_pickle=False)
+        if market_data.dates is not None:
+            save(self._get_file(self._DATES_FILE), market_data.dates.view("int64"), allow_pickle=False)
+
+        with open(self._get_file(self._META_FILE), "w") as meta_file:
+            json.dump({"columns": columns, "has_dates": market_data.dates is not None}, meta_file)
+
+    def read(self) -> MarketData:
+        with open(self._get_file(self._META_FILE)) as meta_file:
+            meta: dict = json.load(meta_file)
+        dates: ndarray | None = None
+        if meta["has_dates"]:
+            dates = load(self._get_file(self._DATES_FILE), mmap_mode="r").view("datetime64[ns]")
+        columns: dict[str, ndarray] = {
+            column: load(self._get_file(f"{position}.npy"), mmap_mode="r")
+            for position, column in enumerate(meta["columns"])
+        }
+        return MarketData(load(self._get_file(self._FEATURES_FILE), mmap_mode="r"), columns, dates)
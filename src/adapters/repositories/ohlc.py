@@ -1,11 +1,52 @@
+import os
+
 from attr import attrs
-from pandas import read_csv, DataFrame
+from pandas import read_csv, DataFrame, to_datetime
+
+from src.adapters.repositories.columnar import ColumnarNumpyRepository
 
 
 @attrs(slots=True, auto_attribs=True, kw_only=True)
 class OHLCPandasRepository:
+    """
+        Reads the OHLC CSV through a columnar cache next to it. The frame is a writable copy unless
+        `is_memory_mapped` asks for read-only memory-mapped columns; CSVs with text columns are not cached.
+    """
 
     _path: str
+    _is_cached: bool = True
+    _is_memory_mapped: bool = False
+
+    @property
+    def _cache_path(self) -> str:
+        return f"{self._path}.cache"
+
+    @property
+    def _fingerprint(self) -> dict:
+        stat: os.stat_result = os.stat(self._path)
+        return {"path": os.path.abspath(self._path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _read_csv(self) -> DataFrame:
+        ohlc: DataFrame = read_csv(filepath_or_buffer=self._path)
+
+        ohlc["date"] = to_datetime(ohlc["date"])
+        ohlc["year"] = ohlc["date"].dt.year
+        ohlc["month"] = ohlc["date"].dt.month
+        ohlc["week"] = ohlc["date"].dt.isocalendar().week.astype("uint32")
+        ohlc["day"] = ohlc["date"].dt.day
+
+        return ohlc
 
     def get_ohlc(self) -> DataFrame:
-        return read_csv(filepath_or_buffer=self._path)
+        if not self._is_cached:
+            return self._read_csv()
+
+        cache: ColumnarNumpyRepository = ColumnarNumpyRepository(path=self._cache_path)
+        fingerprint: dict = self._fingerprint
+        if not cache.is_fresh(fingerprint=fingerprint):
+            ohlc: DataFrame = self._read_csv()
+            try:
+                cache.write(frame=ohlc, fingerprint=fingerprint)
+            except ValueError:
+                return ohlc
+        return cache.read(is_memory_mapped=self._is_memory_mapped)
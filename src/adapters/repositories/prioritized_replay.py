@@ -0,0 +1,52 @@
+from attr import attrs, ib
+from numpy import ndarray, arange, full, minimum, float64
+from torch import Tensor, as_tensor, rand, float32
+
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.schemas.sum_tree import SumTree
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class PrioritizedReplayMemoryRepository(ReplayMemoryRepository):
+    """
+        Replay memory sampled proportionally to `(|TD error| + epsilon) ** alpha` through a sum-tree, one draw
+        per equal segment of the total priority. New transitions get the highest priority seen so far.
+    """
+
+    _alpha: float = .6  # 0 is uniform sampling
+    _beta: float = .4  # importance-sampling correction, annealed up to 1
+    _beta_increment: float = .0  # per sampled batch
+    _epsilon: float = 1e-6  # keeps transitions with zero TD error reachable
+
+    _tree: SumTree = ib(init=False)
+    _max_priority: float = ib(init=False, default=1.)
+
+    def __attrs_post_init__(self) -> None:
+        super(PrioritizedReplayMemoryRepository, self).__attrs_post_init__()
+        self._tree = SumTree(capacity=self._capacity)
+
+    @property
+    def beta(self) -> float:
+        return self._beta
+
+    def _on_write(self, slots: Tensor) -> None:
+        self._tree.update(indices=slots.numpy(), priorities=full(len(slots), self._max_priority))
+
+    def sample_indices(self, batch_size: int) -> tuple[Tensor, Tensor]:
+        length: int = len(self)
+        if batch_size > length:
+            raise ValueError(f"Can't sample {batch_size} transitions out of {length}.")
+        total: float = self._tree.total
+        prefix_sums: ndarray = (arange(batch_size) + rand(batch_size, dtype=float32).numpy()) * (total / batch_size)
+        indices: ndarray = minimum(self._tree.find(prefix_sums=prefix_sums), length - 1)
+
+        probabilities: ndarray = self._tree.get(indices=indices) / total
+        weights: ndarray = (length * probabilities) ** -self._beta
+        weights /= (length * self._tree.min / total) ** -self._beta  # the largest possible weight is 1
+        self._beta = min(self._beta + self._beta_increment, 1.)
+        return as_tensor(indices), as_tensor(weights, dtype=float32)
+
+    def update_priorities(self, indices: Tensor, errors: Tensor) -> None:
+        priorities: ndarray = (errors.detach().abs().numpy().astype(float64) + self._epsilon) ** self._alpha
+        self._tree.update(indices=indices.numpy(), priorities=priorities)
+        self._max_priority = max(self._max_priority, float(priorities.max()))
@@ -0,0 +1,206 @@
+from math import prod
+from typing import Sequence
+
+from attr import attrs, ib
+from numpy import ndarray
+from torch import Tensor, dtype, as_tensor, arange, cat, cumprod, empty, zeros, ones, randint, maximum, float32, int64
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ReplayMemoryRepository:
+    """
+        Ring buffer of transitions in preallocated contiguous tensors, written in place and sampled by index,
+        so neither inserts nor batches create Python objects per transition.
+
+        Every insert also refreshes the discounted return of the last `n_steps` transitions up to the end of their
+        episode, with the transition whose next state bootstraps it. Until `n_steps` transitions follow, the return
+        is just shorter and discounted accordingly, so each slot always holds a valid target. Truncated episodes end
+        the returns as terminated ones do, but their last next state still bootstraps.
+    """
+
+    _capacity: int = 10_000
+    _observation_space_dimension: int
+    _observation_space_shape: tuple[int, ...] | None = None  # states keep this shape, flat without it
+    _n_steps: int = 1
+    _gamma: float = .99
+
+    _states: Tensor = ib(init=False)
+    _actions: Tensor = ib(init=False)
+    _rewards: Tensor = ib(init=False)
+    _states_lead: Tensor = ib(init=False)
+    _dones: Tensor = ib(init=False)  # terminated, the next state has no value
+    _ends: Tensor = ib(init=False)  # terminated or truncated, the returns stop there
+    _returns: Tensor = ib(init=False)
+    _bootstraps: Tensor = ib(init=False)  # slots whose next state and done close the return
+    _discounts: Tensor = ib(init=False)  # `gamma ** steps` of the return
+
+    _counters: Tensor = ib(init=False)  # the next slot to write and the length, shared along with the transitions
+
+    def __attrs_post_init__(self) -> None:
+        if self._capacity <= 0:
+            raise ValueError(f"Replay memory capacity must be positive, got {self._capacity}.")
+        if self._n_steps <= 0:
+            raise ValueError(f"Returns need at least one step, got {self._n_steps}.")
+        self._observation_space_shape = tuple(self._observation_space_shape or (self._observation_space_dimension,))
+        if prod(self._observation_space_shape) != self._observation_space_dimension:
+            raise ValueError(
+                f"States of {self._observation_space_shape} aren't {self._observation_space_dimension} wide."
+            )
+        self._states = self._allocate(
+            name="states", shape=(self._capacity, *self._observation_space_shape), dtype=float32
+        )
+        self._actions = self._allocate(name="actions", shape=(self._capacity,), dtype=int64)
+        self._rewards = self._allocate(name="rewards", shape=(self._capacity,), dtype=float32)
+        self._states_lead = self._allocate(
+            name="states_lead", shape=(self._capacity, *self._observation_space_shape), dtype=float32
+        )
+        self._dones = self._allocate(name="dones", shape=(self._capacity,), dtype=float32)
+        self._ends = self._allocate(name="ends", shape=(self._capacity,), dtype=float32)
+        self._returns = self._allocate(name="returns", shape=(self._capacity,), dtype=float32)
+        self._bootstraps = self._allocate(name="bootstraps", shape=(self._capacity,), dtype=int64)
+        self._discounts = self._allocate(name="discounts", shape=(self._capacity,), dtype=float32)
+        self._counters = self._allocate_counters()
+
+    def _allocate(self, name: str, shape: tuple[int, ...], dtype: dtype) -> Tensor:
+        return empty(shape, dtype=dtype)
+
+    def _allocate_counters(self) -> Tensor:
+        return zeros(2, dtype=int64)
+
+    def _get_states(self, states: Sequence) -> Tensor:
+        if isinstance(states, ndarray) and not states.flags.writeable:  # read-only views of the market data
+            states = states.copy()
+        return as_tensor(states, dtype=float32)
+
+    def __len__(self) -> int:
+        return int(self._counters[1])
+
+    @property
+    def _cursor(self) -> int:
+        return int(self._counters[0])
+
+    @property
+    def _tensors(self) -> tuple[Tensor, ...]:
+        return (
+            self._states, self._actions, self._rewards, self._states_lead, self._dones, self._ends,
+            self._returns, self._bootstraps, self._discounts, self._counters
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tensor.element_size() * tensor.nelement() for tensor in self._tensors)
+
+    def share_memory(self) -> "ReplayMemoryRepository":
+        """
+            Moves the memory to shared memory, so processes it's passed to write and read the same transitions.
+            Each instance takes a single writer.
+        """
+        for tensor in self._tensors:
+            tensor.share_memory_()
+        return self
+
+    def _advance(self, size: int) -> None:
+        self._counters[0] = (self._cursor + size) % self._capacity
+        self._counters[1] = min(len(self) + size, self._capacity)
+
+    def _get_slots(self, size: int) -> Tensor:
+        return (self._cursor + arange(size)) % self._capacity
+
+    def _update_returns(self, size: int, length: int) -> None:
+        previous: int = min(self._n_steps - 1, length, self._capacity - size)  # earlier returns the new rewards extend
+        window: int = previous + size
+        slots: Tensor = (self._cursor + size - window + arange(window)) % self._capacity
+
+        offsets: Tensor = arange(window)[:, None] + arange(self._n_steps)[None, :]
+        is_inside: Tensor = offsets < window
+        offsets = offsets.clamp(max=window - 1)
+        is_alive: Tensor = cumprod(1 - self._ends[slots][offsets], dim=1)  # no end so far, this step included
+        is_counted: Tensor = cat((ones(window, 1), is_alive[:, :-1]), dim=1) * is_inside
+        steps: Tensor = is_counted.sum(dim=1).long()
+
+        discounts: Tensor = self._gamma ** arange(self._n_steps, dtype=float32)
+        self._returns[slots] = (is_counted * discounts * self._rewards[slots][offsets]).sum(dim=1)
+        self._bootstraps[slots] = slots[arange(window) + steps - 1]
+        self._discounts[slots] = self._gamma ** steps.to(float32)
+
+    def append(self, transition: Sequence) -> None:
+        """
+            Takes `(state, action, reward, state_lead, terminated)`, optionally followed by `truncated`.
+        """
+        state, action, reward, state_lead, done = transition[:5]
+        is_truncated: bool = len(transition) > 5 and bool(transition[5])
+        length: int = len(self)
+        slot: int = self._cursor
+        self._states[slot] = self._get_states(state)
+        self._actions[slot] = int(action)
+        self._rewards[slot] = float(reward)
+        self._states_lead[slot] = self._get_states(state_lead)
+        self._dones[slot] = float(done)
+        self._ends[slot] = float(done or is_truncated)
+        self._update_returns(size=1, length=length)
+        self._advance(size=1)  # readers see the slots once they are complete
+        self._on_write(slots=as_tensor([slot]))
+
+    def extend(
+        self,
+        states: Sequence,
+        actions: Sequence,
+        rewards: Sequence,
+        states_lead: Sequence,
+        dones: Sequence,
+        truncations: Sequence | None = None
+    ) -> None:
+        """
+            Writes consecutive transitions of one stream, episodes separated by their dones or truncations.
+        """
+        length: int = len(self)
+        states = self._get_states(states)[-self._capacity:]  # older transitions would be overwritten anyway
+        slots: Tensor = self._get_slots(size=len(states))
+        self._states[slots] = states
+        self._actions[slots] = as_tensor(actions, dtype=int64)[-self._capacity:]
+        self._rewards[slots] = as_tensor(rewards, dtype=float32)[-self._capacity:]
+        self._states_lead[slots] = self._get_states(states_lead)[-self._capacity:]
+        dones = as_tensor(dones, dtype=float32)[-self._capacity:]
+        self._dones[slots] = dones
+        self._ends[slots] = dones if truncations is None else maximum(
+            dones, as_tensor(truncations, dtype=float32)[-self._capacity:]
+        )
+        self._update_returns(size=len(slots), length=length)
+        self._advance(size=len(slots))
+        self._on_write(slots=slots)
+
+    def _on_write(self, slots: Tensor) -> None:
+        ...
+
+    def get_batch(self, indices: Tensor) -> tuple[Tensor, Tensor, Tensor, Tensor, Tensor, Tensor]:
+        """
+            States, actions, returns, bootstrap states, their dones and the discounts of the bootstraps.
+        """
+        bootstraps: Tensor = self._bootstraps[indices]
+        return (
+            self._states[indices],
+            self._actions[indices],
+            self._returns[indices],
+            self._states_lead[bootstraps],
+            self._dones[bootstraps],
+            self._discounts[indices]
+        )
+
+    def sample_indices(self, batch_size: int) -> tuple[Tensor, Tensor]:
+        """
+            Indices of a batch and their importance-sampling weights, all ones for uniform sampling.
+        """
+        if batch_size > len(self):
+            raise ValueError(f"Can't sample {batch_size} transitions out of {len(self)}.")
+        return randint(len(self), (batch_size,)), ones(batch_size, dtype=float32)
+
+    def sample(self, batch_size: int) -> tuple[Tensor, Tensor, Tensor, Tensor, Tensor, Tensor]:
+        indices, _ = self.sample_indices(batch_size=batch_size)
+        return self.get_batch(indices=indices)
+
+    def update_priorities(self, indices: Tensor, errors: Tensor) -> None:
+        ...
@@ -0,0 +1,61 @@
+from attr import attrs, ib
+from torch import Tensor, as_tensor, cat, empty, ones, rand, searchsorted, float32, float64, int64
+
+from src.adapters.repositories.replay import ReplayMemoryRepository
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ShardedReplayMemoryRepository:
+    """
+        Replay memories of several writers read as one, sampled uniformly over all their transitions.
+        A batch index is the offset of the shard plus the slot within it.
+    """
+
+    _shards: list[ReplayMemoryRepository]
+
+    _offsets: Tensor = ib(init=False)  # the first index of every shard and the total capacity
+
+    def __attrs_post_init__(self) -> None:
+        offsets: Tensor = empty(len(self._shards) + 1, dtype=int64)
+        offsets[0] = 0
+        offsets[1:] = as_tensor([shard.capacity for shard in self._shards]).cumsum(0)
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    @property
+    def shards(self) -> list[ReplayMemoryRepository]:
+        return self._shards
+
+    @property
+    def capacity(self) -> int:
+        return int(self._offsets[-1])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shard.nbytes for shard in self._shards)
+
+    def sample_indices(self, batch_size: int) -> tuple[Tensor, Tensor]:
+        lengths: Tensor = as_tensor([len(shard) for shard in self._shards])  # a snapshot, writers keep appending
+        if batch_size > int(lengths.sum()):
+            raise ValueError(f"Can't sample {batch_size} transitions out of {int(lengths.sum())}.")
+        ends: Tensor = lengths.cumsum(0)
+        positions: Tensor = (rand(batch_size, dtype=float64) * ends[-1]).long()
+        shards: Tensor = searchsorted(ends, positions, right=True)
+        slots: Tensor = positions - (ends - lengths)[shards]
+        return self._offsets[shards] + slots, ones(batch_size, dtype=float32)
+
+    def get_batch(self, indices: Tensor) -> tuple[Tensor, ...]:
+        shards: Tensor = searchsorted(self._offsets, indices, right=True) - 1
+        batches: list[tuple[Tensor, ...]] = list()
+        orders: list[Tensor] = list()
+        for shard in shards.unique().tolist():
+            order: Tensor = (shards == shard).nonzero().squeeze(1)
+            batches.append(self._shards[shard].get_batch(indices=indices[order] - self._offsets[shard]))
+            orders.append(order)
+        inverse: Tensor = cat(orders).argsort()  # back to the order of the indices
+        return tuple(cat(tensors)[inverse] for tensors in zip(*batches))
+
+    def update_priorities(self, indices: Tensor, errors: Tensor) -> None:
+        ...
@@ -0,0 +1,66 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from numpy import ndarray
+from numpy.random import default_rng
+from pandas import DataFrame
+
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame, get_seconds
+from src.schemas.action_space import LimitOrderActionSpace
+from src.services.backtest import BacktestService
+
+
+def get_environment_seconds(ohlc: DataFrame, actions: ndarray) -> float:
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155
+    )
+
+    def _run_episode() -> None:
+        environment.reset()
+        steps: int = 0
+        done: bool = False
+        while not done:
+            _, _, done, _, _ = environment.step(actions[steps]).as_observation()
+            steps += 1
+
+    _run_episode()  # warm-up
+    return get_seconds(function=_run_episode)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="BacktestService.evaluate against TradingEnvironment.step")
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--lanes", type=int, nargs="+", default=[1, 16, 256, 1024])
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    frame: DataFrame = get_environment_frame(ohlc=OHLCPandasRepository(path=arguments.path).get_ohlc())
+    backtest: BacktestService = BacktestService(
+        ohlc=frame,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155
+    )
+    actions: ndarray = default_rng(arguments.seed).integers(
+        LimitOrderActionSpace.n,
+        size=(max(arguments.lanes), backtest.steps + 1)
+    )
+    environment_seconds: float = get_environment_seconds(ohlc=frame, actions=actions[0])
+    backtest.evaluate(actions=actions[:1])  # warm-up
+    for lanes in arguments.lanes:
+        seconds: float = get_seconds(function=lambda: backtest.evaluate(actions=actions[:lanes]))
+        report: dict = {
+            "rows": len(frame),
+            "lanes": lanes,
+            "seconds": seconds,
+            "ms_per_episode": seconds / lanes * 1e3,
+            "environment_ms_per_episode": environment_seconds * 1e3,
+            "speedup": environment_seconds * lanes / seconds
+        }
+        sys.stdout.write(json.dumps(report) + "\n")
@@ -0,0 +1,53 @@
+from time import perf_counter
+from typing import Any, Callable
+
+from pandas import DataFrame
+
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_type import IndicatorType
+from src.services.pipeline import FeaturePipelineService
+
+FEATURE_SPECS: list[IndicatorSpec] = [
+    IndicatorSpec(kind=IndicatorType.ema, column="o", window=7),
+    IndicatorSpec(kind=IndicatorType.ema, column="o", window=14),
+    IndicatorSpec(kind=IndicatorType.rsi, column="o", window=7),
+    IndicatorSpec(kind=IndicatorType.rsi, column="o", window=14),
+    IndicatorSpec(kind=IndicatorType.rsi, column="EMA_7_o", window=7),
+    IndicatorSpec(kind=IndicatorType.rsi, column="EMA_14_o", window=14),
+    IndicatorSpec(kind=IndicatorType.log, column="EMA_14_o", denominator="o"),
+]
+ENVIRONMENT_SPECS: list[IndicatorSpec] = [
+    IndicatorSpec(kind=IndicatorType.bbands, column="o", window=210, stddev=3),
+    IndicatorSpec(kind=IndicatorType.bbands, column="o", window=7, stddev=1),
+]
+ENVIRONMENT_COLUMNS: dict[str, str] = {  # the names `Indicators` reads the limits from
+    "BBANDS_UPPER_7_1_o": "BBANDS_UPPER_7_1",
+    "BBANDS_LOWER_7_1_o": "BBANDS_LOWER_7_1",
+}
+FEATURE_COLUMNS: list[str] = ["RSI_7_o", "RSI_14_o", "RSI_7_EMA_7_o", "RSI_14_EMA_14_o", "LOG_EMA_14_o_o"]
+
+
+def get_environment_frame(ohlc: DataFrame) -> DataFrame:
+    pipeline: FeaturePipelineService = FeaturePipelineService(
+        specs=FEATURE_SPECS + ENVIRONMENT_SPECS,
+        is_memory_traced=False
+    )
+    frame: DataFrame = pipeline.get_features(ohlc=ohlc).rename(columns=ENVIRONMENT_COLUMNS)
+    return frame.dropna(subset=FEATURE_COLUMNS + list(ENVIRONMENT_COLUMNS.values())).reset_index(drop=True)
+
+
+def get_rate(function: Callable[[], int], seconds: float = 1.) -> float:
+    """
+        Calls `function` until `seconds` pass and returns the number of units it reported per second.
+    """
+    units: int = 0
+    started: float = perf_counter()
+    while perf_counter() - started < seconds:
+        units += function()
+    return units / (perf_counter() - started)
+
+
+def get_seconds(function: Callable[[], Any]) -> float:
+    started: float = perf_counter()
+    function()
+    return perf_counter() - started
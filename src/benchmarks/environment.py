@@ -0,0 +1,44 @@
+import json
+import sys
+from argparse import ArgumentParser
+from random import Random
+
+from pandas import DataFrame
+
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame, get_rate
+from src.schemas.action_space import LimitOrderActionSpace
+
+
+def get_steps_per_second(ohlc: DataFrame, seconds: float = 1., seed: int = 0) -> float:
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155
+    )
+    random: Random = Random(seed)
+    actions: list[int] = [random.randrange(LimitOrderActionSpace.n) for _ in range(len(ohlc))]
+
+    def _run_episode() -> int:
+        environment.reset()
+        steps: int = 0
+        done: bool = False
+        while not done:
+            _, _, done, _, _ = environment.step(actions[steps]).as_observation()
+            steps += 1
+        return steps
+
+    return get_rate(function=_run_episode, seconds=seconds)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="TradingEnvironment.step throughput")
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--seconds", type=float, default=3.)
+    arguments = parser.parse_args()
+
+    frame: DataFrame = get_environment_frame(ohlc=OHLCPandasRepository(path=arguments.path).get_ohlc())
+    steps_per_second: float = get_steps_per_second(ohlc=frame, seconds=arguments.seconds)
+    sys.stdout.write(json.dumps({"rows": len(frame), "steps_per_second": steps_per_second}) + "\n")
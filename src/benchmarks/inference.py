@@ -0,0 +1,53 @@
+import json
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+from numpy import ndarray, empty, percentile
+from torch import Tensor, randn, manual_seed
+
+from src.benchmarks.common import FEATURE_COLUMNS
+from src.models.qnn import QNN
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.inference_backend import InferenceBackend
+from src.services.inference import QNNInferenceService
+
+
+def get_latencies(policy: QNNInferenceService, batch_size: int, calls: int = 200, warmup: int = 10) -> ndarray:
+    observations: Tensor = randn(batch_size, len(FEATURE_COLUMNS))
+    for _ in range(warmup):  # compilation and allocator warm-up
+        policy.act(observations=observations, epsilon=.1)
+
+    seconds: ndarray = empty(calls)
+    for call in range(calls):
+        started: float = perf_counter()
+        policy.act(observations=observations, epsilon=.1)
+        seconds[call] = perf_counter() - started
+    return seconds
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="QNN epsilon-greedy decision latency")
+    parser.add_argument("--backends", nargs="+", default=[InferenceBackend.eager, InferenceBackend.script])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 1024])
+    parser.add_argument("--calls", type=int, default=200)
+    arguments = parser.parse_args()
+
+    manual_seed(0)
+    qnn: QNN = QNN(observation_space_dimension=len(FEATURE_COLUMNS), action_space_dimension=LimitOrderActionSpace.n)
+    for backend in arguments.backends:
+        for is_quantized in (False, True):
+            policy: QNNInferenceService = QNNInferenceService(qnn=qnn, backend=backend, is_quantized=is_quantized)
+            for batch_size in arguments.batch_sizes:
+                latencies: ndarray = get_latencies(policy=policy, batch_size=batch_size, calls=arguments.calls)
+                report: dict = {
+                    "backend": backend,
+                    "is_quantized": is_quantized,
+                    "batch_size": batch_size,
+                    "p50_call_ms": percentile(latencies, 50) * 1e3,
+                    "p99_call_ms": percentile(latencies, 99) * 1e3,
+                    "p50_decision_us": percentile(latencies, 50) / batch_size * 1e6,
+                    "p99_decision_us": percentile(latencies, 99) / batch_size * 1e6,
+                    "decisions_per_second": batch_size / percentile(latencies, 50)
+                }
+                sys.stdout.write(json.dumps(report) + "\n")
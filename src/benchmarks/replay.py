@@ -0,0 +1,71 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from torch import Tensor, arange, rand, randn, randint, zeros, manual_seed
+
+from src.adapters.repositories.prioritized_replay import PrioritizedReplayMemoryRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_rate
+from src.schemas.action_space import LimitOrderActionSpace
+
+
+def get_filled_memory(
+    capacity: int,
+    is_prioritized: bool = False,
+    chunk_size: int = 2 ** 16
+) -> ReplayMemoryRepository:
+    memory_class: type = PrioritizedReplayMemoryRepository if is_prioritized else ReplayMemoryRepository
+    memory: ReplayMemoryRepository = memory_class(capacity=capacity, observation_space_dimension=len(FEATURE_COLUMNS))
+    for start in range(0, capacity, chunk_size):
+        size: int = min(chunk_size, capacity - start)
+        memory.extend(
+            states=randn(size, len(FEATURE_COLUMNS)),
+            actions=randint(LimitOrderActionSpace.n, (size,)),
+            rewards=randn(size),
+            states_lead=randn(size, len(FEATURE_COLUMNS)),
+            dones=zeros(size)
+        )
+    if is_prioritized:  # spread the priorities as training would
+        for start in range(0, capacity, chunk_size):
+            indices: Tensor = arange(start, min(start + chunk_size, capacity))
+            memory.update_priorities(indices=indices, errors=rand(len(indices)))
+    return memory
+
+
+def get_batches_per_second(memory: ReplayMemoryRepository, batch_size: int, seconds: float = 1.) -> dict:
+    def _sample() -> int:
+        indices, _ = memory.sample_indices(batch_size=batch_size)
+        memory.get_batch(indices=indices)
+        return 1
+
+    def _update() -> int:
+        indices, _ = memory.sample_indices(batch_size=batch_size)
+        memory.update_priorities(indices=indices, errors=rand(batch_size))
+        return 1
+
+    return {
+        "sample_batches_per_second": get_rate(function=_sample, seconds=seconds),
+        "sample_and_update_batches_per_second": get_rate(function=_update, seconds=seconds)
+    }
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Replay memory sampling cost against capacity")
+    parser.add_argument("--capacities", type=int, nargs="+", default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 2 ** 21])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seconds", type=float, default=1.)
+    arguments = parser.parse_args()
+
+    manual_seed(0)
+    for capacity in arguments.capacities:
+        for is_prioritized in (False, True):
+            memory: ReplayMemoryRepository = get_filled_memory(capacity=capacity, is_prioritized=is_prioritized)
+            report: dict = {
+                "capacity": capacity,
+                "is_prioritized": is_prioritized,
+                "batch_size": arguments.batch_size,
+                "memory_bytes": memory.nbytes,
+                **get_batches_per_second(memory=memory, batch_size=arguments.batch_size, seconds=arguments.seconds)
+            }
+            sys.stdout.write(json.dumps(report) + "\n")
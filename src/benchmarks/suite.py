@@ -0,0 +1,148 @@
+import json
+import os
+import platform
+import sys
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy
+import pandas
+import torch
+from numpy import ndarray, empty, percentile
+from pandas import DataFrame
+from torch import manual_seed
+
+from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.benchmarks.common import (
+    FEATURE_SPECS, ENVIRONMENT_SPECS, FEATURE_COLUMNS, get_environment_frame, get_rate, get_seconds
+)
+from src.benchmarks.environment import get_steps_per_second
+from src.benchmarks.replay import get_filled_memory, get_batches_per_second
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.models.qnn import QNN
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_type import IndicatorType
+from src.services.common.ohlc_base import OHLCPandasService
+from src.services.pipeline import FeaturePipelineService
+
+SPECS: list[IndicatorSpec] = FEATURE_SPECS + ENVIRONMENT_SPECS + [IndicatorSpec(kind=IndicatorType.atr, window=14)]
+ENVIRONMENT_ROWS: int = 100_000  # steps/s don't depend on the length, episodes of every size would take hours
+MEMORY_CAPACITY: int = 2 ** 20
+BATCH_SIZE: int = 256
+
+
+def _get_load(path: str) -> dict:
+    repository: OHLCPandasRepository = OHLCPandasRepository(path=path)
+    return {
+        "csv_seconds": get_seconds(function=OHLCPandasRepository(path=path, is_cached=False).get_ohlc),
+        "cache_write_seconds": get_seconds(function=repository.get_ohlc),  # the first read fills the cache
+        "cache_read_seconds": get_seconds(function=repository.get_ohlc),
+        "cache_mapped_read_seconds": get_seconds(
+            function=OHLCPandasRepository(path=path, is_memory_mapped=True).get_ohlc
+        )
+    }
+
+
+def _get_indicators(ohlc: DataFrame) -> list[dict]:
+    pipeline: FeaturePipelineService = FeaturePipelineService(specs=SPECS, is_memory_traced=False)
+    pipeline.get_features(ohlc=ohlc)
+    return [
+        {"columns": report.columns, "seconds": report.seconds, "rows_per_second": len(ohlc) / report.seconds}
+        for report in pipeline.reports
+    ]
+
+
+def _get_resample(ohlc: DataFrame) -> dict:
+    daily: DataFrame = OHLCPandasService.resample(ohlc=ohlc, timeframe="1D")
+    weekly: DataFrame = OHLCPandasService.resample(ohlc=ohlc, timeframe="1W")
+    return {
+        "resample_1d_seconds": get_seconds(function=lambda: OHLCPandasService.resample(ohlc=ohlc, timeframe="1D")),
+        "resample_1w_seconds": get_seconds(function=lambda: OHLCPandasService.resample(ohlc=ohlc, timeframe="1W")),
+        "align_seconds": get_seconds(function=lambda: OHLCPandasService.align(base=ohlc, higher=weekly, columns=["c"])),
+        "merge_seconds": get_seconds(function=lambda: OHLCPandasService.merge(
+            left=ohlc, right=daily[["date", "c"]].rename(columns={"c": "c_1D"}), on=["date"]
+        ))
+    }
+
+
+def _get_learn(memory: ReplayMemoryRepository, seconds: float) -> dict:
+    agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+        alpha=.001,
+        gamma=.99,
+        epsilon=.0,
+        qnn=QNN(observation_space_dimension=len(FEATURE_COLUMNS), action_space_dimension=LimitOrderActionSpace.n),
+        tau=.005,
+        memory=memory
+    )
+
+    def _update() -> int:
+        agent.learn(batch_size=BATCH_SIZE)
+        return 1
+
+    return {"batch_size": BATCH_SIZE, "updates_per_second": get_rate(function=_update, seconds=seconds)}
+
+
+def _get_act(frame: DataFrame, calls: int = 1_000) -> dict:
+    agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+        alpha=.001,
+        gamma=.99,
+        epsilon=.0,  # always the network, exploration is a random draw
+        qnn=QNN(observation_space_dimension=len(FEATURE_COLUMNS), action_space_dimension=LimitOrderActionSpace.n),
+        memory_capacity=1
+    )
+    observations: ndarray = frame[FEATURE_COLUMNS].to_numpy(dtype=numpy.float32)[:calls]
+    seconds: ndarray = empty(len(observations))
+    for call, observation in enumerate(observations):
+        started: float = perf_counter()
+        agent.act(observation=observation)
+        seconds[call] = perf_counter() - started
+    return {"p50_us": percentile(seconds, 50) * 1e6, "p99_us": percentile(seconds, 99) * 1e6}
+
+
+def get_report(rows: int, directory: str, seconds: float = 1., seed: int = 0) -> dict:
+    manual_seed(seed)
+    path: str = os.path.join(directory, f"{rows}.csv")
+    get_synthetic_ohlc(rows=rows, seed=seed).to_csv(path, index=False)
+    load: dict = _get_load(path=path)
+    ohlc: DataFrame = OHLCPandasRepository(path=path).get_ohlc()
+
+    frame: DataFrame = get_environment_frame(ohlc=ohlc.iloc[:ENVIRONMENT_ROWS])
+    memory: ReplayMemoryRepository = get_filled_memory(capacity=min(rows, MEMORY_CAPACITY))
+    return {
+        "rows": rows,
+        "seed": seed,
+        "load": load,
+        "indicators": _get_indicators(ohlc=ohlc),
+        "resample": _get_resample(ohlc=ohlc),
+        "environment": {"rows": len(frame), "steps_per_second": get_steps_per_second(ohlc=frame, seconds=seconds)},
+        "replay": {
+            "capacity": memory.capacity,
+            "batch_size": BATCH_SIZE,
+            **get_batches_per_second(memory=memory, batch_size=BATCH_SIZE, seconds=seconds)
+        },
+        "learn": _get_learn(memory=memory, seconds=seconds),
+        "act": _get_act(frame=frame)
+    }
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Throughput of every stage on synthetic OHLCV")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--seconds", type=float, default=1., help="per rate")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    versions: dict = {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "torch": torch.__version__
+    }
+    with TemporaryDirectory(prefix="benchmark-") as directory:
+        for rows in arguments.rows:
+            report: dict = get_report(rows=rows, directory=directory, seconds=arguments.seconds, seed=arguments.seed)
+            sys.stdout.write(json.dumps({**report, "versions": versions}) + "\n")
@@ -0,0 +1,31 @@
+from numpy import ndarray, concatenate, cumsum, exp, abs as absolute, maximum, minimum
+from numpy.random import Generator, default_rng
+from pandas import DataFrame, date_range
+
+
+def get_synthetic_ohlc(
+    rows: int,
+    seed: int = 0,
+    price: float = 100.,
+    drift: float = .0,
+    volatility: float = .001,
+    start: str = "2000-01-03",
+    frequency: str = "5min"
+) -> DataFrame:
+    """
+        Geometric Brownian motion bars in the columns of the CSV files, the same for the same seed. Every bar opens
+        at the previous close, wicks spread both ways from the body. Five-minute bars keep 10M rows within
+        the nanosecond timestamp range.
+    """
+    random: Generator = default_rng(seed)
+    c: ndarray = price * exp(cumsum(random.normal(drift, volatility, rows)))
+    o: ndarray = concatenate(([price], c[:-1]))
+    wicks: ndarray = exp(absolute(random.normal(0, volatility / 2, (2, rows))))
+    return DataFrame({
+        "date": date_range(start=start, periods=rows, freq=frequency, tz="UTC"),
+        "o": o,
+        "h": maximum(o, c) * wicks[0],
+        "l": minimum(o, c) / wicks[1],
+        "c": c,
+        "v": random.lognormal(16, 1, rows).round()
+    })
@@ -1,14 +1,29 @@
+from math import prod
+
 from torch.nn import Module, Linear, LeakyReLU
 from torch import relu, sigmoid
 
 
 class QNN(Module):
 
-    def __init__(self, observation_space_dimension: int, action_space_dimension: int) -> None:
+    def __init__(
+        self,
+        observation_space_dimension: int,
+        action_space_dimension: int,
+        observation_space_shape: tuple[int, ...] | None = None  # of `(window, features)` observations, flat without it
+    ) -> None:
         super(QNN, self).__init__()
 
         self._observation_space_dimension: int = observation_space_dimension
         self._action_space_dimension: int = action_space_dimension
+        self._observation_space_shape: tuple[int, ...] = tuple(
+            observation_space_shape or (observation_space_dimension,)
+        )
+        if prod(self._observation_space_shape) != observation_space_dimension:
+            raise ValueError(
+                f"Observations of {self._observation_space_shape} aren't {observation_space_dimension} wide."
+            )
+        self._observation_dimensions: int = len(self._observation_space_shape)  # flattened at the input
 
         self._input_layer: Linear = Linear(in_features=observation_space_dimension, out_features=1024)
         self._hidden_layer: Linear = Linear(in_features=1024, out_features=1024)
@@ -17,6 +32,7 @@ class QNN(Module):
         self._activation_function: LeakyReLU = LeakyReLU()
 
     def forward(self, x):
+        x = x.flatten(start_dim=x.dim() - self._observation_dimensions)
         x = sigmoid(input=self._input_layer(x))
         x = sigmoid(input=self._hidden_layer(x))
         return self._activation_function(self._output_layer(x))
@@ -25,6 +41,10 @@ class QNN(Module):
     def observation_space_dimension(self) -> int:
         return self._observation_space_dimension
 
+    @property
+    def observation_space_shape(self) -> tuple[int, ...]:
+        return self._observation_space_shape
+
     @property
     def action_space_dimension(self) -> int:
         return self._action_space_dimension
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+from numpy import ndarray
+
+from src.schemas.trade_ledger import TradeLedger
+
+
+@dataclass
+class BacktestReport:
+
+    _rewards: ndarray  # lanes x steps
+    _positions: ndarray  # lanes x steps, `PositionType` codes after each step
+    _trades: ndarray  # `Trade.DTYPE` records
+
+    @property
+    def rewards(self) -> ndarray:
+        return self._rewards
+
+    @property
+    def positions(self) -> ndarray:
+        return self._positions
+
+    @property
+    def trades(self) -> ndarray:
+        return self._trades
+
+    @property
+    def total_rewards(self) -> ndarray:
+        return self._rewards.sum(axis=1)
+
+    def get_ledger(self, lane: int = 0) -> TradeLedger:
+        return TradeLedger.from_records(self._trades[self._trades["lane"] == lane])
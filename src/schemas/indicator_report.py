@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class IndicatorReport:
+
+    _columns: list[str]
+    _seconds: float
+    _peak_memory: int  # bytes allocated on top of the pipeline while the indicator ran
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    @property
+    def peak_memory(self) -> int:
+        return self._peak_memory
@@ -0,0 +1,41 @@
+from attr import attrs
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True, frozen=True)
+class IndicatorSpec:
+
+    _kind: str
+    _column: str = "c"
+    _window: int = 0
+    _stddev: float = .0
+    _matype: int = 0
+    _shift: int = 0
+    _denominator: str | None = None  # LOG only
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def column(self) -> str:
+        return self._column
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def stddev(self) -> float:
+        return self._stddev
+
+    @property
+    def matype(self) -> int:
+        return self._matype
+
+    @property
+    def shift(self) -> int:
+        return self._shift
+
+    @property
+    def denominator(self) -> str | None:
+        return self._denominator
@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field
+
+from numpy import ndarray
+
+from src.schemas.indicator_spec import IndicatorSpec
+
+
+@dataclass
+class IndicatorSweep:
+
+    _specs: list[IndicatorSpec]  # every parameter combination, in the order of the columns
+    _columns: list[str]
+    _matrix: ndarray  # rows x parameter combinations, float32
+    _positions: dict[str, int] = field(init=False)
+    _spec_positions: dict[IndicatorSpec, int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._positions = {column: position for position, column in enumerate(self._columns)}
+        self._spec_positions = {spec: position for position, spec in enumerate(self._specs)}
+
+    @property
+    def specs(self) -> list[IndicatorSpec]:
+        return self._specs
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    @property
+    def matrix(self) -> ndarray:
+        return self._matrix
+
+    def __contains__(self, spec: IndicatorSpec) -> bool:
+        """
+            Whole specs are matched, columns don't name every parameter, e.g. `matype` or `shift`.
+        """
+        return spec in self._spec_positions
+
+    def get_column(self, column: str) -> ndarray:
+        return self._matrix[:, self._positions[column]]
+
+    def get_values(self, spec: IndicatorSpec) -> ndarray:
+        """
+            Columns of `spec` in the order its service names them, rows x outputs.
+        """
+        width: int = len(self._columns) // len(self._specs)
+        position: int = self._spec_positions[spec] * width
+        return self._matrix[:, position:position + width]
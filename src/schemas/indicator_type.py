@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass
+class IndicatorType:
+
+    _EMA: ClassVar[str] = "EMA"
+    _RSI: ClassVar[str] = "RSI"
+    _BBANDS: ClassVar[str] = "BBANDS"
+    _ATR: ClassVar[str] = "ATR"
+    _LOG: ClassVar[str] = "LOG"
+
+    @classmethod
+    @property
+    def ema(cls) -> str:
+        return cls._EMA
+
+    @classmethod
+    @property
+    def rsi(cls) -> str:
+        return cls._RSI
+
+    @classmethod
+    @property
+    def bbands(cls) -> str:
+        return cls._BBANDS
+
+    @classmethod
+    @property
+    def atr(cls) -> str:
+        return cls._ATR
+
+    @classmethod
+    @property
+    def log(cls) -> str:
+        return cls._LOG
@@ -1,20 +1,38 @@
 from dataclasses import dataclass
+from typing import ClassVar
 
-from pandas import DataFrame
+from src.schemas.market_data import MarketData
 
 
 @dataclass
 class Indicators:
 
+    EMA_COLUMN: ClassVar[str] = "BBANDS_MIDDLE_210_3_o"
+    LOWER_BBANDS_PREFIX: ClassVar[str] = "BBANDS_LOWER_7_"
+    UPPER_BBANDS_PREFIX: ClassVar[str] = "BBANDS_UPPER_7_"
+
     _current_step: int
-    _ohlc: DataFrame
+    _ohlc: MarketData
+
+    @classmethod
+    def get_columns(cls, columns: list[str]) -> list[str]:
+        prefixes: tuple[str, ...] = (cls.LOWER_BBANDS_PREFIX, cls.UPPER_BBANDS_PREFIX)
+        return [cls.EMA_COLUMN] + [column for column in columns if column.startswith(prefixes)]
+
+    @classmethod
+    def get_lower_bbands_column(cls, stddev: float) -> str:
+        return f"{cls.LOWER_BBANDS_PREFIX}{stddev}"
+
+    @classmethod
+    def get_upper_bbands_column(cls, stddev: float) -> str:
+        return f"{cls.UPPER_BBANDS_PREFIX}{stddev}"
 
     @property
     def ema(self) -> float:
-        return self._ohlc["BBANDS_MIDDLE_210_3_o"].iloc[self._current_step]
+        return self._ohlc.get_column(self.EMA_COLUMN)[self._current_step]
 
     def get_lower_bbands(self, stddev: float) -> float:
-        return self._ohlc[f"BBANDS_LOWER_7_{stddev}"].iloc[self._current_step]
+        return self._ohlc.get_column(self.get_lower_bbands_column(stddev=stddev))[self._current_step]
 
     def get_upper_bbands(self, stddev: float) -> float:
-        return self._ohlc[f"BBANDS_UPPER_7_{stddev}"].iloc[self._current_step]
+        return self._ohlc.get_column(self.get_upper_bbands_column(stddev=stddev))[self._current_step]
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass
+class InferenceBackend:
+
+    _EAGER: ClassVar[str] = "eager"
+    _COMPILE: ClassVar[str] = "compile"  # `torch.compile`
+    _SCRIPT: ClassVar[str] = "script"  # frozen TorchScript
+
+    @classmethod
+    @property
+    def eager(cls) -> str:
+        return cls._EAGER
+
+    @classmethod
+    @property
+    def compile(cls) -> str:
+        return cls._COMPILE
+
+    @classmethod
+    @property
+    def script(cls) -> str:
+        return cls._SCRIPT
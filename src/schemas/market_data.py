@@ -0,0 +1,88 @@
+from attr import attrs
+from numpy import ndarray, ascontiguousarray, isfinite, flatnonzero, datetime64, float32, float64
+from pandas import DataFrame
+
+
+def _freeze(values: ndarray) -> ndarray:
+    values.flags.writeable = False
+    return values
+
+
+@attrs(slots=True, auto_attribs=True, frozen=True)
+class MarketData:
+    """
+        Contiguous read-only arrays of a prepared frame: float32 features for observations and float64 columns
+        for prices and indicators, so reward math stays in the precision of the frame.
+    """
+
+    _features: ndarray
+    _columns: dict[str, ndarray]
+    _dates: ndarray | None = None
+
+    @classmethod
+    def from_frame(cls, ohlc: DataFrame, feature_columns: list[str], columns: list[str]) -> "MarketData":
+        return cls(
+            _freeze(ascontiguousarray(ohlc[feature_columns].to_numpy(dtype=float32))),
+            {column: _freeze(ascontiguousarray(ohlc[column].to_numpy(dtype=float64))) for column in columns},
+            _freeze(ohlc["date"].to_numpy(dtype="datetime64[ns]")) if "date" in ohlc.columns else None
+        )
+
+    @property
+    def features(self) -> ndarray:
+        return self._features
+
+    @property
+    def columns(self) -> dict[str, ndarray]:
+        return self._columns
+
+    @property
+    def dates(self) -> ndarray | None:
+        return self._dates
+
+    @property
+    def length(self) -> int:
+        return len(self._features)
+
+    def get_first_complete_row(self) -> int:
+        """
+            The row after the last one with a missing feature or column, e.g. while indicators warm up.
+        """
+        is_complete: ndarray = isfinite(self._features).all(axis=1)
+        for values in self._columns.values():
+            is_complete &= isfinite(values)
+        incomplete: ndarray = flatnonzero(~is_complete)
+        return int(incomplete[-1]) + 1 if len(incomplete) else 0
+
+    def get_slice(self, start: int, stop: int) -> "MarketData":
+        """
+            Rows `[start, stop)` as views of the same arrays, memory-mapped ones included.
+        """
+        return MarketData(
+            self._features[start:stop],
+            {column: values[start:stop] for column, values in self._columns.items()},
+            None if self._dates is None else self._dates[start:stop]
+        )
+
+    def get_date(self, step: int | ndarray) -> datetime64 | ndarray:
+        if self._dates is None:
+            return datetime64("NaT", "ns")
+        return self._dates[step]
+
+    @property
+    def o(self) -> ndarray:
+        return self._columns["o"]
+
+    @property
+    def h(self) -> ndarray:
+        return self._columns["h"]
+
+    @property
+    def l(self) -> ndarray:
+        return self._columns["l"]
+
+    @property
+    def c(self) -> ndarray:
+        return self._columns["c"]
+
+    def get_column(self, column: str) -> ndarray:
+        return self._columns[column]
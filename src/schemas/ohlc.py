@@ -1,48 +1,51 @@
 from dataclasses import dataclass
+from typing import ClassVar
 
-from pandas import DataFrame
+from src.schemas.market_data import MarketData
 
 
 @dataclass
 class OHLC:
 
+    COLUMNS: ClassVar[list[str]] = ["o", "h", "l", "c"]
+
     _current_step: int
-    _ohlc: DataFrame
+    _ohlc: MarketData
 
     @property
     def o(self) -> float:
-        return self._ohlc["o"].iloc[self._current_step]
+        return self._ohlc.o[self._current_step]
 
     @property
     def h(self) -> float:
-        return self._ohlc["h"].iloc[self._current_step]
+        return self._ohlc.h[self._current_step]
 
     @property
     def l(self) -> float:
-        return self._ohlc["l"].iloc[self._current_step]
+        return self._ohlc.l[self._current_step]
 
     @property
     def c(self) -> float:
-        return self._ohlc["c"].iloc[self._current_step]
+        return self._ohlc.c[self._current_step]
 
 
 @dataclass
 class OHLCLead:
     _current_step: int
-    _ohlc: DataFrame
+    _ohlc: MarketData
 
     @property
     def o(self) -> float:
-        return self._ohlc["o"].iloc[self._current_step + 1]
+        return self._ohlc.o[self._current_step + 1]
 
     @property
     def h(self) -> float:
-        return self._ohlc["h"].iloc[self._current_step + 1]
+        return self._ohlc.h[self._current_step + 1]
 
     @property
     def l(self) -> float:
-        return self._ohlc["l"].iloc[self._current_step + 1]
+        return self._ohlc.l[self._current_step + 1]
 
     @property
     def c(self) -> float:
-        return self._ohlc["c"].iloc[self._current_step + 1]
+        return self._ohlc.c[self._current_step + 1]
@@ -9,6 +9,8 @@ class PositionType:
     _SHORT: ClassVar[str] = "_short"
     _NEUTRAL: ClassVar[str] = "_neutral"
 
+    _CODES: ClassVar[dict[str, int]] = {_NEUTRAL: 0, _LONG: 1, _SHORT: 2}  # for position arrays
+
     @classmethod
     @property
     def long_position(cls) -> str:
@@ -23,3 +25,7 @@ class PositionType:
     @property
     def neutral_position(cls) -> str:
         return cls._NEUTRAL
+
+    @classmethod
+    def get_code(cls, position: str) -> int:
+        return cls._CODES[position]
@@ -0,0 +1,57 @@
+from attr import attrs, ib
+from numpy import ndarray, zeros, full, asarray, minimum, inf, int64, float64
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class SumTree:
+    """
+        Binary tree of priority sums in one flat array: the root at 1, node `i` has children `2i` and `2i + 1`
+        and the leaves start at the first power of two not below the capacity. Batches of updates and prefix-sum
+        searches walk it level by level, O(log n) each with vectorized levels. A twin tree keeps the minimums.
+    """
+
+    _capacity: int
+
+    _leaves: int = ib(init=False)
+    _tree: ndarray = ib(init=False)
+    _minimums: ndarray = ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._leaves = 1 << max(self._capacity - 1, 0).bit_length()
+        self._tree = zeros(2 * self._leaves, dtype=float64)
+        self._minimums = full(2 * self._leaves, inf, dtype=float64)  # leaves never set don't count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def total(self) -> float:
+        return float(self._tree[1])
+
+    @property
+    def min(self) -> float:
+        return float(self._minimums[1])
+
+    def get(self, indices: ndarray) -> ndarray:
+        return self._tree[self._leaves + asarray(indices, dtype=int64)]
+
+    def update(self, indices: ndarray, priorities: ndarray) -> None:
+        nodes: ndarray = self._leaves + asarray(indices, dtype=int64)
+        self._tree[nodes] = priorities  # a repeated index keeps its last priority
+        self._minimums[nodes] = priorities
+        nodes = nodes // 2  # all on one level, repeated parents just get the same sums twice
+        while nodes[0] >= 1:
+            self._tree[nodes] = self._tree[2 * nodes] + self._tree[2 * nodes + 1]
+            self._minimums[nodes] = minimum(self._minimums[2 * nodes], self._minimums[2 * nodes + 1])
+            nodes //= 2
+
+    def find(self, prefix_sums: ndarray) -> ndarray:
+        prefix_sums = asarray(prefix_sums, dtype=float64).copy()
+        nodes: ndarray = zeros(len(prefix_sums), dtype=int64) + 1
+        while nodes[0] < self._leaves:
+            left: ndarray = 2 * nodes
+            is_right: ndarray = prefix_sums >= self._tree[left]
+            prefix_sums -= self._tree[left] * is_right
+            nodes = left + is_right
+        return minimum(nodes - self._leaves, self._capacity - 1)
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
+
+from numpy import ndarray, dtype, where, int8, int64, float64
 
 from src.schemas.position_type import PositionType
 
@@ -7,6 +10,19 @@ from src.schemas.position_type import PositionType
 @dataclass
 class Trade:
 
+    DTYPE: ClassVar[dtype] = dtype(  # a trade per record of array-based ledgers
+        [
+            ("lane", int64),
+            ("entry_step", int64),
+            ("exit_step", int64),  # -1 while the position is still open
+            ("side", int8),  # `PositionType` code
+            ("entry_price", float64),  # true price of the position, DCA included
+            ("exit_price", float64),  # NaN while the position is still open
+            ("timestamp", "datetime64[ns]"),  # of the entry bar, NaT without dates
+            ("ticks_in_trade", int64),
+        ]
+    )
+
     _entry_price: float
     _exit_price: float
     _side: str
@@ -25,3 +41,8 @@ class Trade:
         if self._side == PositionType.long_position:
             return self._pl_on_long_position()
         return self._pl_on_short_position()
+
+    @staticmethod
+    def get_pl(records: ndarray) -> ndarray:
+        pl: ndarray = records["exit_price"] / records["entry_price"] - 1
+        return where(records["side"] == PositionType.get_code(PositionType.long_position), pl, pl * -1)
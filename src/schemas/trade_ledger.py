@@ -0,0 +1,102 @@
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import ndarray, empty, concatenate, cumprod, maximum, datetime64
+
+from src.schemas.trade import Trade
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class TradeLedger:
+    """
+        Append-only `Trade.DTYPE` records in a preallocated array that grows by whole chunks.
+        Summaries cover closed trades only and compound their P&L into an equity curve that starts at 1.
+    """
+
+    _CHUNK_SIZE: ClassVar[int] = 1024
+
+    _records: ndarray = ib(init=False)
+    _size: int = ib(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        self._records = empty(self._CHUNK_SIZE, dtype=Trade.DTYPE)
+
+    @classmethod
+    def from_records(cls, records: ndarray) -> "TradeLedger":
+        ledger: TradeLedger = cls()
+        ledger.extend(records=records)
+        return ledger
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def records(self) -> ndarray:
+        return self._records[:self._size]
+
+    @property
+    def closed(self) -> ndarray:
+        return self.records[self.records["exit_step"] >= 0]
+
+    @property
+    def pl(self) -> ndarray:
+        return Trade.get_pl(self.closed)
+
+    @property
+    def total_pl(self) -> float:
+        return float(cumprod(1 + self.pl)[-1] - 1) if len(self.closed) else .0
+
+    @property
+    def win_rate(self) -> float:
+        return float((self.pl > 0).mean()) if len(self.closed) else .0
+
+    @property
+    def max_drawdown(self) -> float:
+        equity: ndarray = concatenate(([1.], cumprod(1 + self.pl)))
+        return float((1 - equity / maximum.accumulate(equity)).max())
+
+    @property
+    def summary(self) -> dict:
+        return {
+            "trades": len(self.closed),
+            "total_pl": self.total_pl,
+            "win_rate": self.win_rate,
+            "max_drawdown": self.max_drawdown
+        }
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._records):
+            return
+        chunks: int = -(-size // self._CHUNK_SIZE)
+        records: ndarray = empty(chunks * self._CHUNK_SIZE, dtype=Trade.DTYPE)
+        records[:self._size] = self.records
+        self._records = records
+
+    def append(
+        self,
+        entry_step: int,
+        exit_step: int,
+        side: int,
+        entry_price: float,
+        exit_price: float,
+        timestamp: datetime64,
+        lane: int = 0,
+        ticks_in_trade: int | None = None  # `exit_step - entry_step` without it, open trades have no exit step
+    ) -> None:
+        self._reserve(size=self._size + 1)
+        self._records[self._size] = (
+            lane,
+            entry_step,
+            exit_step,
+            side,
+            entry_price,
+            exit_price,
+            timestamp,
+            exit_step - entry_step if ticks_in_trade is None else ticks_in_trade
+        )
+        self._size += 1
+
+    def extend(self, records: ndarray) -> None:
+        self._reserve(size=self._size + len(records))
+        self._records[self._size:self._size + len(records)] = records
+        self._size += len(records)
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TradingDecision:
+
+    _step: int  # bars since the start of the history
+    _date: str | None
+    _action: int  # `LimitOrderActionSpace`
+    _limit_price: float  # NaN for holds
+    _position: int  # `PositionType` code once the bar settled the order
+    _reward: float
+    _latency: float  # seconds from the bar to the decision
+
+    @property
+    def step(self) -> int:
+        return self._step
+
+    @property
+    def date(self) -> str | None:
+        return self._date
+
+    @property
+    def action(self) -> int:
+        return self._action
+
+    @property
+    def limit_price(self) -> float:
+        return self._limit_price
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def reward(self) -> float:
+        return self._reward
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    def to_dict(self) -> dict:
+        return {
+            "step": self._step,
+            "date": self._date,
+            "action": self._action,
+            "limit_price": self._limit_price,
+            "position": self._position,
+            "reward": self._reward,
+            "latency_us": self._latency * 1e6
+        }
@@ -0,0 +1,91 @@
+from attr import attrs, ib
+from numpy import ndarray, zeros, int8, int64, float64
+
+from src.schemas.position_type import PositionType
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class TradingState:
+    """
+        Position, DCA book and rewards of `n` independent episodes as arrays, the DCA book being kept as running
+        `sum(price * value)` and `sum(value)` with `value = price * size`, so the true price is their ratio.
+    """
+
+    _n: int
+
+    _position: ndarray = ib(init=False)
+    _weighted_price: ndarray = ib(init=False)
+    _weight: ndarray = ib(init=False)
+    _cumulative_reward: ndarray = ib(init=False)
+    _total_rewards: ndarray = ib(init=False)
+    _current_step: ndarray = ib(init=False)
+    _opened: ndarray = ib(init=False)  # side code of the position the last step opened, neutral otherwise
+    _closed: ndarray = ib(init=False)  # whether the last step closed one, possibly the one it opened
+    _entry_price: ndarray = ib(init=False)  # true and exit prices of the position the last step closed
+    _exit_price: ndarray = ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._position = zeros(self._n, dtype=int8)
+        self._weighted_price = zeros(self._n, dtype=float64)
+        self._weight = zeros(self._n, dtype=float64)
+        self._cumulative_reward = zeros(self._n, dtype=float64)
+        self._total_rewards = zeros(self._n, dtype=float64)
+        self._current_step = zeros(self._n, dtype=int64)
+        self._opened = zeros(self._n, dtype=int8)
+        self._closed = zeros(self._n, dtype=bool)
+        self._entry_price = zeros(self._n, dtype=float64)
+        self._exit_price = zeros(self._n, dtype=float64)
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    @property
+    def position(self) -> ndarray:
+        return self._position
+
+    @property
+    def weighted_price(self) -> ndarray:
+        return self._weighted_price
+
+    @property
+    def weight(self) -> ndarray:
+        return self._weight
+
+    @property
+    def cumulative_reward(self) -> ndarray:
+        return self._cumulative_reward
+
+    @property
+    def total_rewards(self) -> ndarray:
+        return self._total_rewards
+
+    @property
+    def current_step(self) -> ndarray:
+        return self._current_step
+
+    @property
+    def opened(self) -> ndarray:
+        return self._opened
+
+    @property
+    def closed(self) -> ndarray:
+        return self._closed
+
+    @property
+    def entry_price(self) -> ndarray:
+        return self._entry_price
+
+    @property
+    def exit_price(self) -> ndarray:
+        return self._exit_price
+
+    def reset(self, mask: ndarray, starts: ndarray) -> None:
+        self._position[mask] = PositionType.get_code(PositionType.neutral_position)
+        self._weighted_price[mask] = .0
+        self._weight[mask] = .0
+        self._cumulative_reward[mask] = .0
+        self._total_rewards[mask] = .0
+        self._current_step[mask] = starts[mask]
+        self._opened[mask] = PositionType.get_code(PositionType.neutral_position)
+        self._closed[mask] = False
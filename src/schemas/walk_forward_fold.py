@@ -0,0 +1,31 @@
+from attr import attrs
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True, frozen=True)
+class WalkForwardFold:
+
+    _index: int
+    _train_start: int
+    _train_stop: int  # exclusive, as are the test bounds
+    _test_start: int
+    _test_stop: int
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def train_start(self) -> int:
+        return self._train_start
+
+    @property
+    def train_stop(self) -> int:
+        return self._train_stop
+
+    @property
+    def test_start(self) -> int:
+        return self._test_start
+
+    @property
+    def test_stop(self) -> int:
+        return self._test_stop
@@ -0,0 +1,65 @@
+import json
+import logging
+import sys
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from optuna import Study
+from pandas import DataFrame
+from torch.multiprocessing import get_context
+
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+from src.services.search import HyperparameterSearchService, run_worker
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Parallel Optuna search over agent hyperparameters")
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--trials", type=int, default=8, help="per worker")
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--journal", default=None, help="defaults to `<path>.optuna.log`")
+    parser.add_argument("--study-name", default="agent")
+    arguments = parser.parse_args()
+
+    frame: DataFrame = get_environment_frame(ohlc=OHLCPandasRepository(path=arguments.path).get_ohlc())
+    market: MarketData = MarketData.from_frame(
+        ohlc=frame,
+        feature_columns=FEATURE_COLUMNS,
+        columns=OHLC.COLUMNS + Indicators.get_columns(columns=frame.columns.to_list())
+    )
+    with TemporaryDirectory(prefix="market-data-") as directory:  # features are computed once for all workers
+        MarketDataNumpyRepository(path=directory).write(market_data=market)
+        service: HyperparameterSearchService = HyperparameterSearchService(
+            market_data_path=directory,
+            feature_columns=FEATURE_COLUMNS,
+            journal_path=arguments.journal or f"{arguments.path}.optuna.log",
+            study_name=arguments.study_name,
+            commission=.0001980,
+            funding=.000114155,
+            episodes=arguments.episodes
+        )
+        study: Study = service.create_study()
+
+        context: Any = get_context("spawn")
+        results: Any = context.Queue()
+        workers: list = [
+            context.Process(target=run_worker, args=(service, arguments.trials, results))
+            for _ in range(arguments.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if any(worker.exitcode != 0 for worker in workers):
+            raise RuntimeError(f"Search workers failed with exit codes {[worker.exitcode for worker in workers]}.")
+        reports: list[dict] = [results.get() for _ in workers]
+
+    logging.info(f"Best trial: {study.best_trial.number}, {study.best_value:.4f}, {study.best_params}.")
+    report: dict = {"best_value": study.best_value, "best_params": study.best_params, "workers": reports}
+    sys.stdout.write(json.dumps(report) + "\n")
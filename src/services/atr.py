@@ -1,6 +1,13 @@
+from math import isnan
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import ndarray, nan
 from pandas import DataFrame
 from talib._ta_lib import ATR
 
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
 from src.services.common.indicator_base import IndicatorPandasServiceBase
 
 
@@ -8,14 +15,61 @@ class ATRPandasService(IndicatorPandasServiceBase):
 
     _INDICATOR_NAME: str = "ATR"
 
+    def get_inputs(self, spec: IndicatorSpec) -> list[str]:
+        return ["h", "l", "c"]
+
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        return [f"{self._INDICATOR_NAME}_{spec.window}"]
+
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        h, l, c = inputs
+        return ATR(h, l, c, spec.window),
+
     def get_atr(self, ohlc: DataFrame, window: int, shift: int) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
-        ohlc[f"{self._INDICATOR_NAME}_{window}"] = ATR(
-            ohlc["h"].values,
-            ohlc["l"].values,
-            ohlc["c"].values,
-            window
-        )
-        ohlc[f"{self._INDICATOR_NAME}_{window}"] = ohlc[f"{self._INDICATOR_NAME}_{window}"].shift(shift)
-
-        return ohlc
+        spec: IndicatorSpec = IndicatorSpec(kind=self._INDICATOR_NAME, window=window, shift=shift)
+        return self._get_indicator(ohlc=ohlc, spec=spec)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ATRIncrementalService(IncrementalIndicatorServiceBase):
+
+    _SERVICE: ClassVar[ATRPandasService] = ATRPandasService()
+
+    _count: int = ib(init=False, default=0)  # true ranges seen
+    _close: float = ib(init=False, default=nan)
+    _total: float = ib(init=False, default=.0)
+    _value: float = ib(init=False, default=nan)
+
+    def _reset(self) -> None:
+        self._count, self._close, self._total, self._value = 0, nan, .0, nan
+
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        h, l, c = values
+        if isnan(self._close):
+            self._close = c
+            return nan,
+
+        true_range: float = max(h - l, abs(self._close - h), abs(self._close - l))
+        self._close = c
+        self._count += 1
+
+        window: int = self._spec.window
+        if window <= 1:
+            self._value = true_range
+        elif self._count < window:
+            self._total += true_range
+        elif self._count == window:
+            self._total += true_range
+            self._value = self._total / window
+        else:
+            self._value = (self._value * (window - 1) + true_range) / window
+        return self._value,
+
+    def _seed(self, inputs: tuple[ndarray, ...]) -> tuple[ndarray, ...]:
+        h, l, c = inputs
+        outputs: ndarray = ATR(h, l, c, self._spec.window)
+        if not len(outputs) or isnan(outputs[-1]):
+            return super()._seed(inputs=inputs)
+
+        self._count, self._close, self._value = self._spec.window, float(c[-1]), float(outputs[-1])
+        return outputs,
@@ -0,0 +1,193 @@
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import (
+    ndarray, asarray, empty, ones, full, flatnonzero, concatenate, lexsort, minimum, atleast_2d, where, errstate, nan,
+    int8, int64, float64
+)
+from pandas import DataFrame
+
+from src.models.qnn import QNN
+from src.schemas.backtest_report import BacktestReport
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+from src.schemas.trade import Trade
+from src.schemas.trading_state import TradingState
+from src.services.inference import QNNInferenceService
+from src.services.lane import TradingLaneService
+from src.services.transition import TradingTransitionService, NEUTRAL
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class BacktestService:
+    """
+        Replays whole action sequences with `TradingEnvironment.step` semantics. Every row of the actions is an
+        independent episode from the first complete row, as the environment's, all rows advance together, so
+        a batch of sequences costs about as much as one. Trades keep the rows of the market data as steps.
+    """
+
+    _ohlc: DataFrame | MarketData = ib(repr=False)  # prepared market data is used as is, e.g. a slice
+    _feature_columns: list
+    _commission: float
+    _funding: float
+
+    _BBANDS_STDDEV: ClassVar[int] = 1
+    _BATCH_SIZE: ClassVar[int] = 65_536
+    _LANES_PER_ARRAY_STEP: ClassVar[int] = 256  # fewer lanes are replayed one by one on floats, both give equal results
+
+    _market: MarketData = ib(init=False)
+    _first_step: int = ib(init=False)  # warm-up rows of the indicators are skipped
+    _transition: TradingTransitionService = ib(init=False)
+    _lane: TradingLaneService = ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._market = self._ohlc if isinstance(self._ohlc, MarketData) else MarketData.from_frame(
+            ohlc=self._ohlc,
+            feature_columns=self._feature_columns,
+            columns=OHLC.COLUMNS + Indicators.get_columns(columns=self._ohlc.columns.to_list())
+        )
+        self._first_step = self._market.get_first_complete_row()
+        self._transition = TradingTransitionService(commission=self._commission, funding=self._funding)
+        self._lane = TradingLaneService(commission=self._commission, funding=self._funding)
+
+    @property
+    def steps(self) -> int:
+        return max(self._last_step - self._first_step, 0)
+
+    @property
+    def _last_step(self) -> int:
+        return self._market.length - 1
+
+    def get_greedy_actions(self, qnn: QNN) -> ndarray:
+        policy: QNNInferenceService = QNNInferenceService(qnn=qnn)
+        actions: ndarray = empty(self.steps, dtype=int64)
+        for start in range(0, self.steps, self._BATCH_SIZE):
+            observations: ndarray = self._market.features[
+                self._first_step + start:self._first_step + min(start + self._BATCH_SIZE, self.steps)
+            ]
+            actions[start:start + len(observations)] = policy.get_greedy_actions(observations=observations).numpy()
+        return actions
+
+    def _get_trades(
+        self,
+        entries: dict[str, list],
+        exits: dict[str, list],
+        positions: ndarray,
+        true_prices: ndarray  # of every lane after the last step
+    ) -> ndarray:
+        end: int = self._last_step
+        open_lanes: ndarray = flatnonzero(positions[:, -1] != NEUTRAL) if self.steps else empty(0, dtype=int64)
+        exits["lane"].append(open_lanes)  # positions still open close after the last step
+        exits["exit_step"].append(full(len(open_lanes), end))
+        exits["entry_price"].append(true_prices[open_lanes])
+        exits["exit_price"].append(full(len(open_lanes), nan))
+        opened: dict[str, ndarray] = {column: concatenate(values) for column, values in entries.items()}
+        closed: dict[str, ndarray] = {column: concatenate(values) for column, values in exits.items()}
+
+        # per lane, the k-th entry pairs with the k-th exit
+        entry_order: ndarray = lexsort((opened["entry_step"], opened["lane"]))
+        exit_order: ndarray = lexsort((closed["exit_step"], closed["lane"]))
+        entry_steps: ndarray = opened["entry_step"][entry_order]
+        exit_steps: ndarray = closed["exit_step"][exit_order]
+
+        trades: ndarray = empty(len(entry_order), dtype=Trade.DTYPE)
+        trades["lane"] = opened["lane"][entry_order]
+        trades["entry_step"] = entry_steps
+        trades["exit_step"] = where(exit_steps == end, -1, exit_steps)
+        trades["side"] = opened["side"][entry_order]
+        trades["entry_price"] = closed["entry_price"][exit_order]
+        trades["exit_price"] = closed["exit_price"][exit_order]
+        trades["timestamp"] = self._market.get_date(entry_steps)
+        trades["ticks_in_trade"] = minimum(exit_steps, end - 1) - entry_steps
+        return trades
+
+    def _evaluate_lanes(self, actions: ndarray) -> BacktestReport:
+        lanes: int = len(actions)
+        rewards: ndarray = empty((lanes, self.steps), dtype=float64)
+        positions: ndarray = empty((lanes, self.steps), dtype=int8)
+        true_prices: ndarray = empty(lanes, dtype=float64)
+        entries: dict[str, list] = {"lane": [], "entry_step": [], "side": []}
+        exits: dict[str, list] = {"lane": [], "exit_step": [], "entry_price": [], "exit_price": []}
+
+        columns: tuple[list[float], ...] = tuple(
+            values[self._first_step:self._last_step].tolist() for values in (
+                self._market.l,
+                self._market.h,
+                self._market.c,
+                self._market.get_column(Indicators.EMA_COLUMN),
+                self._market.get_column(Indicators.get_lower_bbands_column(stddev=self._BBANDS_STDDEV)),
+                self._market.get_column(Indicators.get_upper_bbands_column(stddev=self._BBANDS_STDDEV))
+            )
+        )
+        for lane in range(lanes):
+            lane_rewards, lane_positions, opened, closed = self._lane.run(actions[lane].tolist(), *columns)
+            rewards[lane], positions[lane], true_prices[lane] = lane_rewards, lane_positions, self._lane.true_price
+            entries["lane"].append(full(len(opened), lane))
+            entries["entry_step"].append(asarray([self._first_step + step for step, _ in opened], dtype=int64))
+            entries["side"].append(asarray([side for _, side in opened], dtype=int8))
+            exits["lane"].append(full(len(closed), lane))
+            exits["exit_step"].append(asarray([self._first_step + step for step, _, _ in closed], dtype=int64))
+            exits["entry_price"].append(asarray([price for _, price, _ in closed], dtype=float64))
+            exits["exit_price"].append(asarray([price for _, _, price in closed], dtype=float64))
+        return BacktestReport(
+            rewards,
+            positions,
+            self._get_trades(entries=entries, exits=exits, positions=positions, true_prices=true_prices)
+        )
+
+    def evaluate(self, actions: ndarray) -> BacktestReport:
+        """
+            Fewer lanes than `_LANES_PER_ARRAY_STEP` are replayed one at a time on floats, more advance together
+            on arrays, with equal results.
+        """
+        actions = atleast_2d(actions)[:, :self.steps]
+        lanes: int = len(actions)
+        if actions.shape[1] < self.steps:
+            raise ValueError(f"Expected {self.steps} actions per episode, got {actions.shape[1]}.")
+
+        if lanes < self._LANES_PER_ARRAY_STEP:
+            return self._evaluate_lanes(actions=actions)
+
+        state: TradingState = TradingState(n=lanes)
+        is_active: ndarray = ones(lanes, dtype=bool)
+        rewards: ndarray = empty((lanes, self.steps), dtype=float64)
+        positions: ndarray = empty((lanes, self.steps), dtype=int8)
+        entries: dict[str, list] = {"lane": [], "entry_step": [], "side": []}
+        exits: dict[str, list] = {"lane": [], "exit_step": [], "entry_price": [], "exit_price": []}
+
+        ema: ndarray = self._market.get_column(Indicators.EMA_COLUMN)
+        lower: ndarray = self._market.get_column(Indicators.get_lower_bbands_column(stddev=self._BBANDS_STDDEV))
+        upper: ndarray = self._market.get_column(Indicators.get_upper_bbands_column(stddev=self._BBANDS_STDDEV))
+        for offset, step in enumerate(range(self._first_step, self._last_step)):
+            rewards[:, offset] = self._transition.step(
+                state=state,
+                actions=actions[:, offset],
+                is_active=is_active,
+                l=self._market.l[step],
+                h=self._market.h[step],
+                c=self._market.c[step],
+                ema=ema[step],
+                lower=lower[step],
+                upper=upper[step]
+            )
+            positions[:, offset] = state.position
+
+            opened: ndarray = flatnonzero(state.opened != NEUTRAL)
+            entries["lane"].append(opened)
+            entries["entry_step"].append(full(len(opened), step))
+            entries["side"].append(state.opened[opened])
+
+            closed: ndarray = flatnonzero(state.closed)
+            exits["lane"].append(closed)
+            exits["exit_step"].append(full(len(closed), step))
+            exits["entry_price"].append(state.entry_price[closed])
+            exits["exit_price"].append(state.exit_price[closed])
+
+        with errstate(divide="ignore", invalid="ignore"):
+            true_prices: ndarray = state.weighted_price / state.weight
+        return BacktestReport(
+            rewards,
+            positions,
+            self._get_trades(entries=entries, exits=exits, positions=positions, true_prices=true_prices)
+        )
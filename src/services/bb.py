@@ -1,7 +1,16 @@
+from collections import deque
+from math import isnan, sqrt
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import ndarray, nan
 from pandas import DataFrame
-from talib._ta_lib import BBANDS
+from talib._ta_lib import BBANDS, MA_Type
 
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
 from src.services.common.indicator_base import IndicatorPandasServiceBase
+from src.services.ema import EMAIncrementalService, EMAPandasService
 
 class BBANDSPandasService(IndicatorPandasServiceBase):
     """
@@ -10,26 +19,97 @@ class BBANDSPandasService(IndicatorPandasServiceBase):
 
     _INDICATOR_NAME: str = "BBANDS"
 
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        return [
+            f"{self._INDICATOR_NAME}_UPPER_{spec.window}_{spec.stddev}_{spec.column}",
+            f"{self._INDICATOR_NAME}_MIDDLE_{spec.window}_{spec.stddev}_{spec.column}",
+            f"{self._INDICATOR_NAME}_LOWER_{spec.window}_{spec.stddev}_{spec.column}",
+        ]
+
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        values, = inputs
+        return BBANDS(values, spec.window, spec.stddev, spec.stddev, spec.matype)
+
     def get_bbands(self, ohlc: DataFrame, column: str, window: int, stddev: float, matype: int, shift: int) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
-
-        upper, middle, lower = BBANDS(ohlc[column].values, window, stddev, stddev, matype)
-        ohlc[f"{self._INDICATOR_NAME}_UPPER_{window}_{stddev}_{column}"] = upper
-        ohlc[f"{self._INDICATOR_NAME}_MIDDLE_{window}_{stddev}_{column}"] = middle
-        ohlc[f"{self._INDICATOR_NAME}_LOWER_{window}_{stddev}_{column}"] = lower
-
-        ohlc[
-            [
-                f"{self._INDICATOR_NAME}_UPPER_{window}_{stddev}_{column}",
-                f"{self._INDICATOR_NAME}_MIDDLE_{window}_{stddev}_{column}",
-                f"{self._INDICATOR_NAME}_LOWER_{window}_{stddev}_{column}",
-            ]
-        ] = ohlc[
-            [
-                f"{self._INDICATOR_NAME}_UPPER_{window}_{stddev}_{column}",
-                f"{self._INDICATOR_NAME}_MIDDLE_{window}_{stddev}_{column}",
-                f"{self._INDICATOR_NAME}_LOWER_{window}_{stddev}_{column}",
-            ]
-        ].shift(shift)
-
-        return ohlc
+        spec: IndicatorSpec = IndicatorSpec(
+            kind=self._INDICATOR_NAME,
+            column=column,
+            window=window,
+            stddev=stddev,
+            matype=matype,
+            shift=shift
+        )
+        return self._get_indicator(ohlc=ohlc, spec=spec)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class BBANDSIncrementalService(IncrementalIndicatorServiceBase):
+    """
+        Rolling sums over a fixed window, the way TA-Lib keeps them, so the middle band is SMA or EMA
+        and the deviation is the population one over the window.
+    """
+
+    _SERVICE: ClassVar[BBANDSPandasService] = BBANDSPandasService()
+
+    _window: deque = ib(init=False)
+    _total: float = ib(init=False, default=.0)
+    _squares: float = ib(init=False, default=.0)
+    _ema: EMAIncrementalService | None = ib(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        super(BBANDSIncrementalService, self).__attrs_post_init__()
+        if self._spec.matype not in (MA_Type.SMA, MA_Type.EMA):
+            raise ValueError(f"Only SMA and EMA middle bands can be streamed: {self._spec}")
+        self._reset()
+
+    def _reset(self) -> None:
+        self._window, self._total, self._squares = deque(maxlen=self._spec.window), .0, .0
+        if self._spec.matype == MA_Type.EMA:
+            self._ema = EMAIncrementalService(
+                spec=IndicatorSpec(
+                    kind=EMAPandasService().indicator_name,
+                    column=self._spec.column,
+                    window=self._spec.window
+                )
+            )
+
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        value, = values
+        if not self._window and isnan(value):
+            return nan, nan, nan
+
+        middle: float = self._ema._update(values)[0] if self._ema is not None else nan
+        self._total += value
+        self._squares += value * value
+        self._window.append(value)
+        if len(self._window) < self._window.maxlen:
+            return nan, nan, nan
+
+        mean: float = self._total / self._spec.window
+        variance: float = self._squares / self._spec.window - mean * mean
+        deviation: float = sqrt(variance) * self._spec.stddev if variance > 0 else .0
+        middle = mean if self._ema is None else middle
+
+        trailing: float = self._window[0]
+        self._total -= trailing
+        self._squares -= trailing * trailing
+        return middle + deviation, middle, middle - deviation
+
+    def _seed(self, inputs: tuple[ndarray, ...]) -> tuple[ndarray, ...]:
+        values, = inputs
+        outputs: tuple[ndarray, ...] = BBANDS(
+            values,
+            self._spec.window,
+            self._spec.stddev,
+            self._spec.stddev,
+            self._spec.matype
+        )
+        if not len(values) or isnan(outputs[1][-1]):
+            return super()._seed(inputs=inputs)
+
+        tail: ndarray = values[len(values) - self._spec.window + 1:]
+        self._window.extend(values[len(values) - self._spec.window:].tolist())
+        self._total, self._squares = float(tail.sum()), float((tail * tail).sum())
+        if self._ema is not None:
+            self._ema._seed(inputs=inputs)
+        return outputs
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import ClassVar, Mapping
+
+from attr import attrs, ib
+from numpy import ndarray, array, empty, nan, float64
+from pandas import DataFrame
+
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.indicator_base import IndicatorPandasServiceBase
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class IncrementalIndicatorServiceBase(ABC):
+    """
+        Stateful O(1)-per-bar counterpart of an indicator service, seeded from history and then fed bar by bar.
+    """
+
+    _SERVICE: ClassVar[IndicatorPandasServiceBase]
+
+    _spec: IndicatorSpec
+
+    _outputs: deque = ib(init=False)  # the last `shift + 1` unshifted outputs
+
+    def __attrs_post_init__(self) -> None:
+        if self._spec.shift < 0:
+            raise ValueError(f"Negative shift looks ahead and can't be streamed: {self._spec}")
+        self._outputs = deque(maxlen=self._spec.shift + 1)
+
+    @property
+    def spec(self) -> IndicatorSpec:
+        return self._spec
+
+    @property
+    def inputs(self) -> list[str]:
+        return self._SERVICE.get_inputs(self._spec)
+
+    @property
+    def columns(self) -> list[str]:
+        return self._SERVICE.get_columns(self._spec)
+
+    @property
+    def values(self) -> tuple[float, ...]:
+        if len(self._outputs) < self._outputs.maxlen:
+            return (nan,) * len(self.columns)
+        return self._outputs[0]
+
+    @abstractmethod
+    def _reset(self) -> None:
+        ...
+
+    @abstractmethod
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        ...
+
+    def _seed(self, inputs: tuple[ndarray, ...]) -> tuple[ndarray, ...]:
+        outputs: ndarray = empty((len(inputs[0]), len(self.columns)), dtype=float64)
+        for position, values in enumerate(zip(*inputs)):
+            outputs[position] = self._update(values)
+        return tuple(outputs.T)
+
+    def seed(self, ohlc: DataFrame) -> None:
+        self._reset()
+        self._outputs.clear()
+
+        inputs: tuple[ndarray, ...] = tuple(ohlc[column].to_numpy(dtype=float64) for column in self.inputs)
+        outputs: tuple[ndarray, ...] = self._seed(inputs=inputs)
+        tail: int = self._outputs.maxlen
+        for row in array(outputs, dtype=float64).T[-tail:]:
+            self._outputs.append(tuple(row.tolist()))
+
+    def update(self, bar: Mapping[str, float]) -> tuple[float, ...]:
+        self._outputs.append(self._update(tuple(float(bar[column]) for column in self.inputs)))
+        return self.values
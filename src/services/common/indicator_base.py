@@ -1,5 +1,11 @@
-from abc import ABC
+from abc import ABC, abstractmethod
+
 from attr import attrs, ib
+from numpy import ndarray, empty, nan, float64
+from pandas import DataFrame
+
+from src.adapters.repositories.indicator_cache import IndicatorCacheRepository
+from src.schemas.indicator_spec import IndicatorSpec
 
 
 @attrs(slots=True, auto_attribs=True, kw_only=True)
@@ -7,6 +13,53 @@ class IndicatorPandasServiceBase(ABC):
 
     _INDICATOR_NAME: str = ib(init=False)
 
+    _cache: IndicatorCacheRepository | None = None
+
     @property
     def indicator_name(self) -> str:
         return self._INDICATOR_NAME
+
+    @staticmethod
+    def shift(values: ndarray, periods: int) -> ndarray:
+        shifted: ndarray = empty(len(values), dtype=float64)
+        if periods > 0:
+            shifted[:periods] = nan
+            shifted[periods:] = values[:len(values) - periods]
+        elif periods < 0:
+            shifted[periods:] = nan
+            shifted[:periods] = values[-periods:]
+        else:
+            shifted[:] = values
+        return shifted
+
+    def get_inputs(self, spec: IndicatorSpec) -> list[str]:
+        return [spec.column]
+
+    @abstractmethod
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        ...
+
+    @abstractmethod
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        ...
+
+    def _calculate_shifted(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        return tuple(self.shift(values=values, periods=spec.shift) for values in self._calculate(inputs, spec))
+
+    def calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        if self._cache is None:
+            return self._calculate_shifted(inputs=inputs, spec=spec)
+        return self._cache.get_or_calculate(
+            inputs=inputs,
+            spec=spec,
+            calculate=lambda: self._calculate_shifted(inputs=inputs, spec=spec)
+        )
+
+    def _get_indicator(self, ohlc: DataFrame, spec: IndicatorSpec) -> DataFrame:
+        ohlc = ohlc.copy(deep=True)
+
+        inputs: tuple[ndarray, ...] = tuple(ohlc[column].to_numpy(dtype=float64) for column in self.get_inputs(spec))
+        for column, values in zip(self.get_columns(spec), self.calculate(inputs=inputs, spec=spec)):
+            ohlc[column] = values
+
+        return ohlc
@@ -1,5 +1,8 @@
+import re
+
 from attr import attrs
-from pandas import DataFrame, to_datetime
+from numpy import ndarray, add, maximum, minimum, flatnonzero, searchsorted, concatenate, empty, nan, int64, float64
+from pandas import DataFrame, DatetimeIndex
 
 from src.adapters.repositories.ohlc import OHLCPandasRepository
 
@@ -23,33 +26,96 @@ class OHLCPandasService:
 
         return left.merge(right, on=on, how=how)
 
+    @staticmethod
+    def _get_periods(dates: ndarray, timeframe: str) -> tuple[ndarray, ndarray]:
+        """
+            Start and end (exclusive) of the `1D`/`1W`/`1M`-like period of every UTC nanosecond timestamp;
+            weeks start on Monday, periods of several units are anchored at the epoch.
+        """
+        matched: re.Match | None = re.fullmatch(r"(\d*)([DWM])", timeframe)
+        if matched is None:
+            raise ValueError(f"Unsupported timeframe: {timeframe}, expected like 1D, 1W or 1M.")
+        n: int = int(matched.group(1) or 1)
+        unit: str = matched.group(2)
+
+        if unit == "M":
+            months: ndarray = dates.view("datetime64[ns]").astype("datetime64[M]").astype(int64)
+            months -= months % n
+            starts: ndarray = months.astype("datetime64[M]").astype("datetime64[ns]").view(int64)
+            ends: ndarray = (months + n).astype("datetime64[M]").astype("datetime64[ns]").view(int64)
+            return starts, ends
+
+        day: int = 86_400 * 10 ** 9
+        days: ndarray = dates // day
+        if unit == "D":
+            days -= days % n
+            return days * day, (days + n) * day
+
+        weeks: ndarray = (days + 3) // 7  # the epoch is a Thursday
+        weeks -= weeks % n
+        return (weeks * 7 - 3) * day, (weeks * 7 - 3 + 7 * n) * day
+
     @staticmethod
     def resample(ohlc: DataFrame, timeframe: str) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
+        """
+            Higher timeframe bars of the sorted `ohlc`, `date` is the period start and `close_date` the moment
+            the bar is closed.
+        """
+        dates: DatetimeIndex = DatetimeIndex(ohlc["date"])
+        starts, ends = OHLCPandasService._get_periods(dates=dates.asi8, timeframe=timeframe)
+
+        firsts: ndarray = flatnonzero(concatenate(([True], starts[1:] != starts[:-1])))
+        lasts: ndarray = concatenate((firsts[1:], [len(starts)])) - 1
 
-        ohlc.index = ohlc["date"]
-        ohlc = ohlc.resample(timeframe).agg(
+        period_dates: DatetimeIndex = DatetimeIndex(starts[firsts].view("datetime64[ns]"))
+        close_dates: DatetimeIndex = DatetimeIndex(ends[firsts].view("datetime64[ns]"))
+        if dates.tz is not None:
+            period_dates = period_dates.tz_localize("UTC").tz_convert(dates.tz)
+            close_dates = close_dates.tz_localize("UTC").tz_convert(dates.tz)
+
+        resampled: DataFrame = DataFrame(
             {
-                "o": "first",
-                "h": "max",
-                "l": "min",
-                "c": "last",
-                "v": "sum",
-                "year": "first",
-                "month": "first",
-                "week": "first",
-                "day": "first"
+                "date": period_dates,
+                "close_date": close_dates,
+                "o": ohlc["o"].to_numpy()[firsts],
+                "h": maximum.reduceat(ohlc["h"].to_numpy(), firsts),
+                "l": minimum.reduceat(ohlc["l"].to_numpy(), firsts),
+                "c": ohlc["c"].to_numpy()[lasts],
+                "v": add.reduceat(ohlc["v"].to_numpy(), firsts)
             }
-        ).dropna().reset_index()
-        return ohlc
+        )
+        resampled["year"] = resampled["date"].dt.year
+        resampled["month"] = resampled["date"].dt.month
+        resampled["week"] = resampled["date"].dt.isocalendar().week.astype("uint32")
+        resampled["day"] = resampled["date"].dt.day
+        return resampled
 
-    def get_ohlc(self) -> DataFrame:
-        ohlc: DataFrame = self._ohlc_repository.get_ohlc().head(128)
+    @staticmethod
+    def get_closed_indices(base: DataFrame, higher: DataFrame) -> ndarray:
+        """
+            Row of `higher` that was the latest closed bar at the open of each `base` bar, -1 before the first close.
+            A higher bar counts as closed once `close_date <= date` of the base bar, so no bar sees its own period.
+        """
+        close_dates: ndarray = DatetimeIndex(higher["close_date"]).asi8
+        dates: ndarray = DatetimeIndex(base["date"]).asi8
+        return searchsorted(close_dates, dates, side="right") - 1
 
-        ohlc["date"] = to_datetime(ohlc["date"])
-        ohlc["year"] = ohlc["date"].dt.year
-        ohlc["month"] = ohlc["date"].dt.month
-        ohlc["week"] = ohlc["date"].dt.isocalendar().week
-        ohlc["day"] = ohlc["date"].dt.day
+    @staticmethod
+    def align(base: DataFrame, higher: DataFrame, columns: list[str], suffix: str = "") -> DataFrame:
+        """
+            `base` plus the requested `higher` columns as of the latest closed higher bar, base columns aren't copied.
+        """
+        indices: ndarray = OHLCPandasService.get_closed_indices(base=base, higher=higher)
+        is_closed: ndarray = indices >= 0
+
+        aligned: dict = {name: series for name, series in base.items()}
+        for column in columns:
+            values: ndarray = empty(len(base), dtype=float64)
+            values[is_closed] = higher[column].to_numpy(dtype=float64)[indices[is_closed]]
+            values[~is_closed] = nan
+            aligned[f"{column}{suffix}"] = values
+        return DataFrame(aligned, index=base.index, copy=False)
 
+    def get_ohlc(self) -> DataFrame:
+        ohlc: DataFrame = self._ohlc_repository.get_ohlc().head(128)  # dates and calendar columns come parsed
         return ohlc
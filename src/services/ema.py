@@ -1,6 +1,13 @@
+from math import isnan
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import ndarray, nan
 from pandas import DataFrame
 from talib._ta_lib import EMA
 
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
 from src.services.common.indicator_base import IndicatorPandasServiceBase
 
 
@@ -8,9 +15,50 @@ class EMAPandasService(IndicatorPandasServiceBase):
 
     _INDICATOR_NAME: str = "EMA"
 
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        return [f"{self._INDICATOR_NAME}_{spec.window}_{spec.column}"]
+
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        values, = inputs
+        return EMA(values, spec.window),
+
     def get_ema(self, ohlc: DataFrame, column: str, window: int, shift: int) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
-        ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"] = EMA(ohlc[column].values, window)
-        ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"] = ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"].shift(shift)
+        spec: IndicatorSpec = IndicatorSpec(kind=self._INDICATOR_NAME, column=column, window=window, shift=shift)
+        return self._get_indicator(ohlc=ohlc, spec=spec)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class EMAIncrementalService(IncrementalIndicatorServiceBase):
+
+    _SERVICE: ClassVar[EMAPandasService] = EMAPandasService()
+
+    _count: int = ib(init=False, default=0)  # inputs seen since the first non-NaN one
+    _total: float = ib(init=False, default=.0)
+    _value: float = ib(init=False, default=nan)
+
+    def _reset(self) -> None:
+        self._count, self._total, self._value = 0, .0, nan
+
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        value, = values
+        if not self._count and isnan(value):
+            return nan,
+
+        self._count += 1
+        if self._count < self._spec.window:
+            self._total += value
+        elif self._count == self._spec.window:  # seeded with SMA as TA-Lib does
+            self._total += value
+            self._value = self._total / self._spec.window
+        else:
+            self._value = ((value - self._value) * (2 / (self._spec.window + 1))) + self._value
+        return self._value,
+
+    def _seed(self, inputs: tuple[ndarray, ...]) -> tuple[ndarray, ...]:
+        values, = inputs
+        outputs: ndarray = EMA(values, self._spec.window)
+        if not len(outputs) or isnan(outputs[-1]):
+            return super()._seed(inputs=inputs)
 
-        return ohlc
+        self._count, self._value = self._spec.window, float(outputs[-1])
+        return outputs,
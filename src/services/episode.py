@@ -0,0 +1,41 @@
+from typing import Any
+
+from attr import attrs
+from numpy.random import Generator
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class EpisodeService:
+    """
+        Rows the episodes of an environment span: from a fixed or random start up to the end of the data or,
+        with `episode_steps`, up to a time limit that truncates them earlier.
+    """
+
+    _first_step: int  # the first row with a complete observation
+    _last_step: int  # the row the data ends at
+    _episode_steps: int | None = None
+    _is_random_start: bool = False
+
+    @property
+    def first_step(self) -> int:
+        return self._first_step
+
+    def get_steps(self, options: dict[str, Any], random: Generator) -> tuple[int, int]:
+        """
+            Start and end rows of an episode. Options: `start` row of the episode, `is_random_start` and
+            `episode_steps` overriding the defaults.
+        """
+        episode_steps: int | None = options.get("episode_steps", self._episode_steps)
+        start: int | None = options.get("start")
+        if start is None and options.get("is_random_start", self._is_random_start):
+            last: int = max(self._last_step - (episode_steps or 1), self._first_step)  # full episodes if any
+            start = int(random.integers(self._first_step, last + 1))
+        elif start is None:
+            start = self._first_step
+        if not self._first_step <= start <= self._last_step:
+            raise ValueError(f"Episodes start within [{self._first_step}, {self._last_step}], got {start}.")
+        end: int = self._last_step if episode_steps is None else min(start + episode_steps, self._last_step)
+        return start, end
+
+    def is_truncated(self, end_step: int) -> bool:
+        return end_step < self._last_step  # a time limit ends the episode rather than the data
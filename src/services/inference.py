@@ -0,0 +1,77 @@
+from copy import deepcopy
+
+from attr import attrs, ib
+from numpy import ndarray
+from torch import (
+    Tensor, Generator, as_tensor, from_numpy, inference_mode, rand, randint, where, compile, float32, qint8
+)
+from torch.ao.quantization import quantize_dynamic
+from torch.jit import freeze, script
+from torch.nn import Linear, Module
+
+from src.models.qnn import QNN
+from src.schemas.inference_backend import InferenceBackend
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class QNNInferenceService:
+    """
+        Batched decisions of a `QNN` without autograd. Quantized, compiled or scripted models are copies,
+        `refresh` takes the latest weights into them.
+    """
+
+    _qnn: QNN
+    _backend: str = InferenceBackend.eager
+    _is_quantized: bool = False  # dynamic int8 `Linear` layers, CPU only
+
+    _model: Module = ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self._backend not in (InferenceBackend.eager, InferenceBackend.compile, InferenceBackend.script):
+            raise ValueError(f"Unknown inference backend: {self._backend}")
+        self.refresh()
+
+    @property
+    def observation_space_dimension(self) -> int:
+        return self._qnn.observation_space_dimension
+
+    @property
+    def observation_space_shape(self) -> tuple[int, ...]:
+        return self._qnn.observation_space_shape
+
+    @property
+    def action_space_dimension(self) -> int:
+        return self._qnn.action_space_dimension
+
+    def refresh(self) -> None:
+        if self._backend == InferenceBackend.eager and not self._is_quantized:
+            self._model = self._qnn  # nothing to copy, always up to date
+            return
+
+        model: Module = deepcopy(self._qnn).eval().requires_grad_(False)
+        if self._is_quantized:
+            model = quantize_dynamic(model, {Linear}, dtype=qint8)
+        if self._backend == InferenceBackend.compile:
+            model = compile(model, dynamic=True)
+        elif self._backend == InferenceBackend.script:
+            model = freeze(script(model))
+        self._model = model
+
+    @staticmethod
+    def _get_tensor(observations: ndarray | Tensor) -> Tensor:
+        if isinstance(observations, ndarray):  # read-only views of the market data can't be shared with torch
+            observations = from_numpy(observations if observations.flags.writeable else observations.copy())
+        return as_tensor(observations, dtype=float32)
+
+    def get_q_values(self, observations: ndarray | Tensor) -> Tensor:
+        with inference_mode():
+            return self._model(self._get_tensor(observations=observations))
+
+    def get_greedy_actions(self, observations: ndarray | Tensor) -> Tensor:
+        return self.get_q_values(observations=observations).argmax(dim=1)
+
+    def act(self, observations: ndarray | Tensor, epsilon: float, generator: Generator | None = None) -> Tensor:
+        actions: Tensor = self.get_greedy_actions(observations=observations)
+        is_exploring: Tensor = rand(len(actions), generator=generator) < epsilon
+        explorations: Tensor = randint(self.action_space_dimension, (len(actions),), generator=generator)
+        return where(is_exploring, explorations, actions)
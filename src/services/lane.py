@@ -0,0 +1,181 @@
+from math import log, log2, nan
+
+from attr import attrs, ib
+
+from src.schemas.action_space import LimitOrderActionSpace
+from src.services.transition import NEUTRAL, LONG, SHORT
+
+BUY: int = LimitOrderActionSpace.buy_limit
+HOLD: int = LimitOrderActionSpace.hold
+
+
+def _get_log(ratio: float) -> float:
+    if ratio > 1:
+        return log(ratio)
+    if ratio > 0:
+        return log2(ratio)
+    return -float("inf") if ratio == 0 else nan  # as NumPy has it
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class TradingLaneService:
+    """
+        Trading rules of a single episode on Python floats: `TradingEnvironment.step` delegates to `step` and
+        the backtest replays a few lanes with `run`. `TradingTransitionService` is the array counterpart for
+        many lanes, as a NumPy step costs the same for one lane as for thousands.
+    """
+
+    _commission: float
+    _funding: float
+
+    _position: int = ib(init=False, default=NEUTRAL)
+    _side: int = ib(init=False, default=NEUTRAL)  # of the open position or the last one
+    _weighted_price: float = ib(init=False, default=.0)  # running DCA book, so the true price is O(1)
+    _weight: float = ib(init=False, default=.0)
+    _cumulative_reward: float = ib(init=False, default=.0)
+    _is_opened: bool = ib(init=False, default=False)  # whether the last step opened a position
+    _is_closed: bool = ib(init=False, default=False)  # whether the last step closed one, possibly the one it opened
+    _entry_price: float = ib(init=False, default=nan)  # true and exit prices of the position the last step closed
+    _exit_price: float = ib(init=False, default=nan)
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def side(self) -> int:
+        return self._side
+
+    @property
+    def true_price(self) -> float:
+        return self._weighted_price / self._weight if self._weight else nan
+
+    @property
+    def cumulative_reward(self) -> float:
+        return self._cumulative_reward
+
+    @property
+    def is_opened(self) -> bool:
+        return self._is_opened
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    @property
+    def entry_price(self) -> float:
+        return self._entry_price
+
+    @property
+    def exit_price(self) -> float:
+        return self._exit_price
+
+    def _get_reward(self, is_long: bool, true_price: float, result_price: float) -> float:
+        ratio: float = result_price / true_price
+        return _get_log(ratio if is_long else 2 - ratio) - self._funding
+
+    def reset(self) -> None:
+        self._position, self._side = NEUTRAL, NEUTRAL
+        self._weighted_price, self._weight, self._cumulative_reward = .0, .0, .0
+        self._is_opened, self._is_closed = False, False
+        self._entry_price, self._exit_price = nan, nan
+
+    def step(self, action: int, l: float, h: float, c: float, ema: float, lower: float, upper: float) -> float:
+        """
+            Reward of `action` on a bar. As in the environment, buying and selling pick the reward method and the
+            limit/stop-loss rules of entries, DCA and exits alike, and holding picks them by the open position.
+        """
+        commission: float = self._commission
+        position: int = self._position
+        weighted_price: float = self._weighted_price
+        weight: float = self._weight
+        cumulative_reward: float = self._cumulative_reward
+
+        was_neutral: bool = position == NEUTRAL
+        is_buy: bool = action == BUY
+        is_long: bool = position == LONG
+        reward: float = .0
+        true_price: float = weighted_price / weight if weight else nan
+        limit: float = lower if is_buy else upper
+        is_correct: bool = l <= limit <= h and (limit > ema if is_buy else limit < ema)
+        is_stop_loss: bool = ema >= l if is_buy else ema <= h
+        is_opened: bool = False
+        is_exit_limit: bool = False
+
+        if action == HOLD:
+            if not was_neutral:
+                is_hold_stop: bool = ema >= l if is_long else ema <= h
+                if is_hold_stop:
+                    reward = abs(cumulative_reward) * -1
+                    position, weighted_price, weight = NEUTRAL, .0, .0
+                else:
+                    reward = self._get_reward(is_long, true_price, c)
+                    cumulative_reward += reward
+        elif was_neutral or is_long == is_buy:  # entries and DCA
+            side: int = LONG if is_buy else SHORT
+            if is_correct:
+                weighted_price += limit * limit
+                weight += limit
+                true_price = weighted_price / weight
+                reward = self._get_reward(is_buy, true_price, c) - commission
+                if was_neutral:
+                    position = side
+                    is_opened = True
+                    self._side = side
+            if is_stop_loss and (is_opened or not was_neutral):
+                stop_reward: float = self._get_reward(is_buy, true_price, ema)
+                reward = stop_reward - commission - (commission if is_opened or reward != 0 else .0)
+                position, weighted_price, weight = NEUTRAL, .0, .0
+            if position == side:
+                cumulative_reward += reward
+            if not was_neutral and position == NEUTRAL:
+                reward = abs(cumulative_reward) * -1
+        else:  # exits
+            if is_stop_loss:
+                reward = self._get_reward(is_buy, true_price, ema) - commission
+                position = NEUTRAL
+            elif is_correct:
+                reward = self._get_reward(is_buy, true_price, limit) - commission
+                position = NEUTRAL
+                is_exit_limit = True
+            if reward < 0:
+                reward = abs(cumulative_reward) * -1
+            if reward != 0:
+                weighted_price, weight = .0, .0
+
+        self._is_opened = is_opened
+        self._is_closed = position == NEUTRAL and (is_opened or not was_neutral)
+        if self._is_closed:
+            self._entry_price, self._exit_price = true_price, limit if is_exit_limit else ema
+        self._position = position
+        self._weighted_price, self._weight = weighted_price, weight
+        self._cumulative_reward = cumulative_reward
+        return reward
+
+    def run(
+        self,
+        actions: list[int],
+        l: list[float],
+        h: list[float],
+        c: list[float],
+        ema: list[float],
+        lower: list[float],
+        upper: list[float]
+    ) -> tuple[list[float], list[int], list[tuple[int, int]], list[tuple[int, float, float]]]:
+        """
+            A whole episode from a reset: rewards and positions of every step, `(step, side)` of the opened
+            positions and `(step, entry price, exit price)` of the closed ones.
+        """
+        self.reset()
+        rewards: list[float] = [.0] * len(actions)
+        positions: list[int] = [NEUTRAL] * len(actions)
+        entries: list[tuple[int, int]] = list()
+        exits: list[tuple[int, float, float]] = list()
+        for step, action in enumerate(actions):
+            rewards[step] = self.step(action, l[step], h[step], c[step], ema[step], lower[step], upper[step])
+            positions[step] = self._position
+            if self._is_opened:
+                entries.append((step, self._side))
+            if self._is_closed:
+                exits.append((step, self._entry_price, self._exit_price))
+        return rewards, positions, entries, exits
@@ -1,6 +1,11 @@
+from typing import ClassVar
+
+from attr import attrs
+from numpy import log, ndarray
 from pandas import DataFrame
-from numpy import log
 
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
 from src.services.common.indicator_base import IndicatorPandasServiceBase
 
 
@@ -8,10 +13,38 @@ class LogPandasService(IndicatorPandasServiceBase):
 
     _INDICATOR_NAME: str = "LOG"
 
+    def get_inputs(self, spec: IndicatorSpec) -> list[str]:
+        return [spec.column, spec.denominator]
+
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        return [f"{self._INDICATOR_NAME}_{spec.column}_{spec.denominator}"]
+
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        numerator, denominator = inputs
+        return log(numerator / denominator),
+
     def get_log(self, ohlc: DataFrame, numerator: str, denominator: str, shift: int) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
+        spec: IndicatorSpec = IndicatorSpec(
+            kind=self._INDICATOR_NAME,
+            column=numerator,
+            denominator=denominator,
+            shift=shift
+        )
+        return self._get_indicator(ohlc=ohlc, spec=spec)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class LogIncrementalService(IncrementalIndicatorServiceBase):
+
+    _SERVICE: ClassVar[LogPandasService] = LogPandasService()
+
+    def _reset(self) -> None:
+        ...
 
-        ohlc[f"{self._INDICATOR_NAME}_{numerator}_{denominator}"] = log(ohlc[numerator] / ohlc[denominator])
-        ohlc[f"{self._INDICATOR_NAME}_{numerator}_{denominator}"] = ohlc[f"{self._INDICATOR_NAME}_{numerator}_{denominator}"].shift(shift)
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        numerator, denominator = values
+        return float(log(numerator / denominator)),
 
-        return ohlc
+    def _seed(self, inputs: tuple[ndarray, ...]) -> tuple[ndarray, ...]:
+        numerator, denominator = inputs
+        return log(numerator[-self._outputs.maxlen:] / denominator[-self._outputs.maxlen:]),
@@ -0,0 +1,36 @@
+from attr import attrs
+from numpy import ndarray
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ObservationWindowService:
+    """
+        Observations of the last `window` feature rows, the latest last, as strided views of the features.
+        The flat ones are consecutive slices of the row-major features, so neither kind copies them.
+    """
+
+    _window: int = 1
+    _is_flattened: bool = True  # `window * features` observations instead of `(window, features)`
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def is_flattened(self) -> bool:
+        return self._is_flattened
+
+    def get_observations(self, features: ndarray) -> ndarray:
+        """
+            Row `get_index(step)` is the observation at `step`.
+        """
+        if self._window < 1 or self._window > len(features):
+            raise ValueError(f"Observation window must be within [1, {len(features)}], got {self._window}.")
+        if self._is_flattened:
+            width: int = features.shape[1]
+            return sliding_window_view(features.reshape(-1), self._window * width)[::width]
+        return sliding_window_view(features, self._window, axis=0).transpose(0, 2, 1)
+
+    def get_index(self, step: int) -> int:
+        return step - self._window + 1
@@ -0,0 +1,118 @@
+import tracemalloc
+from time import perf_counter
+
+from attr import attrs, ib, Factory
+from numpy import ndarray, empty, float64
+from pandas import DataFrame
+
+from src.adapters.repositories.indicator_cache import IndicatorCacheRepository
+from src.schemas.indicator_report import IndicatorReport
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_sweep import IndicatorSweep
+from src.services.atr import ATRPandasService
+from src.services.bb import BBANDSPandasService
+from src.services.common.indicator_base import IndicatorPandasServiceBase
+from src.services.ema import EMAPandasService
+from src.services.log import LogPandasService
+from src.services.rsi import RSIPandasService
+
+
+def _get_services(cache: IndicatorCacheRepository | None) -> dict[str, IndicatorPandasServiceBase]:
+    services: list[IndicatorPandasServiceBase] = [
+        EMAPandasService(cache=cache),
+        RSIPandasService(cache=cache),
+        BBANDSPandasService(cache=cache),
+        ATRPandasService(cache=cache),
+        LogPandasService(cache=cache)
+    ]
+    return {service.indicator_name: service for service in services}
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class FeaturePipelineService:
+
+    _specs: list[IndicatorSpec]
+    _is_memory_traced: bool = True
+    _cache: IndicatorCacheRepository | None = None
+    _sweeps: list[IndicatorSweep] = ib(factory=list)  # precomputed columns are taken from here instead
+
+    _services: dict[str, IndicatorPandasServiceBase] = ib(
+        init=False,
+        default=Factory(lambda self: _get_services(cache=self._cache), takes_self=True)
+    )
+    _reports: list[IndicatorReport] = ib(init=False, factory=list)
+
+    @property
+    def reports(self) -> list[IndicatorReport]:
+        return self._reports
+
+    def _sort(self, columns: list[str]) -> list[IndicatorSpec]:
+        available: set[str] = set(columns)
+        pending: list[IndicatorSpec] = list(self._specs)
+        ordered: list[IndicatorSpec] = list()
+        while pending:
+            ready: list[IndicatorSpec] = [
+                spec for spec in pending if set(self._services[spec.kind].get_inputs(spec)) <= available
+            ]
+            if not ready:
+                raise ValueError(f"Can't resolve indicator inputs for: {pending}")
+            for spec in ready:
+                available.update(self._services[spec.kind].get_columns(spec))
+                pending.remove(spec)
+            ordered.extend(ready)
+        return ordered
+
+    def _get_sweep(self, spec: IndicatorSpec) -> IndicatorSweep | None:
+        for sweep in self._sweeps:
+            if spec in sweep:
+                return sweep
+        return None
+
+    def _calculate(self, ohlc: DataFrame, block: ndarray, positions: dict[str, int], spec: IndicatorSpec) -> None:
+        service: IndicatorPandasServiceBase = self._services[spec.kind]
+        columns: list[str] = service.get_columns(spec)
+
+        sweep: IndicatorSweep | None = self._get_sweep(spec=spec)
+        if sweep is not None:
+            for column, values in zip(columns, sweep.get_values(spec=spec).T):
+                block[:, positions[column]] = values
+            return
+
+        inputs: tuple[ndarray, ...] = tuple(
+            block[:, positions[column]] if column in positions else ohlc[column].to_numpy(dtype=float64)
+            for column in service.get_inputs(spec)
+        )
+        for column, values in zip(columns, service.calculate(inputs=inputs, spec=spec)):
+            block[:, positions[column]] = values
+
+    def get_features(self, ohlc: DataFrame) -> DataFrame:
+        specs: list[IndicatorSpec] = self._sort(columns=ohlc.columns.to_list())
+        names: list[str] = [column for spec in specs for column in self._services[spec.kind].get_columns(spec)]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Indicator columns are not unique: {names}")
+
+        positions: dict[str, int] = {name: position for position, name in enumerate(names)}
+        block: ndarray = empty((len(ohlc), len(names)), dtype=float64, order="F")  # every column is contiguous
+
+        is_tracing: bool = self._is_memory_traced and not tracemalloc.is_tracing()
+        if is_tracing:
+            tracemalloc.start()
+
+        self._reports = list()
+        for spec in specs:
+            started: float = perf_counter()
+            baseline: int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+            self._calculate(ohlc=ohlc, block=block, positions=positions, spec=spec)
+
+            peak: int = tracemalloc.get_traced_memory()[1] - baseline if tracemalloc.is_tracing() else 0
+            columns: list[str] = self._services[spec.kind].get_columns(spec)
+            self._reports.append(IndicatorReport(columns, perf_counter() - started, peak))
+
+        if is_tracing:
+            tracemalloc.stop()
+
+        frame: dict = {name: series for name, series in ohlc.items()}
+        frame.update({name: block[:, position] for name, position in positions.items()})
+        return DataFrame(frame, index=ohlc.index, copy=False)
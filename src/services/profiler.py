@@ -0,0 +1,193 @@
+import json
+from contextlib import nullcontext, AbstractContextManager
+from cProfile import Profile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter, perf_counter_ns
+from typing import Any, ClassVar
+
+from attr import attrs, ib
+from numpy import asarray, ndarray, percentile
+from torch.profiler import profile, ProfilerActivity
+
+_NULL_TIMER: nullcontext = nullcontext()
+
+
+class _Timer:
+
+    __slots__ = ("_durations", "_started")
+
+    def __init__(self, durations: list[int]) -> None:
+        self._durations: list[int] = durations
+        self._started: int = 0
+
+    def __enter__(self) -> "_Timer":
+        self._started = perf_counter_ns()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._durations.append(perf_counter_ns() - self._started)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class ProfilerService:
+    """
+        Named timers and counters of the training loop, aggregated into p50/p95/max and rates whenever they are
+        flushed, e.g. once per episode. Disabled timers are one shared null context, so the hot path keeps them.
+
+        `request_trace` profiles the next `steps` ticks with cProfile, or `torch.profiler` for a Chrome trace,
+        whether the timers are enabled or not.
+    """
+
+    _is_enabled: bool = False
+    _path: str | None = None  # JSON lines of every flush
+
+    _PREFIX: ClassVar[str] = "oogway"
+
+    _durations: dict[str, list[int]] = ib(init=False, factory=dict)  # nanoseconds since the last flush
+    _counters: dict[str, int] = ib(init=False, factory=dict)
+    _totals: dict[str, int] = ib(init=False, factory=dict)  # counters since the start
+    _last: dict = ib(init=False, factory=dict)
+    _flushed: float = ib(init=False, factory=perf_counter)
+
+    _trace: Profile | profile | None = ib(init=False, default=None)
+    _trace_path: str = ib(init=False, default="")
+    _trace_steps: int = ib(init=False, default=0)  # ticks left once the trace started
+    _is_tracing: bool = ib(init=False, default=False)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    @property
+    def last(self) -> dict:
+        return self._last
+
+    def timer(self, name: str) -> AbstractContextManager:
+        if not self._is_enabled:
+            return _NULL_TIMER
+        return _Timer(durations=self._durations.setdefault(name, list()))
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self._is_enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def request_trace(self, steps: int, path: str, is_torch: bool = False) -> None:
+        """
+            Profiles the next `steps` steps into `path`, a `.prof` file of cProfile or a Chrome trace JSON of
+            `torch.profiler`. Requests are ignored while a trace is pending.
+        """
+        if self._trace is not None or steps <= 0:
+            return
+        self._trace = profile(activities=[ProfilerActivity.CPU]) if is_torch else Profile()
+        self._trace_path = path
+        self._trace_steps = steps
+
+    def tick(self) -> None:
+        """
+            Marks the end of an environment step.
+        """
+        if self._is_enabled:
+            self._counters["steps"] = self._counters.get("steps", 0) + 1
+        if self._trace is None:
+            return
+        if not self._is_tracing:
+            self._is_tracing = True
+            if isinstance(self._trace, Profile):
+                self._trace.enable()
+            else:
+                self._trace.start()
+            return
+        self._trace_steps -= 1
+        if self._trace_steps == 0:
+            self._stop_trace()
+
+    def _stop_trace(self) -> None:
+        if isinstance(self._trace, Profile):
+            self._trace.disable()
+            self._trace.dump_stats(self._trace_path)
+        else:
+            self._trace.stop()
+            self._trace.export_chrome_trace(self._trace_path)
+        self._trace = None
+        self._is_tracing = False
+
+    def flush(self, **labels: Any) -> dict:
+        """
+            Aggregates everything since the previous flush, appends it to the JSON lines and starts over.
+        """
+        if not self._is_enabled:
+            return dict()
+        now: float = perf_counter()
+        seconds: float = now - self._flushed
+        timers: dict[str, dict] = dict()
+        for name, durations in self._durations.items():
+            if not durations:
+                continue
+            values: ndarray = asarray(durations) / 1e3
+            timers[name] = {
+                "count": len(values),
+                "total_ms": float(values.sum()) / 1e3,
+                "p50_us": float(percentile(values, 50)),
+                "p95_us": float(percentile(values, 95)),
+                "max_us": float(values.max())
+            }
+        for name, value in self._counters.items():
+            self._totals[name] = self._totals.get(name, 0) + value
+
+        self._last = {
+            **labels,
+            "seconds": seconds,
+            "timers": timers,
+            "counters": dict(self._counters),
+            "rates": {f"{name}_per_second": value / seconds for name, value in self._counters.items()}
+        }
+        if self._path is not None:
+            with open(self._path, "a") as file:
+                file.write(json.dumps(self._last) + "\n")
+
+        self._durations = {name: list() for name in self._durations}
+        self._counters = dict()
+        self._flushed = now
+        return self._last
+
+    def get_prometheus(self) -> str:
+        """
+            The last flush in the Prometheus text format: timers as summaries in seconds, counters as totals.
+        """
+        lines: list[str] = [f"# TYPE {self._PREFIX}_timer_seconds summary"]
+        for name, timer in self._last.get("timers", dict()).items():
+            for quantile, key in (("0.5", "p50_us"), ("0.95", "p95_us"), ("1", "max_us")):
+                lines.append(f'{self._PREFIX}_timer_seconds{{name="{name}",quantile="{quantile}"}} {timer[key] / 1e6}')
+            lines.append(f'{self._PREFIX}_timer_seconds_sum{{name="{name}"}} {timer["total_ms"] / 1e3}')
+            lines.append(f'{self._PREFIX}_timer_seconds_count{{name="{name}"}} {timer["count"]}')
+        lines.append(f"# TYPE {self._PREFIX}_total counter")
+        lines.extend(f'{self._PREFIX}_total{{name="{name}"}} {value}' for name, value in self._totals.items())
+        lines.append(f"# TYPE {self._PREFIX}_rate gauge")
+        lines.extend(
+            f'{self._PREFIX}_rate{{name="{name}"}} {value}' for name, value in self._last.get("rates", dict()).items()
+        )
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9100) -> ThreadingHTTPServer:
+        """
+            Serves `get_prometheus` on a daemon thread until the returned server is shut down.
+        """
+        profiler: ProfilerService = self
+
+        class _Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:  # noqa: N802
+                body: bytes = profiler.get_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_: Any) -> None:
+                ...
+
+        server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), _Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -1,6 +1,13 @@
+from math import isnan
+from typing import ClassVar
+
+from attr import attrs, ib
+from numpy import ndarray, nan
 from pandas import DataFrame
 from talib._ta_lib import RSI
 
+from src.schemas.indicator_spec import IndicatorSpec
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
 from src.services.common.indicator_base import IndicatorPandasServiceBase
 
 
@@ -8,9 +15,59 @@ class RSIPandasService(IndicatorPandasServiceBase):
 
     _INDICATOR_NAME: str = "RSI"
 
+    def get_columns(self, spec: IndicatorSpec) -> list[str]:
+        return [f"{self._INDICATOR_NAME}_{spec.window}_{spec.column}"]
+
+    def _calculate(self, inputs: tuple[ndarray, ...], spec: IndicatorSpec) -> tuple[ndarray, ...]:
+        values, = inputs
+        return RSI(values, spec.window),
+
     def get_rsi(self, ohlc: DataFrame, column: str, window: int, shift: int) -> DataFrame:
-        ohlc = ohlc.copy(deep=True)
-        ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"] = RSI(ohlc[column].values, window)
-        ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"] = ohlc[f"{self._INDICATOR_NAME}_{window}_{column}"].shift(shift)
+        spec: IndicatorSpec = IndicatorSpec(kind=self._INDICATOR_NAME, column=column, window=window, shift=shift)
+        return self._get_indicator(ohlc=ohlc, spec=spec)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class RSIIncrementalService(IncrementalIndicatorServiceBase):
+    """
+        Wilder smoothing in the exact operation order of TA-Lib, so the seed replays the history once.
+    """
+
+    _SERVICE: ClassVar[RSIPandasService] = RSIPandasService()
+
+    _count: int = ib(init=False, default=0)  # price changes seen
+    _previous: float = ib(init=False, default=nan)
+    _gain: float = ib(init=False, default=.0)
+    _loss: float = ib(init=False, default=.0)
+
+    def _reset(self) -> None:
+        self._count, self._previous, self._gain, self._loss = 0, nan, .0, .0
+
+    def _get_rsi(self) -> float:
+        total: float = self._gain + self._loss
+        return 100 * (self._gain / total) if abs(total) >= 1e-14 else .0
+
+    def _update(self, values: tuple[float, ...]) -> tuple[float, ...]:
+        value, = values
+        if isnan(self._previous) and not self._count:
+            self._previous = value
+            return nan,
+
+        window: int = self._spec.window
+        difference: float = value - self._previous
+        self._previous = value
+        self._count += 1
+        if self._count > window:
+            self._gain *= window - 1
+            self._loss *= window - 1
+
+        if difference < 0:
+            self._loss -= difference
+        else:
+            self._gain += difference
 
-        return ohlc
+        if self._count < window:
+            return nan,
+        self._gain /= window
+        self._loss /= window
+        return self._get_rsi(),
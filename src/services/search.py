@@ -0,0 +1,100 @@
+import resource
+from typing import Any
+
+from attr import attrs, ib
+from optuna import Study, Trial, TrialPruned, create_study, load_study
+from optuna.pruners import MedianPruner
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from torch import set_num_threads
+
+from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.models.qnn import QNN
+from src.schemas.market_data import MarketData
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class HyperparameterSearchService:
+    """
+        Optuna study over agent hyperparameters whose trials train on market data published once as memory-mapped
+        files, so any number of worker processes read the same pages. Workers share the study through a journal
+        file, and trials are pruned on the total reward of each episode.
+    """
+
+    _market_data_path: str
+    _feature_columns: list
+    _journal_path: str
+    _study_name: str = "agent"
+    _commission: float
+    _funding: float
+    _episodes: int = 3
+    _memory_capacity: int = 100_000
+
+    _market: MarketData | None = ib(init=False, default=None)
+
+    def _get_storage(self) -> JournalStorage:
+        return JournalStorage(JournalFileBackend(self._journal_path))
+
+    def create_study(self) -> Study:
+        return create_study(
+            study_name=self._study_name,
+            storage=self._get_storage(),
+            direction="maximize",
+            pruner=MedianPruner(n_startup_trials=5, n_warmup_steps=1),
+            load_if_exists=True
+        )
+
+    def objective(self, trial: Trial) -> float:
+        batch_size: int = trial.suggest_categorical("batch_size", [32, 64, 128, 256])
+        learn_interval: int = trial.suggest_categorical("learn_interval", [1, 4, 16])  # env steps per update
+        environment: TradingEnvironment = TradingEnvironment(
+            ohlc=self._market,
+            feature_columns=self._feature_columns,
+            commission=self._commission,
+            funding=self._funding
+        )
+        agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+            alpha=trial.suggest_float("alpha", 1e-5, 1e-2, log=True),
+            gamma=trial.suggest_float("gamma", .9, .999),
+            epsilon=trial.suggest_float("epsilon", .1, 1.),
+            qnn=QNN(
+                observation_space_dimension=environment.observation_space_dimension,
+                action_space_dimension=environment.action_space_dimension
+            ),
+            n_steps=trial.suggest_int("n_steps", 1, 5),
+            tau=trial.suggest_float("tau", 1e-3, 1e-1, log=True),
+            memory_capacity=self._memory_capacity
+        )
+
+        for episode in range(self._episodes):
+            state, _, done, _, _ = environment.reset().as_observation()
+            steps: int = 0
+            while not done:
+                action: int = agent.act(observation=state)
+                next_state, reward, done, _, _ = environment.step(action).as_observation()
+                agent.memory.append((state, action, reward, next_state, done))
+                steps += 1
+                if agent.memory_length >= batch_size and steps % learn_interval == 0:
+                    agent.learn(batch_size=batch_size)
+                state = next_state
+
+            trial.report(environment.rewards, step=episode)
+            if trial.should_prune():
+                raise TrialPruned()
+        return environment.rewards
+
+    def optimize(self, trials: int) -> dict:
+        """
+            Runs `trials` trials in this process and reports its peak resident memory.
+        """
+        set_num_threads(1)
+        self._market = MarketDataNumpyRepository(path=self._market_data_path).read()
+        study: Study = load_study(study_name=self._study_name, storage=self._get_storage())
+        study.optimize(self.objective, n_trials=trials)
+        return {"trials": trials, "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10}
+
+
+def run_worker(service: HyperparameterSearchService, trials: int, results: Any) -> None:
+    results.put(service.optimize(trials=trials))
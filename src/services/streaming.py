@@ -0,0 +1,157 @@
+from collections import deque
+from time import perf_counter
+from typing import AsyncIterator, ClassVar, Mapping
+
+from attr import attrs, ib
+from numpy import ndarray, array, asarray, ones, isfinite, percentile, nan, float32, float64
+from pandas import DataFrame
+
+from src.adapters.clients.bar_source import BarSourceBase
+from src.models.qnn import QNN
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_type import IndicatorType
+from src.schemas.indicators import Indicators
+from src.schemas.ohlc import OHLC
+from src.schemas.trading_decision import TradingDecision
+from src.schemas.trading_state import TradingState
+from src.services.atr import ATRIncrementalService
+from src.services.bb import BBANDSIncrementalService
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
+from src.services.ema import EMAIncrementalService
+from src.services.inference import QNNInferenceService
+from src.services.log import LogIncrementalService
+from src.services.pipeline import FeaturePipelineService
+from src.services.rsi import RSIIncrementalService
+from src.services.transition import TradingTransitionService
+
+
+def _get_incremental_services() -> dict[str, type]:
+    return {
+        IndicatorType.ema: EMAIncrementalService,
+        IndicatorType.rsi: RSIIncrementalService,
+        IndicatorType.bbands: BBANDSIncrementalService,
+        IndicatorType.atr: ATRIncrementalService,
+        IndicatorType.log: LogIncrementalService
+    }
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class StreamingInferenceService:
+    """
+        Bar-by-bar decisions of the greedy policy: every closed bar updates the indicators in O(1), the policy
+        picks an action from the features and the bar settles its limit order with `TradingEnvironment.step`
+        semantics, so the position and DCA book carry over between bars. Nothing grows with the stream.
+    """
+
+    _qnn: QNN
+    _specs: list[IndicatorSpec]  # in the order of their inputs, as `FeaturePipelineService` takes them
+    _feature_columns: list
+    _commission: float
+    _funding: float
+    _renames: dict[str, str] = ib(factory=dict)  # indicator columns under the names `Indicators` reads
+    _latency_window: int = 10_000  # latest decisions the percentiles cover
+
+    _BBANDS_STDDEV: ClassVar[int] = 1
+
+    _indicators: list[IncrementalIndicatorServiceBase] = ib(init=False)
+    _policy: QNNInferenceService = ib(init=False)
+    _transition: TradingTransitionService = ib(init=False)
+    _state: TradingState = ib(init=False, factory=lambda: TradingState(n=1))
+    _row: dict[str, float] = ib(init=False, factory=dict)  # the latest bar and its indicators
+    _latencies: deque = ib(init=False)
+    _bars: int = ib(init=False, default=0)
+    _decisions: int = ib(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        services: dict[str, type] = _get_incremental_services()
+        available: set[str] = set(OHLC.COLUMNS)
+        self._indicators = list()
+        for spec in self._specs:
+            indicator: IncrementalIndicatorServiceBase = services[spec.kind](spec=spec)
+            if not set(indicator.inputs) <= available:
+                raise ValueError(f"Inputs of {spec} have to come from earlier specs or the bars.")
+            available.update(indicator.columns)
+            self._indicators.append(indicator)
+        self._policy = QNNInferenceService(qnn=self._qnn)
+        self._transition = TradingTransitionService(commission=self._commission, funding=self._funding)
+        self._latencies = deque(maxlen=self._latency_window)
+
+    @property
+    def position(self) -> int:
+        return int(self._state.position[0])
+
+    @property
+    def statistics(self) -> dict:
+        latencies: ndarray = asarray(self._latencies) * 1e6
+        return {
+            "bars": self._bars,
+            "decisions": self._decisions,
+            "position": self.position,
+            "total_rewards": float(self._state.total_rewards[0]),
+            "p50_latency_us": float(percentile(latencies, 50)) if len(latencies) else .0,
+            "p99_latency_us": float(percentile(latencies, 99)) if len(latencies) else .0,
+            "max_latency_us": float(latencies.max()) if len(latencies) else .0
+        }
+
+    def seed(self, history: DataFrame) -> None:
+        """
+            Warms the indicators up on the bars right before the stream, which continues their steps.
+        """
+        frame: DataFrame = FeaturePipelineService(specs=self._specs, is_memory_traced=False).get_features(ohlc=history)
+        for indicator in self._indicators:
+            indicator.seed(ohlc=frame)
+        self._bars = len(history)
+
+    def _update_row(self, bar: Mapping[str, float]) -> None:
+        for column in OHLC.COLUMNS:
+            self._row[column] = float(bar[column])
+        for indicator in self._indicators:
+            self._row.update(zip(indicator.columns, indicator.update(bar=self._row)))
+        for column, name in self._renames.items():
+            self._row[name] = self._row[column]
+
+    def on_bar(self, bar: Mapping, received: float | None = None) -> TradingDecision | None:
+        """
+            The decision of a closed bar, None while any feature or band is still warming up.
+        """
+        received = perf_counter() if received is None else received
+        self._update_row(bar=bar)
+        step: int = self._bars
+        self._bars += 1
+
+        observation: ndarray = array([self._row[column] for column in self._feature_columns], dtype=float32)
+        ema: float = self._row[Indicators.EMA_COLUMN]
+        lower: float = self._row[Indicators.get_lower_bbands_column(stddev=self._BBANDS_STDDEV)]
+        upper: float = self._row[Indicators.get_upper_bbands_column(stddev=self._BBANDS_STDDEV)]
+        if not isfinite(observation).all() or not isfinite((ema, lower, upper)).all():
+            return None
+
+        action: int = int(self._policy.get_greedy_actions(observations=observation[None])[0])
+        limit_price: float = nan
+        if action == LimitOrderActionSpace.buy_limit:
+            limit_price = lower
+        elif action == LimitOrderActionSpace.sell_limit:
+            limit_price = upper
+        latency: float = perf_counter() - received
+        self._latencies.append(latency)
+        self._decisions += 1
+
+        reward: ndarray = self._transition.step(
+            state=self._state,
+            actions=array([action]),
+            is_active=ones(1, dtype=bool),
+            l=array([self._row["l"]], dtype=float64),
+            h=array([self._row["h"]], dtype=float64),
+            c=array([self._row["c"]], dtype=float64),
+            ema=array([ema], dtype=float64),
+            lower=array([lower], dtype=float64),
+            upper=array([upper], dtype=float64)
+        )
+        return TradingDecision(step, bar.get("date"), action, limit_price, self.position, float(reward[0]), latency)
+
+    async def run(self, source: BarSourceBase) -> AsyncIterator[TradingDecision]:
+        async for bar in source:
+            decision: TradingDecision | None = self.on_bar(bar=bar, received=perf_counter())
+            if decision is not None:
+                yield decision
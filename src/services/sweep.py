@@ -0,0 +1,128 @@
+from itertools import product
+
+from attr import attrs, ib
+from talib._ta_lib import MA_Type
+from numpy import ndarray, empty, full, concatenate, cumsum, isnan, sqrt, maximum, nan, float32, float64
+from pandas import DataFrame
+
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_sweep import IndicatorSweep
+from src.schemas.indicator_type import IndicatorType
+from src.services.bb import BBANDSPandasService
+from src.services.common.indicator_base import IndicatorPandasServiceBase
+from src.services.ema import EMAPandasService
+from src.services.rsi import RSIPandasService
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class IndicatorSweepService:
+    """
+        Evaluates one indicator over a grid of windows (and stddevs) of a single column into one float32 matrix.
+        Bollinger bands share the cumulative sums of the column and the rolling deviation of every window across
+        all stddevs; recursive indicators are written column by column straight into the matrix.
+    """
+
+    _ema_service: EMAPandasService = ib(init=False, factory=EMAPandasService)
+    _rsi_service: RSIPandasService = ib(init=False, factory=RSIPandasService)
+    _bbands_service: BBANDSPandasService = ib(init=False, factory=BBANDSPandasService)
+
+    @staticmethod
+    def _get_rolling(values: ndarray, windows: list[int]) -> dict[int, tuple[ndarray, ndarray]]:
+        begin: int = int(isnan(values).argmin()) if isnan(values[0]) else 0  # leading NaNs are skipped as TA-Lib does
+        centre: float = float(values[begin])  # keeps the sums small, so the variance doesn't cancel out
+        shifted: ndarray = values[begin:] - centre
+
+        totals: ndarray = concatenate(([.0], cumsum(shifted)))
+        squares: ndarray = concatenate(([.0], cumsum(shifted * shifted)))
+
+        rolling: dict[int, tuple[ndarray, ndarray]] = dict()
+        for window in windows:
+            if window > len(shifted):
+                rolling[window] = full(len(values), nan), full(len(values), nan)
+                continue
+
+            mean: ndarray = empty(len(values), dtype=float64)
+            deviation: ndarray = empty(len(values), dtype=float64)
+            mean[:begin + window - 1], deviation[:begin + window - 1] = nan, nan
+
+            mean_shifted: ndarray = (totals[window:] - totals[:-window]) / window
+            variance: ndarray = (squares[window:] - squares[:-window]) / window - mean_shifted * mean_shifted
+            mean[begin + window - 1:] = mean_shifted + centre
+            deviation[begin + window - 1:] = sqrt(maximum(variance, .0))
+            rolling[window] = mean, deviation
+        return rolling
+
+    @staticmethod
+    def _shift(values: ndarray, shift: int) -> ndarray:
+        return IndicatorPandasServiceBase.shift(values=values, periods=shift)
+
+    def _get_recursive(
+        self,
+        service: IndicatorPandasServiceBase,
+        values: ndarray,
+        column: str,
+        windows: list[int],
+        shift: int
+    ) -> IndicatorSweep:
+        specs: list[IndicatorSpec] = [
+            IndicatorSpec(kind=service.indicator_name, column=column, window=window, shift=shift)
+            for window in windows
+        ]
+        matrix: ndarray = empty((len(values), len(specs)), dtype=float32, order="F")
+        for position, spec in enumerate(specs):
+            matrix[:, position], = service.calculate(inputs=(values,), spec=spec)
+        return IndicatorSweep(specs, [name for spec in specs for name in service.get_columns(spec)], matrix)
+
+    def _get_bbands(
+        self,
+        values: ndarray,
+        column: str,
+        windows: list[int],
+        stddevs: list[float],
+        shift: int
+    ) -> IndicatorSweep:
+        rolling: dict[int, tuple[ndarray, ndarray]] = self._get_rolling(values=values, windows=windows)
+        specs: list[IndicatorSpec] = [
+            IndicatorSpec(
+                kind=self._bbands_service.indicator_name,
+                column=column,
+                window=window,
+                stddev=stddev,
+                matype=MA_Type.SMA,
+                shift=shift
+            )
+            for window, stddev in product(windows, stddevs)
+        ]
+        matrix: ndarray = empty((len(values), len(specs) * 3), dtype=float32, order="F")
+        for position, spec in enumerate(specs):
+            mean, deviation = rolling[spec.window]
+            matrix[:, position * 3] = self._shift(values=mean + deviation * spec.stddev, shift=shift)
+            matrix[:, position * 3 + 1] = self._shift(values=mean, shift=shift)
+            matrix[:, position * 3 + 2] = self._shift(values=mean - deviation * spec.stddev, shift=shift)
+        columns: list[str] = [name for spec in specs for name in self._bbands_service.get_columns(spec)]
+        return IndicatorSweep(specs, columns, matrix)
+
+    def get_sweep(
+        self,
+        ohlc: DataFrame,
+        kind: str,
+        column: str,
+        windows: list[int],
+        stddevs: list[float] | None = None,
+        matype: int = MA_Type.SMA,
+        shift: int = 0
+    ) -> IndicatorSweep:
+        values: ndarray = ohlc[column].to_numpy(dtype=float64)
+        if kind == IndicatorType.bbands:
+            if matype != MA_Type.SMA:  # the rolling sums are simple moving averages only
+                raise ValueError(f"Can't sweep {kind} over matype {matype}, only over {MA_Type.SMA} (SMA).")
+            return self._get_bbands(values=values, column=column, windows=windows, stddevs=stddevs or [1.], shift=shift)
+        if kind == IndicatorType.ema:
+            service: IndicatorPandasServiceBase = self._ema_service
+        elif kind == IndicatorType.rsi:
+            service = self._rsi_service
+        else:
+            raise ValueError(
+                f"Can't sweep {kind}, only {IndicatorType.bbands}, {IndicatorType.ema} and {IndicatorType.rsi}."
+            )
+        return self._get_recursive(service=service, values=values, column=column, windows=windows, shift=shift)
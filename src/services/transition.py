@@ -0,0 +1,133 @@
+from attr import attrs
+from numpy import ndarray, where, log, log2, abs as absolute, errstate, int8
+
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.position_type import PositionType
+from src.schemas.trading_state import TradingState
+
+NEUTRAL: int = PositionType.get_code(PositionType.neutral_position)
+LONG: int = PositionType.get_code(PositionType.long_position)
+SHORT: int = PositionType.get_code(PositionType.short_position)
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class TradingTransitionService:
+    """
+        `TradingLaneService.step`, which `TradingEnvironment.step` delegates to, over arrays of independent episodes,
+        branch for branch.
+        As in the environment, the buy/sell action picks the reward method and the limit/stop-loss rules
+        of entries, DCA and exits alike, and holding picks them by the open position.
+    """
+
+    _commission: float
+    _funding: float
+
+    def _get_rewards(self, is_long: ndarray, true_price: ndarray, result_price: ndarray) -> ndarray:
+        ratio: ndarray = result_price / true_price
+        ratio = where(is_long, ratio, 2 - ratio)
+        return where(ratio > 1, log(ratio), log2(ratio)) - self._funding
+
+    @staticmethod
+    def _clear_book(state: TradingState, mask: ndarray) -> None:
+        state.weighted_price[mask] = .0
+        state.weight[mask] = .0
+
+    def step(
+        self,
+        state: TradingState,
+        actions: ndarray,
+        is_active: ndarray,
+        l: ndarray,
+        h: ndarray,
+        c: ndarray,
+        ema: ndarray,
+        lower: ndarray,
+        upper: ndarray
+    ) -> ndarray:
+        with errstate(divide="ignore", invalid="ignore"):  # lanes without a position have no true price
+            return self._step(state, actions, is_active, l, h, c, ema, lower, upper)
+
+    def _step(
+        self,
+        state: TradingState,
+        actions: ndarray,
+        is_active: ndarray,
+        l: ndarray,
+        h: ndarray,
+        c: ndarray,
+        ema: ndarray,
+        lower: ndarray,
+        upper: ndarray
+    ) -> ndarray:
+        position: ndarray = state.position
+        was_long: ndarray = position == LONG
+        was_short: ndarray = position == SHORT
+        was_neutral: ndarray = position == NEUTRAL
+
+        is_buy: ndarray = is_active & (actions == LimitOrderActionSpace.buy_limit)
+        is_sell: ndarray = is_active & (actions == LimitOrderActionSpace.sell_limit)
+        is_hold: ndarray = is_active & (actions == LimitOrderActionSpace.hold)
+        side: ndarray = where(is_buy, LONG, SHORT).astype(int8)
+
+        limit: ndarray = where(is_buy, lower, upper)
+        is_in_range: ndarray = (l <= limit) & (limit <= h)
+        is_correct_limit: ndarray = where(is_buy, limit > ema, limit < ema)
+        is_stop_loss: ndarray = where(is_buy, ema >= l, ema <= h)
+
+        is_entry: ndarray = (is_buy | is_sell) & was_neutral
+        is_dca: ndarray = (is_buy & was_long) | (is_sell & was_short)
+        is_exit: ndarray = (is_buy & was_short) | (is_sell & was_long)
+        is_holding: ndarray = is_hold & ~was_neutral
+
+        # entry and DCA limit orders
+        is_fill: ndarray = (is_entry | is_dca) & is_in_range & is_correct_limit
+        state.weighted_price[is_fill] += limit[is_fill] * limit[is_fill]
+        state.weight[is_fill] += limit[is_fill]
+        true_price: ndarray = state.weighted_price / state.weight
+
+        rewards: ndarray = where(is_fill, self._get_rewards(is_buy, true_price, c) - self._commission, .0)
+        position[is_entry & is_fill] = side[is_entry & is_fill]
+
+        stop_rewards: ndarray = self._get_rewards(is_buy, true_price, ema)
+        is_entry_stop: ndarray = is_entry & is_fill & is_stop_loss
+        is_dca_stop: ndarray = is_dca & is_stop_loss
+        rewards = where(is_entry_stop, stop_rewards - self._commission - self._commission, rewards)
+        rewards = where(
+            is_dca_stop,
+            where(rewards != 0, stop_rewards - self._commission - self._commission, stop_rewards - self._commission),
+            rewards
+        )
+        position[is_entry_stop | is_dca_stop] = NEUTRAL
+        self._clear_book(state=state, mask=is_entry_stop | is_dca_stop)
+
+        state.cumulative_reward[:] += where((is_entry | is_dca) & (position == side), rewards, .0)
+        rewards = where(is_dca & (position == NEUTRAL), absolute(state.cumulative_reward) * -1, rewards)
+
+        # exits
+        is_exit_stop: ndarray = is_exit & is_stop_loss
+        is_exit_limit: ndarray = is_exit & ~is_stop_loss & is_in_range & is_correct_limit
+        rewards = where(is_exit_stop, stop_rewards - self._commission, rewards)
+        rewards = where(is_exit_limit, self._get_rewards(is_buy, true_price, limit) - self._commission, rewards)
+        position[is_exit_stop | is_exit_limit] = NEUTRAL
+        rewards = where(is_exit & (rewards < 0), absolute(state.cumulative_reward) * -1, rewards)
+        self._clear_book(state=state, mask=is_exit & (rewards != 0))
+
+        # holds
+        is_hold_stop: ndarray = is_holding & where(was_long, ema >= l, ema <= h)
+        hold_rewards: ndarray = where(
+            is_hold_stop,
+            self._get_rewards(was_long, true_price, ema) - self._commission,
+            self._get_rewards(was_long, true_price, c)
+        )
+        rewards = where(is_holding, hold_rewards, rewards)
+        rewards = where(is_hold_stop, absolute(state.cumulative_reward) * -1, rewards)
+        position[is_hold_stop] = NEUTRAL
+        self._clear_book(state=state, mask=is_hold_stop)
+        state.cumulative_reward[:] += where(is_holding & ~is_hold_stop, rewards, .0)
+
+        state.opened[:] = where(is_entry & is_fill, side, NEUTRAL)
+        state.closed[:] = (is_entry_stop | ~was_neutral) & (position == NEUTRAL)
+        state.entry_price[:] = true_price
+        state.exit_price[:] = where(is_exit_limit, limit, ema)  # every other close is a stop-loss at the EMA
+        state.total_rewards[:] += rewards
+        return rewards
@@ -0,0 +1,166 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from attr import attrs
+from numpy import mean, std
+from torch import manual_seed, set_num_threads
+from torch.multiprocessing import get_context
+
+from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.models.qnn import QNN
+from src.schemas.backtest_report import BacktestReport
+from src.schemas.market_data import MarketData
+from src.schemas.walk_forward_fold import WalkForwardFold
+from src.services.backtest import BacktestService
+
+
+@attrs(slots=True, auto_attribs=True, kw_only=True)
+class WalkForwardService:
+    """
+        Walk-forward validation over market data published as memory-mapped files. Every fold trains a fresh agent
+        on a rolling window and backtests its greedy policy on the window right after it, both zero-copy slices,
+        so folds are independent and run in a process pool that only sends back their metrics.
+
+        Folds start after the last row with an incomplete indicator and `warmup` more rows, so no window sees
+        a value its indicators couldn't compute yet. Features have to be causal: test rows may look back into
+        the train window, never the other way around.
+    """
+
+    _market_data_path: str
+    _feature_columns: list
+    _commission: float
+    _funding: float
+    _train_size: int
+    _test_size: int
+    _step: int | None = None  # rows between fold starts, the test size without it so test windows tile
+    _gap: int = 0  # rows skipped between the train and test windows
+    _warmup: int = 0  # rows skipped after the first complete one, for indicators still converging
+    _episodes: int = 1
+    _alpha: float = .001
+    _gamma: float = .99
+    _epsilon: float = .4
+    _n_steps: int = 3
+    _tau: float | None = .005
+    _batch_size: int = 64
+    _learn_interval: int = 4  # env steps per update
+    _memory_capacity: int = 100_000
+    _seed: int = 0  # fold `i` seeds with `seed + i`, so results don't depend on the workers
+
+    def __attrs_post_init__(self) -> None:
+        if self._train_size <= 1 or self._test_size <= 1:
+            raise ValueError(f"Windows need at least two rows, got {self._train_size} and {self._test_size}.")
+
+    def get_folds(self, market: MarketData) -> list[WalkForwardFold]:
+        step: int = self._step or self._test_size
+        start: int = market.get_first_complete_row() + self._warmup
+        folds: list[WalkForwardFold] = list()
+        while start + self._train_size + self._gap + self._test_size <= market.length:
+            folds.append(WalkForwardFold(
+                index=len(folds),
+                train_start=start,
+                train_stop=start + self._train_size,
+                test_start=start + self._train_size + self._gap,
+                test_stop=start + self._train_size + self._gap + self._test_size
+            ))
+            start += step
+        return folds
+
+    def _train(self, agent: QOogwayTheGrandmasterAgent, environment: TradingEnvironment) -> float:
+        state, _, done, _, _ = environment.reset().as_observation()
+        steps: int = 0
+        while not done:
+            action: int = agent.act(observation=state)
+            next_state, reward, done, _, _ = environment.step(action).as_observation()
+            agent.memory.append((state, action, reward, next_state, done))
+            steps += 1
+            if agent.memory_length >= self._batch_size and steps % self._learn_interval == 0:
+                agent.learn(batch_size=self._batch_size)
+            state = next_state
+        return environment.rewards
+
+    def run_fold(self, fold: WalkForwardFold) -> dict:
+        started: float = perf_counter()
+        random.seed(self._seed + fold.index)
+        manual_seed(self._seed + fold.index)
+        market: MarketData = MarketDataNumpyRepository(path=self._market_data_path).read()
+
+        environment: TradingEnvironment = TradingEnvironment(
+            ohlc=market.get_slice(start=fold.train_start, stop=fold.train_stop),
+            feature_columns=self._feature_columns,
+            commission=self._commission,
+            funding=self._funding
+        )
+        qnn: QNN = QNN(
+            observation_space_dimension=environment.observation_space_dimension,
+            action_space_dimension=environment.action_space_dimension
+        )
+        agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+            alpha=self._alpha,
+            gamma=self._gamma,
+            epsilon=self._epsilon,
+            qnn=qnn,
+            n_steps=self._n_steps,
+            tau=self._tau,
+            memory_capacity=self._memory_capacity
+        )
+        train_rewards: list[float] = [self._train(agent=agent, environment=environment) for _ in range(self._episodes)]
+
+        backtest: BacktestService = BacktestService(
+            ohlc=market.get_slice(start=fold.test_start, stop=fold.test_stop),
+            feature_columns=self._feature_columns,
+            commission=self._commission,
+            funding=self._funding
+        )
+        report: BacktestReport = backtest.evaluate(actions=backtest.get_greedy_actions(qnn=qnn))
+        return {
+            "fold": fold.index,
+            "train": [fold.train_start, fold.train_stop],
+            "test": [fold.test_start, fold.test_stop],
+            "train_rewards": train_rewards,
+            "test_rewards": float(report.total_rewards[0]),
+            **report.get_ledger().summary,
+            "seconds": perf_counter() - started
+        }
+
+    @staticmethod
+    def _get_summary(results: list[dict]) -> dict:
+        rewards: list[float] = [result["test_rewards"] for result in results]
+        return {
+            "test_rewards_mean": float(mean(rewards)),
+            "test_rewards_std": float(std(rewards)),
+            "positive_folds": sum(reward > 0 for reward in rewards) / len(rewards),
+            "trades": sum(result["trades"] for result in results),
+            "win_rate_mean": float(mean([result["win_rate"] for result in results])),
+            "total_pl_mean": float(mean([result["total_pl"] for result in results])),
+            "max_drawdown": max(result["max_drawdown"] for result in results)
+        }
+
+    def run(self, workers: int) -> dict:
+        """
+            Runs every fold in a pool of `workers` single-threaded processes. The speedup compares the wall time
+            with the sum of fold times, i.e. running them one after another on a single core.
+        """
+        market: MarketData = MarketDataNumpyRepository(path=self._market_data_path).read()
+        folds: list[WalkForwardFold] = self.get_folds(market=market)
+        if not folds:
+            raise ValueError("The market data is too short for a single train and test window.")
+
+        started: float = perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn"), initializer=set_num_threads, initargs=(1,)
+        ) as pool:
+            results: list[dict] = list(pool.map(self.run_fold, folds))
+        wall_seconds: float = perf_counter() - started
+        fold_seconds: float = sum(result["seconds"] for result in results)
+
+        return {
+            "workers": workers,
+            "wall_seconds": wall_seconds,
+            "fold_seconds": fold_seconds,
+            "speedup": fold_seconds / wall_seconds,
+            "summary": self._get_summary(results=results),
+            "folds": results
+        }
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import logging
+import sys
+from argparse import ArgumentParser
+
+from pandas import DataFrame
+from torch import load
+
+from src.adapters.clients.bar_source import BarSourceBase, FileTailBarSource, SocketBarSource
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.benchmarks.common import FEATURE_SPECS, ENVIRONMENT_SPECS, ENVIRONMENT_COLUMNS, FEATURE_COLUMNS
+from src.models.qnn import QNN
+from src.schemas.action_space import LimitOrderActionSpace
+from src.services.streaming import StreamingInferenceService
+
+
+async def _run(service: StreamingInferenceService, source: BarSourceBase) -> None:
+    async for decision in service.run(source=source):
+        sys.stdout.write(json.dumps(decision.to_dict()) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Greedy decisions on bars as they close")
+    parser.add_argument("--path", required=True, help="history CSV, followed for new rows without `--port`")
+    parser.add_argument("--weights", default=None, help="QNN state dict")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="newline-delimited JSON bars")
+    parser.add_argument("--poll-interval", type=float, default=1.)
+    arguments = parser.parse_args()
+
+    qnn: QNN = QNN(observation_space_dimension=len(FEATURE_COLUMNS), action_space_dimension=LimitOrderActionSpace.n)
+    if arguments.weights is not None:
+        qnn.load_state_dict(load(arguments.weights))
+    service: StreamingInferenceService = StreamingInferenceService(
+        qnn=qnn,
+        specs=FEATURE_SPECS + ENVIRONMENT_SPECS,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155,
+        renames=ENVIRONMENT_COLUMNS
+    )
+    history: DataFrame = OHLCPandasRepository(path=arguments.path, is_cached=False).get_ohlc()
+    service.seed(history=history)
+
+    source: BarSourceBase = FileTailBarSource(path=arguments.path, poll_interval=arguments.poll_interval)
+    if arguments.port is not None:
+        source = SocketBarSource(host=arguments.host, port=arguments.port)
+    try:
+        asyncio.run(_run(service=service, source=source))
+    except KeyboardInterrupt:
+        ...
+    logging.info(f"Streaming: {service.statistics}.")
@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+import sys
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+
+from pandas import DataFrame
+
+from src.adapters.repositories.market_data import MarketDataNumpyRepository
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+from src.services.walk_forward import WalkForwardService
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Parallel walk-forward validation of the agent")
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--train-size", type=int, default=2_000)
+    parser.add_argument("--test-size", type=int, default=500)
+    parser.add_argument("--step", type=int, default=None, help="defaults to the test size")
+    parser.add_argument("--gap", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--episodes", type=int, default=1)
+    parser.add_argument("--compare", action="store_true", help="also run the folds one after another")
+    arguments = parser.parse_args()
+
+    frame: DataFrame = get_environment_frame(ohlc=OHLCPandasRepository(path=arguments.path).get_ohlc())
+    market: MarketData = MarketData.from_frame(
+        ohlc=frame,
+        feature_columns=FEATURE_COLUMNS,
+        columns=OHLC.COLUMNS + Indicators.get_columns(columns=frame.columns.to_list())
+    )
+    with TemporaryDirectory(prefix="market-data-") as directory:  # features are computed once for all folds
+        MarketDataNumpyRepository(path=directory).write(market_data=market)
+        service: WalkForwardService = WalkForwardService(
+            market_data_path=directory,
+            feature_columns=FEATURE_COLUMNS,
+            commission=.0001980,
+            funding=.000114155,
+            train_size=arguments.train_size,
+            test_size=arguments.test_size,
+            step=arguments.step,
+            gap=arguments.gap,
+            warmup=arguments.warmup,
+            episodes=arguments.episodes
+        )
+        report: dict = service.run(workers=arguments.workers)
+        if arguments.compare:
+            sequential: dict = service.run(workers=1)
+            report["sequential_wall_seconds"] = sequential["wall_seconds"]
+            report["measured_speedup"] = sequential["wall_seconds"] / report["wall_seconds"]
+
+    logging.info(f"Walk-forward: {len(report['folds'])} folds, {report['summary']}.")
+    sys.stdout.write(json.dumps(report) + "\n")
@@ -0,0 +1,91 @@
+import pytest
+from pandas import DataFrame
+from torch import Tensor
+
+from src.adapters.clients.agent import QOogwayTheGrandmasterAgent
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.clients.manager import TrainingManager
+from src.adapters.repositories.indexed_replay import IndexedReplayMemoryRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.models.qnn import QNN
+
+WINDOW: int = 3
+
+
+@pytest.fixture(scope="module")
+def ohlc() -> DataFrame:
+    return get_environment_frame(ohlc=get_synthetic_ohlc(rows=1_000, seed=0, volatility=.01))
+
+
+def _get_qnn(environment: TradingEnvironment) -> QNN:
+    return QNN(
+        observation_space_dimension=environment.observation_space_dimension,
+        action_space_dimension=environment.action_space_dimension,
+        observation_space_shape=environment.observation_space.shape
+    )
+
+
+@pytest.mark.parametrize("is_indexed", [False, True])
+def test_unflattened_windows_step_and_learn(ohlc: DataFrame, is_indexed: bool) -> None:
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155,
+        window=WINDOW,
+        is_flattened=False
+    )
+    assert environment.observation_space.shape == (WINDOW, len(FEATURE_COLUMNS))
+    qnn: QNN = _get_qnn(environment=environment)
+    memory: IndexedReplayMemoryRepository | None = IndexedReplayMemoryRepository(
+        observations=environment.observations,
+        capacity=64,
+        observation_space_dimension=environment.observation_space_dimension,
+        n_steps=3
+    ) if is_indexed else None
+    agent: QOogwayTheGrandmasterAgent = QOogwayTheGrandmasterAgent(
+        alpha=.001,
+        gamma=.99,
+        epsilon=.5,
+        qnn=qnn,
+        memory_capacity=64,
+        n_steps=3,
+        memory=memory
+    )
+
+    state, _, _, _, _ = environment.reset().as_observation()
+    for _ in range(32):
+        action: int = agent.act(observation=state)
+        index: int = environment.observation_index
+        next_state, reward, done, truncated, _ = environment.step(action).as_observation()
+        if is_indexed:
+            agent.memory.append((index, action, reward, environment.observation_index, done, truncated))
+        else:
+            agent.memory.append((state, action, reward, next_state, done, truncated))
+        if agent.memory_length >= 4:
+            agent.learn(batch_size=4)
+        state = next_state
+
+    states, _, _, _, _, _ = agent.memory.sample(batch_size=4)
+    q_values: Tensor = qnn(x=states)
+    assert states.shape == (4, WINDOW, len(FEATURE_COLUMNS))
+    assert q_values.shape == (4, environment.action_space_dimension)
+    assert agent.updates == 29
+
+
+def test_managers_reject_qnn_of_other_observations(tmp_path) -> None:
+    manager: TrainingManager = TrainingManager(
+        market_data_path=str(tmp_path),
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155,
+        qnn=QNN(observation_space_dimension=WINDOW * len(FEATURE_COLUMNS), action_space_dimension=3),
+        alpha=.001,
+        gamma=.99,
+        epsilon=.4,
+        window=WINDOW,
+        is_flattened=False
+    )
+    with pytest.raises(ValueError, match="actors observe"):
+        manager.run()
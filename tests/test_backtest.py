@@ -0,0 +1,89 @@
+import pytest
+from numpy import ndarray, allclose, array_equal
+from numpy.random import default_rng
+from pandas import DataFrame
+
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.clients.vector_environment import VectorTradingEnvironment
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.schemas.backtest_report import BacktestReport
+from src.services.backtest import BacktestService
+
+COMMISSION: float = .0001980
+FUNDING: float = .000114155
+
+
+@pytest.fixture(scope="module")
+def ohlc() -> DataFrame:
+    frame: DataFrame = get_environment_frame(ohlc=get_synthetic_ohlc(rows=3_000, seed=0, volatility=.01))
+    return frame.iloc[:2_000]  # cut where most episodes end in a position
+
+
+@pytest.fixture(scope="module")
+def backtest(ohlc: DataFrame) -> BacktestService:
+    return BacktestService(ohlc=ohlc, feature_columns=FEATURE_COLUMNS, commission=COMMISSION, funding=FUNDING)
+
+
+@pytest.fixture(scope="module")
+def actions(backtest: BacktestService) -> ndarray:
+    return default_rng(0).choice(3, size=(8, backtest.steps), p=[.2, .2, .6])
+
+
+def test_lanes_match_arrays(backtest: BacktestService, actions: ndarray, monkeypatch: pytest.MonkeyPatch) -> None:
+    lanes: BacktestReport = backtest.evaluate(actions=actions)
+    monkeypatch.setattr(BacktestService, "_LANES_PER_ARRAY_STEP", 0)
+    arrays: BacktestReport = backtest.evaluate(actions=actions)
+
+    assert array_equal(lanes.positions, arrays.positions)
+    assert allclose(lanes.rewards, arrays.rewards, rtol=1e-12, atol=1e-12, equal_nan=True)
+    assert len(lanes.trades) == len(arrays.trades) > 0
+    for name in lanes.trades.dtype.names:
+        assert array_equal(lanes.trades[name], arrays.trades[name], equal_nan=lanes.trades[name].dtype.kind == "f")
+
+
+@pytest.mark.parametrize("is_array_step", [False, True])
+def test_ledgers_match_the_environment(
+    ohlc: DataFrame,
+    backtest: BacktestService,
+    actions: ndarray,
+    is_array_step: bool,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    environment: TradingEnvironment = TradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=COMMISSION,
+        funding=FUNDING
+    )
+    if is_array_step:
+        monkeypatch.setattr(BacktestService, "_LANES_PER_ARRAY_STEP", 0)
+    report: BacktestReport = backtest.evaluate(actions=actions)
+    assert (report.trades["exit_step"] == -1).any()  # some episodes end in a position
+
+    for lane, lane_actions in enumerate(actions):
+        environment.reset()
+        for action in lane_actions:
+            environment.step(action)
+        assert allclose(report.total_rewards[lane], environment.rewards)
+
+        expected: ndarray = report.get_ledger(lane=lane).records
+        assert len(expected) == len(environment.trades) > 0
+        for name in ("entry_step", "exit_step", "side", "timestamp", "ticks_in_trade"):
+            assert array_equal(expected[name], environment.trades.records[name])
+        for name in ("entry_price", "exit_price"):
+            assert allclose(expected[name], environment.trades.records[name], equal_nan=True)
+
+
+def test_vector_lanes_start_with_the_environment(ohlc: DataFrame, backtest: BacktestService, actions: ndarray) -> None:
+    environment: VectorTradingEnvironment = VectorTradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=COMMISSION,
+        funding=FUNDING,
+        num_envs=len(actions)
+    )
+    environment.reset()
+    for step in range(backtest.steps):
+        environment.step(actions[:, step])
+    assert allclose(environment.rewards, backtest.evaluate(actions=actions).total_rewards)
@@ -0,0 +1,87 @@
+import pytest
+from numpy import ndarray, array_equal, shares_memory
+from pandas import DataFrame
+from torch import arange, equal
+
+from src.adapters.clients.environment import TradingEnvironment
+from src.adapters.repositories.indexed_replay import IndexedReplayMemoryRepository
+from src.adapters.repositories.replay import ReplayMemoryRepository
+from src.benchmarks.common import FEATURE_COLUMNS, get_environment_frame
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.schemas.action_space import LimitOrderActionSpace
+from src.schemas.indicators import Indicators
+from src.schemas.market_data import MarketData
+from src.schemas.ohlc import OHLC
+
+
+@pytest.fixture(scope="module")
+def ohlc() -> DataFrame:
+    return get_environment_frame(ohlc=get_synthetic_ohlc(rows=1_000, seed=0, volatility=.01))
+
+
+def _get_environment(ohlc: DataFrame | MarketData, **kwargs) -> TradingEnvironment:
+    return TradingEnvironment(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        commission=.0001980,
+        funding=.000114155,
+        **kwargs
+    )
+
+
+def test_time_limits_truncate(ohlc: DataFrame) -> None:
+    environment: TradingEnvironment = _get_environment(ohlc=ohlc, episode_steps=50)
+    environment.reset(options={"start": 300})
+    for step in range(50):
+        observation, _, terminated, truncated, _ = environment.step(LimitOrderActionSpace.hold).as_observation()
+        assert not terminated
+        assert truncated == (step == 49)
+    assert array_equal(observation, environment.observations[350])
+
+
+def test_the_end_of_the_data_terminates(ohlc: DataFrame) -> None:
+    environment: TradingEnvironment = _get_environment(ohlc=ohlc, episode_steps=50)
+    environment.reset(options={"start": len(ohlc) - 11})
+    outcomes: list[tuple[bool, bool]] = list()
+    terminated: bool = False
+    while not terminated:
+        observation, _, terminated, truncated, _ = environment.step(LimitOrderActionSpace.hold).as_observation()
+        outcomes.append((terminated, truncated))
+    assert outcomes == [(False, False)] * 10 + [(True, False)]
+    assert not observation.any()
+
+
+@pytest.mark.parametrize("is_flattened", [True, False])
+def test_windows_are_views_of_the_features(ohlc: DataFrame, is_flattened: bool) -> None:
+    market: MarketData = MarketData.from_frame(
+        ohlc=ohlc,
+        feature_columns=FEATURE_COLUMNS,
+        columns=OHLC.COLUMNS + Indicators.get_columns(columns=ohlc.columns.to_list())
+    )
+    environment: TradingEnvironment = _get_environment(ohlc=market, window=4, is_flattened=is_flattened)
+    observation, _, _, _, _ = environment.reset(options={"start": 300}).as_observation()
+    window: ndarray = market.features[297:301]
+    assert shares_memory(environment.observations, market.features)
+    assert array_equal(observation, window.reshape(-1) if is_flattened else window)
+    assert environment.observation_space_dimension == window.size
+
+
+def test_indexed_replay_matches_observations(ohlc: DataFrame) -> None:
+    environment: TradingEnvironment = _get_environment(ohlc=ohlc, window=4)
+    dimension: int = environment.observation_space_dimension
+    memory: ReplayMemoryRepository = ReplayMemoryRepository(capacity=64, observation_space_dimension=dimension)
+    indexed: IndexedReplayMemoryRepository = IndexedReplayMemoryRepository(
+        observations=environment.observations,
+        capacity=64,
+        observation_space_dimension=dimension
+    )
+    state, _, _, _, _ = environment.reset().as_observation()
+    for _ in range(32):
+        index: int = environment.observation_index
+        next_state, reward, done, truncated, _ = environment.step(LimitOrderActionSpace.hold).as_observation()
+        memory.append((state, LimitOrderActionSpace.hold, reward, next_state, done, truncated))
+        indexed.append((index, LimitOrderActionSpace.hold, reward, environment.observation_index, done, truncated))
+        state = next_state
+    for expected, actual in zip(memory.get_batch(indices=arange(32)), indexed.get_batch(indices=arange(32))):
+        assert equal(expected, actual)
+    assert indexed.nbytes < memory.nbytes
@@ -0,0 +1,43 @@
+import pytest
+from numpy import ndarray, allclose, array
+from pandas import DataFrame
+
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_type import IndicatorType
+from src.services.atr import ATRIncrementalService
+from src.services.bb import BBANDSIncrementalService
+from src.services.common.incremental_base import IncrementalIndicatorServiceBase
+from src.services.ema import EMAIncrementalService
+from src.services.log import LogIncrementalService
+from src.services.pipeline import FeaturePipelineService
+from src.services.rsi import RSIIncrementalService
+
+PREFIX: int = 300  # bars the incremental services are seeded on, the rest are fed one by one
+SPECS: list[tuple[type, IndicatorSpec]] = [
+    (EMAIncrementalService, IndicatorSpec(kind=IndicatorType.ema, column="c", window=14)),
+    (EMAIncrementalService, IndicatorSpec(kind=IndicatorType.ema, column="o", window=210, shift=1)),
+    (RSIIncrementalService, IndicatorSpec(kind=IndicatorType.rsi, column="c", window=14)),
+    (RSIIncrementalService, IndicatorSpec(kind=IndicatorType.rsi, column="o", window=7, shift=2)),
+    (BBANDSIncrementalService, IndicatorSpec(kind=IndicatorType.bbands, column="c", window=20, stddev=2)),
+    (BBANDSIncrementalService, IndicatorSpec(kind=IndicatorType.bbands, column="o", window=7, stddev=1, matype=1)),
+    (ATRIncrementalService, IndicatorSpec(kind=IndicatorType.atr, window=14)),
+    (LogIncrementalService, IndicatorSpec(kind=IndicatorType.log, column="c", denominator="o", shift=1))
+]
+
+
+@pytest.fixture(scope="module")
+def ohlc() -> DataFrame:
+    return get_synthetic_ohlc(rows=1_000, seed=0, volatility=.01)
+
+
+@pytest.mark.parametrize("service_type, spec", SPECS)
+def test_updates_match_the_batch(ohlc: DataFrame, service_type: type, spec: IndicatorSpec) -> None:
+    batch: DataFrame = FeaturePipelineService(specs=[spec], is_memory_traced=False).get_features(ohlc=ohlc)
+    service: IncrementalIndicatorServiceBase = service_type(spec=spec)
+    service.seed(ohlc=batch.iloc[:PREFIX])
+
+    bars: list[dict] = batch.iloc[PREFIX:].to_dict(orient="records")
+    updates: ndarray = array([service.update(bar=bar) for bar in bars])
+    expected: ndarray = batch[service.columns].to_numpy()[PREFIX:]
+    assert allclose(updates, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
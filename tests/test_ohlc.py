@@ -0,0 +1,75 @@
+import os
+
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from src.adapters.repositories.ohlc import OHLCPandasRepository
+
+ROWS: str = (
+    "2010-01-11 04:00:00+03:00,86.56,87.4,85.51,87.12,25222076\n"
+    "2010-01-11 08:00:00+03:00,87.12,88.17,86.71,87.18,73064770\n"
+)
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    path: str = str(tmp_path / "ohlc.csv")
+    with open(path, "w") as csv_file:
+        csv_file.write("date,o,h,l,c,v\n" + ROWS)
+    return path
+
+
+def _get_expected(path: str) -> DataFrame:
+    return OHLCPandasRepository(path=path, is_cached=False).get_ohlc()
+
+
+def _get_entries(path: str) -> set[str]:
+    return set(os.listdir(os.path.dirname(path)))
+
+
+def test_cache_hits_round_trip_tz_aware_dates(path: str) -> None:
+    repository: OHLCPandasRepository = OHLCPandasRepository(path=path)
+    assert_frame_equal(repository.get_ohlc(), _get_expected(path=path))
+    meta_mtime: int = os.stat(os.path.join(f"{path}.cache", "meta.json")).st_mtime_ns
+
+    ohlc: DataFrame = repository.get_ohlc()
+    assert os.stat(os.path.join(f"{path}.cache", "meta.json")).st_mtime_ns == meta_mtime
+    assert str(ohlc["date"].dt.tz) == "UTC+03:00"
+    assert_frame_equal(ohlc, _get_expected(path=path))
+
+
+def test_frames_are_writable_unless_memory_mapped(path: str) -> None:
+    ohlc: DataFrame = OHLCPandasRepository(path=path).get_ohlc()
+    ohlc.loc[0, "c"] = 1.
+    assert ohlc.loc[0, "c"] == 1.
+
+    mapped: DataFrame = OHLCPandasRepository(path=path, is_memory_mapped=True).get_ohlc()
+    assert not mapped["c"].to_numpy().flags.writeable
+    assert_frame_equal(mapped.copy(deep=True), _get_expected(path=path))
+
+
+@pytest.mark.parametrize("is_appended", [True, False])
+def test_stale_caches_are_rebuilt(path: str, is_appended: bool) -> None:
+    repository: OHLCPandasRepository = OHLCPandasRepository(path=path)
+    repository.get_ohlc()
+    stat: os.stat_result = os.stat(path)
+    if is_appended:  # the size changes
+        with open(path, "a") as csv_file:
+            csv_file.write("2010-01-11 12:00:00+03:00,87.19,87.9,86.63,86.69,50374391\n")
+    else:  # only the mtime does
+        with open(path, "w") as csv_file:
+            csv_file.write("date,o,h,l,c,v\n" + ROWS.replace("87.12\n", "87.13\n"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert_frame_equal(repository.get_ohlc(), _get_expected(path=path))
+    assert _get_entries(path=path) == {"ohlc.csv", "ohlc.csv.cache"}
+
+
+def test_text_columns_are_read_without_a_cache(path: str) -> None:
+    with open(path, "w") as csv_file:
+        csv_file.write("date,o,h,l,c,v,ticker\n" + ROWS.replace("\n", ",SBER\n"))
+
+    ohlc: DataFrame = OHLCPandasRepository(path=path).get_ohlc()
+    assert_frame_equal(ohlc, _get_expected(path=path))
+    assert _get_entries(path=path) == {"ohlc.csv"}
@@ -0,0 +1,56 @@
+import pytest
+from numpy import allclose, array_equal
+from pandas import DataFrame
+
+from src.benchmarks.synthetic import get_synthetic_ohlc
+from src.schemas.indicator_spec import IndicatorSpec
+from src.schemas.indicator_sweep import IndicatorSweep
+from src.schemas.indicator_type import IndicatorType
+from src.services.pipeline import FeaturePipelineService
+from src.services.sweep import IndicatorSweepService
+
+
+@pytest.fixture(scope="module")
+def ohlc() -> DataFrame:
+    return get_synthetic_ohlc(rows=2_000, seed=0)
+
+
+@pytest.fixture(scope="module")
+def sweeps(ohlc: DataFrame) -> list[IndicatorSweep]:
+    service: IndicatorSweepService = IndicatorSweepService()
+    return [
+        service.get_sweep(ohlc=ohlc, kind=IndicatorType.bbands, column="c", windows=[10, 20], stddevs=[1., 2.]),
+        service.get_sweep(ohlc=ohlc, kind=IndicatorType.ema, column="c", windows=[7, 14])
+    ]
+
+
+def _get_features(ohlc: DataFrame, spec: IndicatorSpec, sweeps: list[IndicatorSweep]) -> DataFrame:
+    features: DataFrame = FeaturePipelineService(specs=[spec], sweeps=sweeps, is_memory_traced=False).get_features(ohlc)
+    return features.drop(columns=ohlc.columns)
+
+
+@pytest.mark.parametrize("spec", [
+    IndicatorSpec(kind=IndicatorType.bbands, column="c", window=20, stddev=2),
+    IndicatorSpec(kind=IndicatorType.ema, column="c", window=14)
+])
+def test_matching_specs_take_the_sweep(ohlc: DataFrame, sweeps: list[IndicatorSweep], spec: IndicatorSpec) -> None:
+    swept: DataFrame = _get_features(ohlc=ohlc, spec=spec, sweeps=sweeps)
+    calculated: DataFrame = _get_features(ohlc=ohlc, spec=spec, sweeps=[])
+    assert any(spec in sweep for sweep in sweeps)
+    assert allclose(swept.to_numpy(), calculated.to_numpy(), rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("spec", [
+    IndicatorSpec(kind=IndicatorType.bbands, column="c", window=20, stddev=2, matype=1, shift=1),
+    IndicatorSpec(kind=IndicatorType.bbands, column="c", window=20, stddev=2, shift=1),
+    IndicatorSpec(kind=IndicatorType.ema, column="c", window=14, shift=1)
+])
+def test_other_parameters_ignore_the_sweep(ohlc: DataFrame, sweeps: list[IndicatorSweep], spec: IndicatorSpec) -> None:
+    swept: DataFrame = _get_features(ohlc=ohlc, spec=spec, sweeps=sweeps)
+    calculated: DataFrame = _get_features(ohlc=ohlc, spec=spec, sweeps=[])
+    assert array_equal(swept.to_numpy(), calculated.to_numpy(), equal_nan=True)
+
+
+def test_bbands_sweep_refuses_other_matypes(ohlc: DataFrame) -> None:
+    with pytest.raises(ValueError):
+        IndicatorSweepService().get_sweep(ohlc=ohlc, kind=IndicatorType.bbands, column="c", windows=[20], matype=1)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from numpy import ndarray
+from numpy.random import default_rng
+from torch import manual_seed
+
+from src.adapters.clients.policy_server import PolicyServer, PolicyClient
+from src.models.qnn import QNN
+from src.services.inference import QNNInferenceService
+
+OBSERVATION_SPACE_DIMENSION: int = 4
+ACTION_SPACE_DIMENSION: int = 3
+
+
+@pytest.fixture
+def policy() -> QNNInferenceService:
+    manual_seed(0)
+    qnn: QNN = QNN(
+        observation_space_dimension=OBSERVATION_SPACE_DIMENSION,
+        action_space_dimension=ACTION_SPACE_DIMENSION
+    )
+    return QNNInferenceService(qnn=qnn)
+
+
+@pytest.fixture
+def observations() -> ndarray:
+    return default_rng(0).normal(size=(32, OBSERVATION_SPACE_DIMENSION)).astype("float32")
+
+
+def test_in_process_requests_are_batched(policy: QNNInferenceService, observations: ndarray) -> None:
+    async def _run() -> tuple[list[int], dict]:
+        async with PolicyServer(policy=policy, max_batch_size=8, max_wait=.05) as server:
+            actions: list[int] = await asyncio.gather(*(server.act(observation) for observation in observations))
+            return actions, server.statistics
+
+    actions, statistics = asyncio.run(_run())
+    assert actions == policy.get_greedy_actions(observations=observations).tolist()
+    assert statistics["requests"] == len(observations)
+    assert statistics["batches"] < len(observations)
+    assert max(statistics["batch_size_histogram"]) <= 8
+
+
+def test_malformed_requests_fail_alone(policy: QNNInferenceService, observations: ndarray) -> None:
+    async def _run() -> tuple[list, int]:
+        async with PolicyServer(policy=policy, max_wait=.05) as server:
+            results: list = await asyncio.gather(
+                server.act(observations[0]),
+                server.act(observations[1][:2]),
+                server.act(["a", "b", "c", "d"]),
+                server.act([[1., 2.], [3.]]),
+                server.act(observations[2]),
+                return_exceptions=True
+            )
+            return results, await server.act(observations[3])
+
+    results, action = asyncio.run(_run())
+    expected: list[int] = policy.get_greedy_actions(observations=observations[:4]).tolist()
+    assert results[0] == expected[0]
+    assert results[4] == expected[2]
+    assert all(isinstance(result, ValueError) for result in results[1:4])
+    assert action == expected[3]
+
+
+def test_socket_requests(policy: QNNInferenceService, observations: ndarray) -> None:
+    async def _run() -> tuple[list[int], Exception | None, dict]:
+        async with PolicyServer(policy=policy, max_wait=.05) as server:
+            listener: asyncio.Server = await server.serve(port=0)
+            port: int = listener.sockets[0].getsockname()[1]
+            async with PolicyClient(port=port) as client:
+                actions: list[int] = await asyncio.gather(*(client.act(observation) for observation in observations))
+                error: Exception | None = None
+                try:
+                    await client.act(observations[0][:3])
+                except RuntimeError as exception:
+                    error = exception
+
+            reader, writer = await asyncio.open_connection(port=port)
+            writer.write(b"not json\n")
+            writer.write((json.dumps({"id": 7, "observation": observations[0].tolist()}) + "\n").encode())
+            writer.write_eof()
+            responses: dict = {}
+            while line := await reader.readline():
+                response: dict = json.loads(line)
+                responses[response["id"]] = response
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return actions, error, responses
+
+    actions, error, responses = asyncio.run(_run())
+    assert actions == policy.get_greedy_actions(observations=observations).tolist()
+    assert error is not None
+    assert "error" in responses[None]
+    assert responses[7]["action"] == actions[0]
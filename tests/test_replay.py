@@ -0,0 +1,46 @@
+import pytest
+from torch import Tensor, arange, tensor, equal, allclose
+
+from src.adapters.repositories.replay import ReplayMemoryRepository
+
+GAMMA: float = .5
+
+
+def _get_memory() -> ReplayMemoryRepository:
+    return ReplayMemoryRepository(capacity=16, observation_space_dimension=1, n_steps=3, gamma=GAMMA)
+
+
+@pytest.mark.parametrize("is_extended", [False, True])
+def test_truncations_end_returns_and_bootstrap(is_extended: bool) -> None:
+    rewards: list[float] = [1., 2., 4., 8., 16.]
+    dones: list[bool] = [False, False, False, False, True]
+    truncations: list[bool] = [False, True, False, False, False]  # episodes of 2 and 3 steps
+    memory: ReplayMemoryRepository = _get_memory()
+    if is_extended:
+        memory.extend(
+            states=[[step] for step in range(5)],
+            actions=[0] * 5,
+            rewards=rewards,
+            states_lead=[[step + 1] for step in range(5)],
+            dones=dones,
+            truncations=truncations
+        )
+    else:
+        for step in range(5):
+            memory.append(([step], 0, rewards[step], [step + 1], dones[step], truncations[step]))
+
+    _, _, returns, states_lead, bootstrap_dones, discounts = memory.get_batch(indices=arange(5))
+    assert allclose(returns, tensor([1. + 2. * GAMMA, 2., 4. + 8. * GAMMA + 16. * GAMMA ** 2, 8. + 16. * GAMMA, 16.]))
+    assert equal(states_lead[:, 0], tensor([2., 2., 5., 5., 5.]))
+    assert equal(bootstrap_dones, tensor([0., 0., 1., 1., 1.]))  # the truncated episode still bootstraps
+    assert allclose(discounts, tensor([GAMMA ** 2, GAMMA, GAMMA ** 3, GAMMA ** 2, GAMMA]))
+
+
+def test_transitions_without_truncations_end_at_dones() -> None:
+    memory: ReplayMemoryRepository = _get_memory()
+    for step in range(4):
+        memory.append(([step], 0, 1., [step + 1], step == 1))
+    _, _, returns, _, dones, _ = memory.get_batch(indices=arange(4))
+    expected: Tensor = tensor([1. + GAMMA, 1., 1. + GAMMA, 1.])
+    assert allclose(returns, expected)
+    assert equal(dones, tensor([1., 1., 0., 0.]))